@@ -1,10 +1,9 @@
 # backtest/engine.py
 
-from typing import Dict, List
-
 import pandas as pd
 
 from data.fetcher import MarketDataFetcher
+from features.cache import FeatureCache
 from models.direction import DirectionModel
 
 
@@ -30,17 +29,17 @@ class BacktestEngine:
 
     def run(self, limit: int = 2000) -> pd.DataFrame:
         df = self.data.fetch_ohlcv(self.symbol, self.timeframe, limit)
+        if len(df) <= self.lookback:
+            return pd.DataFrame(columns=["time", "price", "prob_up"])
 
-        results: List[Dict] = []
-
-        for i in range(self.lookback, len(df)):
-            window = df.iloc[i - self.lookback : i + 1]
-            last = window.iloc[-1]
+        # Featurize the whole history once, score every bar in one pass
+        featured = FeatureCache.shared().features(df, self.symbol, self.timeframe)
+        probs = self.model.predict_proba_series(featured)
 
-            results.append({
-                "time": last["time"],
-                "price": last["close"],
-                "prob_up": self.model.predict_proba(window),
-            })
+        keep = (featured["time"] >= df["time"].iloc[self.lookback]).to_numpy()
 
-        return pd.DataFrame(results)
+        return pd.DataFrame({
+            "time": featured["time"].to_numpy()[keep],
+            "price": featured["close"].to_numpy()[keep],
+            "prob_up": probs[keep],
+        })
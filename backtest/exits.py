@@ -0,0 +1,176 @@
+# backtest/exits.py
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+EXIT_REASONS = ["stop", "trailing", "take_profit", "time", "end"]
+
+
+@dataclass(frozen=True, slots=True)
+class ExitRules:
+    """
+    Path-dependent exit rules for LONG entries filled at a bar's close.
+    A rule set to None is disabled; `max_bars` is always on.
+    """
+
+    trailing_pct: float | None = 0.0075
+    stop_loss_pct: float | None = 0.01
+    take_profit_pct: float | None = None
+    max_bars: int = 96
+
+
+class Exits(NamedTuple):
+    index: np.ndarray    # bar the position is closed on
+    price: np.ndarray    # fill price
+    reason: np.ndarray   # code into EXIT_REASONS
+
+
+def resolve_long_exits(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    entries: np.ndarray,
+    rules: ExitRules,
+    chunk: int = 4096,
+) -> Exits:
+    """
+    Exit of every entry at once, from the high/low path that follows it.
+
+    Within bar j a stop is hit when low <= level and a target when
+    high >= target. A gap through a level fills at the bar's open.
+    When a stop and a target fall in the same bar, the stop is assumed
+    to come first. The trailing level for bar j only uses highs up to
+    bar j-1, because the order of high and low inside a bar is unknown.
+    """
+    n = len(close)
+    entries = np.asarray(entries, dtype=np.int64)
+    horizon = max(1, int(rules.max_bars))
+    steps = np.arange(1, horizon + 1)
+
+    index = np.empty(len(entries), dtype=np.int64)
+    price = np.empty(len(entries))
+    reason = np.empty(len(entries), dtype=np.int8)
+
+    for lo_i in range(0, len(entries), chunk):
+        batch = entries[lo_i : lo_i + chunk]
+        out = slice(lo_i, lo_i + len(batch))
+
+        path = batch[:, None] + steps           # (entries, horizon) bar indices
+        valid = path < n
+        path = np.minimum(path, n - 1)
+
+        hi, lo, op = high[path], low[path], open_[path]
+        entry = close[batch][:, None]
+
+        # ---- stop level per bar ----
+        fixed = np.full_like(entry, -np.inf)
+        if rules.stop_loss_pct is not None:
+            fixed = entry * (1 - rules.stop_loss_pct)
+
+        level = np.broadcast_to(fixed, hi.shape)
+        trailing = np.zeros(hi.shape, dtype=bool)
+        if rules.trailing_pct is not None:
+            peak = np.empty_like(hi)
+            peak[:, 0] = entry[:, 0]
+            peak[:, 1:] = np.maximum(entry, np.maximum.accumulate(hi, axis=1)[:, :-1])
+            trail = peak * (1 - rules.trailing_pct)
+            trailing = trail > fixed
+            level = np.maximum(level, trail)
+
+        hit_stop = valid & (lo <= level)
+        hit_target = np.zeros_like(hit_stop)
+        if rules.take_profit_pct is not None:
+            target = entry * (1 + rules.take_profit_pct)
+            hit_target = valid & (hi >= target)
+
+        first_stop = np.where(hit_stop.any(axis=1), hit_stop.argmax(axis=1), horizon)
+        first_target = np.where(hit_target.any(axis=1), hit_target.argmax(axis=1), horizon)
+
+        rows = np.arange(len(batch))
+        by_stop = (first_stop <= first_target) & (first_stop < horizon)
+        by_target = (first_target < first_stop)
+
+        # ---- no level touched: time stop, or end of data ----
+        last = batch + horizon
+        timed = last <= n - 1
+        index[out] = np.where(timed, last, n - 1)
+        price[out] = close[index[out]]
+        reason[out] = np.where(timed, EXIT_REASONS.index("time"), EXIT_REASONS.index("end"))
+
+        j = np.minimum(first_stop, horizon - 1)
+        stop_fill = np.minimum(op[rows, j], level[rows, j])
+        stop_reason = np.where(
+            trailing[rows, j], EXIT_REASONS.index("trailing"), EXIT_REASONS.index("stop")
+        )
+
+        k = np.minimum(first_target, horizon - 1)
+        target_fill = (
+            np.maximum(op[rows, k], target[rows, 0])
+            if rules.take_profit_pct is not None
+            else np.zeros(len(batch))
+        )
+
+        index[out] = np.where(by_stop, path[rows, j], np.where(by_target, path[rows, k], index[out]))
+        price[out] = np.where(by_stop, stop_fill, np.where(by_target, target_fill, price[out]))
+        reason[out] = np.where(
+            by_stop,
+            stop_reason,
+            np.where(by_target, EXIT_REASONS.index("take_profit"), reason[out]),
+        )
+
+    return Exits(index, price, reason)
+
+
+def non_overlapping(signals: np.ndarray, exit_index: np.ndarray) -> np.ndarray:
+    """
+    Positions into `signals` that are actually traded: flat-only
+    entries, the next one strictly after the previous exit bar.
+    Loops once per trade, not per bar.
+    """
+    taken = []
+    k = 0
+    while k < len(signals):
+        taken.append(k)
+        k = int(np.searchsorted(signals, exit_index[k], side="right"))
+    return np.asarray(taken, dtype=np.int64)
+
+
+def simulate_long_trades(df: pd.DataFrame, signal: np.ndarray, rules: ExitRules) -> pd.DataFrame:
+    """
+    One row per trade for the bars where `signal` is set, entered at
+    the close and exited by `rules` (gross returns, no fees).
+    """
+    open_ = df["open"].to_numpy(dtype=np.float64)
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+
+    candidates = np.flatnonzero(signal)
+    columns = ["entry_index", "exit_index", "entry_price", "exit_price", "reason", "bars", "ret"]
+    if len(candidates) == 0 or len(close) < 2:
+        return pd.DataFrame(columns=columns)
+
+    exits = resolve_long_exits(open_, high, low, close, candidates, rules)
+    taken = non_overlapping(candidates, exits.index)
+
+    entry_index = candidates[taken]
+    exit_index = exits.index[taken]
+    entry_price = close[entry_index]
+    exit_price = exits.price[taken]
+
+    trades = pd.DataFrame({
+        "entry_index": entry_index,
+        "exit_index": exit_index,
+        "entry_price": entry_price,
+        "exit_price": exit_price,
+        "reason": np.asarray(EXIT_REASONS)[exits.reason[taken]],
+        "bars": exit_index - entry_index,
+        "ret": exit_price / entry_price - 1,
+    })
+    # An entry on the last bar has nothing to exit into
+    return trades[trades["bars"] > 0].reset_index(drop=True)
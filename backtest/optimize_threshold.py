@@ -4,6 +4,96 @@ import numpy as np
 import pandas as pd
 
 from backtest.vector_engine import VectorBacktestEngine
+from features.store import FeatureStore
+
+
+THRESHOLDS = np.round(np.arange(0.48, 0.61, 0.01), 3)
+ATR_FLOORS = np.array([0.0008, 0.0010, 0.0012, 0.0015, 0.0020])
+ADX_FLOORS = np.array([0.0, 8.0, 12.0, 16.0, 20.0, 25.0])
+FEES = np.array([0.0002, 0.0004, 0.0006])
+
+MIN_TRADES = 50
+
+
+def grid_search(
+    prob_up: np.ndarray,
+    atr_pct: np.ndarray,
+    adx: np.ndarray,
+    fwd_ret: np.ndarray,
+    thresholds: np.ndarray = THRESHOLDS,
+    atr_floors: np.ndarray = ATR_FLOORS,
+    adx_floors: np.ndarray = ADX_FLOORS,
+    fees: np.ndarray = FEES,
+) -> pd.DataFrame:
+    """
+    Every threshold x ATR floor x ADX floor x fee combination at once.
+
+    A bar trades when prob_up >= threshold, atr_pct > atr floor and
+    adx >= adx floor, and earns its own next-bar return minus the fee.
+    For each (ATR, ADX) gate pair, only the bars that pass the gate and
+    the loosest threshold are kept. All thresholds x fees are then
+    evaluated in one broadcast (thresholds, fees, bars) pass. Drawdown
+    is the largest drop of cumulative log equity below its running
+    peak.
+    """
+    valid = np.isfinite(fwd_ret)
+    prob_up, atr_pct, adx, fwd_ret = (a[valid] for a in (prob_up, atr_pct, adx, fwd_ret))
+
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    fees = np.asarray(fees, dtype=np.float64)
+    n_th, n_fee = len(thresholds), len(fees)
+
+    blocks = []
+    for atr_floor in atr_floors:
+        for adx_floor in adx_floors:
+            keep = (atr_pct > atr_floor) & (adx >= adx_floor) & (prob_up >= thresholds.min())
+            p, r = prob_up[keep], fwd_ret[keep]
+
+            mask = (p[None, :] >= thresholds[:, None]).astype(np.float64)  # (th, bars)
+            net = r[None, :] - fees[:, None]                               # (fee, bars)
+
+            count = np.broadcast_to(mask.sum(axis=1)[:, None], (n_th, n_fee))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                expectancy = (mask @ net.T) / count
+                win_rate = (mask @ (net > 0).T.astype(np.float64)) / count
+
+            # Flat bars add log(1) = 0 to the equity path
+            log_equity = np.cumsum(mask[:, None, :] * np.log1p(net)[None, :, :], axis=2)
+            if log_equity.shape[2]:
+                peak = np.maximum(np.maximum.accumulate(log_equity, axis=2), 0.0)
+                max_dd = 1.0 - np.exp(-(peak - log_equity).max(axis=2))
+            else:
+                max_dd = np.zeros((n_th, n_fee))
+
+            th, fee = np.meshgrid(thresholds, fees, indexing="ij")
+            blocks.append(pd.DataFrame({
+                "threshold": th.ravel(),
+                "atr_floor": atr_floor,
+                "adx_floor": adx_floor,
+                "fee": fee.ravel(),
+                "trades": count.ravel().astype(np.int64),
+                "expectancy": expectancy.ravel(),
+                "win_rate": win_rate.ravel(),
+                "max_dd": max_dd.ravel(),
+            }))
+
+    res = pd.concat(blocks, ignore_index=True)
+    res["score"] = res["expectancy"] / (res["max_dd"] + 1e-6)
+    return res
+
+
+def surface(
+    res: pd.DataFrame,
+    value: str = "expectancy",
+    index: str = "threshold",
+    columns: str = "adx_floor",
+    aggfunc: str = "max",
+) -> pd.DataFrame:
+    """
+    2-D view of one metric, reduced over the remaining grid axes
+    with `aggfunc` ("min" for drawdown).
+    """
+    return res.pivot_table(values=value, index=index, columns=columns, aggfunc=aggfunc)
 
 
 def optimize_long_threshold(
@@ -13,55 +103,67 @@ def optimize_long_threshold(
     timeframe: str = "15m",
     lookback: int = 300,
     limit: int = 20_000,
+    thresholds: np.ndarray = THRESHOLDS,
+    atr_floors: np.ndarray = ATR_FLOORS,
+    adx_floors: np.ndarray = ADX_FLOORS,
+    fees: np.ndarray = FEES,
+    df: pd.DataFrame | None = None,
+    feature_store: FeatureStore | None = None,
+    search_gates: bool = False,
+    since: int | None = None,
 ):
+    """
+    Returns (best, res): res holds every viable combination of the
+    grid, sorted by score. best is picked at the engine's own fee and,
+    unless `search_gates`, at the engine's own ATR / ADX floors, so
+    its threshold is only valid together with those floors. With
+    `search_gates` best is the top (threshold, ATR floor, ADX floor)
+    triple and its floors must be applied with the threshold.
+
+    best["threshold"] is the prob_up cut; best["long_threshold"] is
+    the model threshold that produces it in VectorBacktestEngine,
+    i.e. with the engine's THRESHOLD_OFFSET taken out.
+    Pass `df` to tune on stored history instead of fetching `limit` bars,
+    and `since` (bar open time, ms) to tune only on bars from then on,
+    e.g. those the model was never trained on.
+    """
     bt = VectorBacktestEngine(
         symbol=symbol,
         timeframe=timeframe,
         model_path=model_path,
         scaler_path=scaler_path,
         lookback=lookback,
+        feature_store=feature_store,
     )
 
-    df = bt.run(limit=limit)
-
-    results = []
-
-    for th in np.arange(0.48, 0.61, 0.01):
-        mask = (
-            (df["prob_up"] >= th)
-            & (df["atr_pct"] > 0.0012)
-            & (df["adx"] >= 8)
-        )
-
-        trades = df[mask].copy()
-        if len(trades) < 50:
-            continue
-
-        trades["ret"] = trades["close"].pct_change().shift(-1)
-        trades["net_ret"] = trades["ret"] - bt.fee_pct
-
-        expectancy = trades["net_ret"].mean()
-        win_rate = (trades["net_ret"] > 0).mean()
-
-        equity = (1 + trades["net_ret"]).cumprod()
-        peak = equity.cummax()
-        drawdown = (peak - equity) / peak
-        max_dd = drawdown.max()
-
-        score = expectancy / (max_dd + 1e-6)
-
-        results.append({
-            "threshold": round(th, 3),
-            "trades": len(trades),
-            "expectancy": expectancy,
-            "win_rate": win_rate,
-            "max_dd": max_dd,
-            "score": score,
-        })
+    df = bt.run(limit=limit, df=df)
+    if since is not None:
+        df = df[df["time"] >= since]
+
+    fees = np.union1d(fees, [bt.fee_pct])
+    atr_floors = np.union1d(atr_floors, [bt.atr_floor])
+    adx_floors = np.union1d(adx_floors, [bt.adx_floor])
+    res = grid_search(
+        df["prob_up"].to_numpy(),
+        df["atr_pct"].to_numpy(),
+        df["adx"].to_numpy(),
+        df["ret"].to_numpy(),
+        thresholds,
+        atr_floors,
+        adx_floors,
+        fees,
+    )
+    res["long_threshold"] = res["threshold"] - bt.THRESHOLD_OFFSET
 
-    res = pd.DataFrame(results).sort_values("score", ascending=False)
+    res = res[res["trades"] >= MIN_TRADES].sort_values("score", ascending=False)
 
-    if res.empty:
+    at_fee = res[np.isclose(res["fee"], bt.fee_pct)]
+    if not search_gates:
+        at_fee = at_fee[
+            np.isclose(at_fee["atr_floor"], bt.atr_floor)
+            & np.isclose(at_fee["adx_floor"], bt.adx_floor)
+        ]
+    if at_fee.empty:
         raise RuntimeError("No viable thresholds found.")
 
-    return res.iloc[0], res
+    return at_fee.iloc[0], res
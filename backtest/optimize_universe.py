@@ -0,0 +1,219 @@
+# backtest/optimize_universe.py
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from backtest.optimize_threshold import optimize_long_threshold
+from data.history import fetch_history
+from execution.scheduler import timeframe_ms
+from features.store import FeatureStore
+from models.metadata import metadata_path, read_metadata, update_metadata
+from models.registry import ModelRegistry
+from train.train_direction_model import limit_torch_threads
+
+
+# Bars loaded before the tuning window: indicator warm-up + engine lookback
+WARMUP_BARS = 600
+
+SUMMARY_COLUMNS = [
+    "symbol",
+    "long_threshold",
+    "threshold",
+    "atr_floor",
+    "adx_floor",
+    "trades",
+    "expectancy",
+    "win_rate",
+    "max_dd",
+    "score",
+    "seconds",
+]
+
+
+def trained_symbols(root: str = "models") -> list[str]:
+    """
+    Symbols with model weights, scaler and metadata.json on disk.
+    """
+    symbols = []
+    for meta in sorted(Path(root).glob("*/metadata.json")):
+        folder = meta.parent
+        if not ((folder / "model.pt").exists() and (folder / "scaler.save").exists()):
+            continue
+
+        metadata = read_metadata(meta) or {}
+        symbols.append(metadata.get("symbol", folder.name.replace("_", "/")))
+    return symbols
+
+
+def tuning_start(metadata: dict) -> int:
+    """
+    Open time of the first bar the model was not trained on: its
+    validation split, or its training time for older metadata.
+    """
+    if "val_start_time" in metadata:
+        return int(metadata["val_start_time"])
+    if "trained_at_utc" in metadata:
+        return int(datetime.fromisoformat(metadata["trained_at_utc"]).timestamp() * 1000)
+    raise ValueError("metadata has no validation split or training time")
+
+
+def optimize_symbol(
+    symbol: str,
+    df: pd.DataFrame,
+    timeframe: str,
+    lookback: int,
+    since: int,
+) -> dict:
+    """
+    Grid-search one symbol's long threshold and gate floors on the
+    stored bars from `since` on. Runs in a worker process; writes
+    only to the feature store.
+    """
+    started = time.perf_counter()
+    folder = metadata_path(symbol).parent
+
+    best, res = optimize_long_threshold(
+        symbol=symbol,
+        model_path=str(folder / "model.pt"),
+        scaler_path=str(folder / "scaler.save"),
+        timeframe=timeframe,
+        lookback=lookback,
+        limit=len(df),
+        df=df,
+        feature_store=FeatureStore(),
+        search_gates=True,
+        since=since,
+    )
+
+    tuned = df[df["time"] >= since]
+    return {
+        "symbol": symbol,
+        "long_threshold": float(best["long_threshold"]),
+        "threshold": float(best["threshold"]),
+        "atr_floor": float(best["atr_floor"]),
+        "adx_floor": float(best["adx_floor"]),
+        "fee": float(best["fee"]),
+        "trades": int(best["trades"]),
+        "expectancy": float(best["expectancy"]),
+        "win_rate": float(best["win_rate"]),
+        "max_dd": float(best["max_dd"]),
+        "score": float(best["score"]),
+        "combos": int(len(res)),
+        "bars": int(len(tuned)),
+        "first_bar": int(tuned["time"].iloc[0]),
+        "last_bar": int(tuned["time"].iloc[-1]),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def write_result(symbol: str, result: dict, timeframe: str) -> None:
+    """
+    Store the chosen threshold, the gate floors it was tuned with and
+    its evaluation stats in metadata.json, then drop the cached model
+    so the next load picks them up.
+    """
+    metadata = read_metadata(metadata_path(symbol)) or {}
+    stats = {k: v for k, v in result.items() if k not in ("symbol", "seconds")}
+
+    update_metadata(symbol, {
+        "optimized_long_threshold": result["long_threshold"],
+        "optimized_gates": {
+            "atr_floor": result["atr_floor"],
+            "adx_floor": result["adx_floor"],
+        },
+        "threshold_optimization": {
+            **stats,
+            "timeframe": timeframe,
+            "model_trained_at_utc": metadata.get("trained_at_utc"),
+            "optimized_at_utc": datetime.now(timezone.utc).isoformat(),
+        },
+    })
+    ModelRegistry.shared().invalidate(symbol)
+
+
+# ----------------------------------
+def optimize_universe(
+    symbols: list[str] | None = None,
+    timeframe: str = "15m",
+    lookback: int = 300,
+    workers: int | None = None,
+    write: bool = True,
+) -> pd.DataFrame:
+    """
+    Tune every trained symbol in parallel, one process per symbol.
+
+    Each symbol is tuned out of sample, on the bars from its model's
+    validation split on (see tuning_start). History comes from the
+    checkpointed candle store, loaded in this process so the exchange
+    rate limit is shared. Each worker featurizes, scores and
+    grid-searches its symbol, and results are written here as workers
+    finish. Returns one summary row per symbol; failed symbols carry
+    an `error`.
+    """
+    symbols = symbols or trained_symbols()
+    tf_ms = timeframe_ms(timeframe)
+
+    frames, starts, rows = {}, {}, []
+    for symbol in symbols:
+        try:
+            since = tuning_start(read_metadata(metadata_path(symbol)) or {})
+        except ValueError as e:
+            rows.append({"symbol": symbol, "error": str(e)})
+            continue
+
+        try:
+            df = fetch_history(symbol, timeframe, since=since - WARMUP_BARS * tf_ms)
+        except Exception as e:
+            print(f"⚠️ {symbol}: history unavailable ({e})")
+            rows.append({"symbol": symbol, "error": "no history"})
+            continue
+
+        if not (df["time"] >= since).any():
+            rows.append({"symbol": symbol, "error": "no bars after the validation split"})
+            continue
+        frames[symbol], starts[symbol] = df, since
+
+    workers = workers or min(len(frames), os.cpu_count() or 1) or 1
+
+    # fork after fetch_history's threads, ccxt sessions and torch
+    # have started can deadlock: spawn, one torch thread per worker
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=limit_torch_threads,
+        initargs=(1,),
+    ) as pool:
+        futures = {
+            pool.submit(optimize_symbol, symbol, df, timeframe, lookback, starts[symbol]): symbol
+            for symbol, df in frames.items()
+        }
+
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {symbol}: {e}")
+                rows.append({"symbol": symbol, "error": str(e)})
+                continue
+
+            if write:
+                write_result(symbol, result, timeframe)
+            print(
+                f"✅ {symbol}: LONG_TH={result['long_threshold']:.2f} "
+                f"ATR>{result['atr_floor']:g} ADX>={result['adx_floor']:g} "
+                f"on {result['bars']} bars ({result['seconds']:.1f}s)"
+            )
+            rows.append(result)
+
+    summary = pd.DataFrame(rows)
+    for column in SUMMARY_COLUMNS + ["error"]:
+        if column not in summary:
+            summary[column] = None
+    return summary.sort_values("symbol").reset_index(drop=True)
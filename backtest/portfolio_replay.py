@@ -0,0 +1,214 @@
+# backtest/portfolio_replay.py
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from execution.btc_context import BTC_SYMBOL, BTCContextModel, align_probs
+from execution.runner import TradingRunner
+from execution.scheduler import timeframe_ms
+from features.cache import FeatureCache
+from models.registry import ModelRegistry
+
+
+@dataclass
+class ReplayResult:
+    trades: pd.DataFrame
+    runners: dict[str, TradingRunner] = field(repr=False)
+    starting_balance: float = 0.0
+    last_close: dict[str, float] = field(default_factory=dict)
+
+    def summary(self) -> dict:
+        """
+        Positions still open at the end are marked to their symbol's
+        last close and counted in final_equity / net_pnl.
+        """
+        exits = self.trades[self.trades["event"] == "exit"] if len(self.trades) else self.trades
+        realized = sum(r.risk_state.current_balance for r in self.runners.values())
+
+        open_positions = {
+            symbol: r.broker.position
+            for symbol, r in self.runners.items()
+            if r.broker.position is not None
+        }
+        unrealized = sum(p.pnl(self.last_close[s]) for s, p in open_positions.items())
+        final = realized + unrealized
+
+        if len(exits):
+            equity = exits["equity"]
+            peak = equity.cummax()
+            max_dd = float(((peak - equity) / peak).max())
+            win_rate = float((exits["pnl"] > 0).mean())
+        else:
+            max_dd = win_rate = 0.0
+
+        return {
+            "symbols": len(self.runners),
+            "trades": len(exits),
+            "win_rate": win_rate,
+            "open_positions": len(open_positions),
+            "unrealized_pnl": unrealized,
+            "net_pnl": final - self.starting_balance,
+            "final_equity": final,
+            "max_dd": max_dd,
+        }
+
+
+class _ReplayBTCContext:
+    """
+    Stand-in for BTCContextService: serves the BTC probabilities
+    precomputed from the replayed BTC history. Never fetches or
+    refreshes; with no history every bar reads NEUTRAL.
+    """
+
+    def __init__(self, timeframe: str, probs: pd.Series | None):
+        self.timeframe = timeframe
+        self.probs = probs
+        self.latest = None
+
+    def probs_at(self, times, df: pd.DataFrame | None = None) -> np.ndarray:
+        if self.probs is None:
+            return np.full(len(times), BTCContextModel.NEUTRAL)
+        return align_probs(self.probs, times)
+
+    def prob_at(self, time: int) -> float:
+        return float(self.probs_at([time])[0])
+
+
+class PortfolioReplay:
+    """
+    Event-driven replay of the live decision stack.
+
+    One real TradingRunner per symbol (regime controller, supervisor,
+    market guard, risk state, cooldown, strategy thresholds) is driven
+    bar by bar across all symbols in time order, on a simulated clock
+    set to each bar's close. Features and ensemble probabilities are
+    computed up front in batch, so a bar costs only the decision logic.
+    """
+
+    def __init__(
+        self,
+        symbols: list[str],
+        timeframe: str = "15m",
+        lookback: int = 300,
+        starting_balance_usdt: float = 500.0,
+        cooldown_minutes: int = 30,
+        risk_per_trade: float = 0.01,
+    ):
+        self.symbols = symbols
+        self.timeframe = timeframe
+        self.lookback = lookback
+
+        self.runner_kwargs = dict(
+            timeframe=timeframe,
+            lookback=lookback,
+            mode="shadow",
+            starting_balance_usdt=starting_balance_usdt,
+            cooldown_minutes=cooldown_minutes,
+            risk_per_trade=risk_per_trade,
+            verbose=False,
+        )
+
+    # ----------------------------------
+    def _btc_context(self, frames: dict[str, pd.DataFrame]) -> _ReplayBTCContext | None:
+        """
+        BTC model probability per BTC bar time, as the shared BTC
+        context would have published it live. None when there is no
+        BTC model, so alt runners get no BTC member, as live.
+        """
+        try:
+            model = ModelRegistry.shared().get(BTC_SYMBOL)
+        except Exception as e:
+            print(f"⚠️ BTC context unavailable: {e}")
+            return None
+
+        if BTC_SYMBOL not in frames:
+            print("⚠️ No BTC history: BTC context stays neutral")
+            return _ReplayBTCContext(self.timeframe, None)
+
+        featured = FeatureCache.shared().features(frames[BTC_SYMBOL], BTC_SYMBOL, self.timeframe)
+        probs = model.predict_proba_series(featured)
+        return _ReplayBTCContext(self.timeframe, pd.Series(probs, index=featured["time"].to_numpy()))
+
+    # ----------------------------------
+    def run(self, frames: dict[str, pd.DataFrame]) -> ReplayResult:
+        """
+        Replay stored OHLCV histories (one frame per symbol, closed
+        bars only). Trading starts at bar `lookback` of each symbol.
+        """
+        needs_btc = any(s != BTC_SYMBOL for s in self.symbols)
+        context = self._btc_context(frames) if needs_btc else None
+
+        runners: dict[str, TradingRunner] = {}
+        last_close: dict[str, float] = {}
+        streams = []
+
+        for symbol in self.symbols:
+            df = frames.get(symbol)
+            if df is None or len(df) <= self.lookback:
+                print(f"⚠️ {symbol}: not enough history, skipped")
+                continue
+
+            runner = TradingRunner(
+                symbol=symbol,
+                btc_context=context if symbol != BTC_SYMBOL else None,
+                **self.runner_kwargs,
+            )
+
+            featured = FeatureCache.shared().features(df, symbol, self.timeframe)
+            probs = runner.model.predict_proba_series(featured)
+
+            keep = (featured["time"] >= df["time"].iloc[self.lookback]).to_numpy()
+            rows = featured.loc[keep, ["time", "close", "ema200", "atr_pct", "adx"]]
+
+            runners[symbol] = runner
+            last_close[symbol] = float(df["close"].iloc[-1])
+            streams.append((symbol, rows.to_dict("records"), probs[keep]))
+
+        trades = self._replay(runners, streams)
+
+        return ReplayResult(
+            trades=trades,
+            runners=runners,
+            starting_balance=self.runner_kwargs["starting_balance_usdt"] * len(runners),
+            last_close=last_close,
+        )
+
+    def _replay(self, runners: dict[str, TradingRunner], streams: list) -> pd.DataFrame:
+        tf_ms = timeframe_ms(self.timeframe)
+
+        times = np.concatenate([[r["time"] for r in rows] for _, rows, _ in streams] or [[]])
+        stream_idx = np.concatenate(
+            [np.full(len(rows), i) for i, (_, rows, _) in enumerate(streams)] or [[]]
+        ).astype(int)
+        row_idx = np.concatenate([np.arange(len(rows)) for _, rows, _ in streams] or [[]]).astype(int)
+
+        # Bars in time order; within a bar, symbols in a fixed order
+        order = np.lexsort((stream_idx, times))
+
+        equity = sum(r.risk_state.current_balance for r in runners.values())
+        events = []
+
+        clock_time, now = None, None
+        for k in order:
+            symbol, rows, probs = streams[stream_idx[k]]
+            row = rows[row_idx[k]]
+
+            if row["time"] != clock_time:
+                clock_time = row["time"]
+                now = datetime.utcfromtimestamp((clock_time + tf_ms) / 1000)
+
+            event = runners[symbol].process_bar(row, now, float(probs[row_idx[k]]))
+            if event is None:
+                continue
+
+            if event["event"] == "exit":
+                equity += event["pnl"]
+            events.append({"time": now, "symbol": symbol, **event, "equity": equity})
+
+        return pd.DataFrame(
+            events,
+            columns=["time", "symbol", "event", "side", "price", "qty", "prob_up", "pnl", "equity"],
+        )
@@ -9,9 +9,9 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 try:
-    from backtest.optimize_threshold import optimize_long_threshold
+    from backtest.optimize_threshold import optimize_long_threshold, surface
 except ModuleNotFoundError:
-    from optimize_threshold import optimize_long_threshold
+    from optimize_threshold import optimize_long_threshold, surface
 
 
 def main():
@@ -30,6 +30,11 @@ def main():
     print("\n===== TOP 5 =====")
     print(full.head())
 
+    at_fee = full[full["fee"] == best["fee"]]
+    for metric, agg in (("expectancy", "max"), ("win_rate", "max"), ("max_dd", "min"), ("trades", "max")):
+        print(f"\n===== {metric.upper()} (threshold x ADX floor, fee={best['fee']}) =====")
+        print(surface(at_fee, value=metric, aggfunc=agg).round(5))
+
 
 if __name__ == "__main__":
     main()
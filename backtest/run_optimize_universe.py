@@ -0,0 +1,38 @@
+# backtest/run_optimize_universe.py
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backtest.optimize_universe import SUMMARY_COLUMNS, optimize_universe
+
+
+TIMEFRAME = "15m"
+WORKERS = None  # one per symbol, up to the core count
+
+
+def main():
+    started = time.perf_counter()
+    summary = optimize_universe(timeframe=TIMEFRAME, workers=WORKERS)
+    elapsed = time.perf_counter() - started
+
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print("\n===== OPTIMIZED LONG THRESHOLDS =====")
+        print(summary[SUMMARY_COLUMNS].round(5).to_string(index=False))
+
+    failed = summary[summary["error"].notna()]
+    for _, row in failed.iterrows():
+        print(f"⚠️ {row['symbol']}: {row['error']}")
+
+    print(f"\n⏱️ {len(summary) - len(failed)}/{len(summary)} symbols tuned in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
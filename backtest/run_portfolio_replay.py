@@ -0,0 +1,57 @@
+# backtest/run_portfolio_replay.py
+
+import sys
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data.history import fetch_history
+from execution.btc_context import BTC_SYMBOL
+from backtest.portfolio_replay import PortfolioReplay
+
+
+SYMBOLS = [
+    "BTC/USDT",
+    "ETH/USDT",
+    "BNB/USDT",
+    "SOL/USDT",
+    "XRP/USDT",
+    "ADA/USDT",
+    "DOGE/USDT",
+    "AVAX/USDT",
+    "LINK/USDT",
+    "MATIC/USDT",
+]
+TIMEFRAME = "15m"
+CANDLES = 35_040  # one year of 15m bars
+
+OUTPUT = "data_outputs/portfolio_replay_trades.csv"
+
+
+def main():
+    print("Loading history...")
+    frames = {}
+    for symbol in dict.fromkeys(SYMBOLS + [BTC_SYMBOL]):
+        frames[symbol] = fetch_history(symbol, TIMEFRAME, candles=CANDLES)
+
+    replay = PortfolioReplay(SYMBOLS, TIMEFRAME)
+
+    started = time.perf_counter()
+    result = replay.run(frames)
+    elapsed = time.perf_counter() - started
+
+    result.trades.to_csv(OUTPUT, index=False)
+
+    summary = result.summary()
+    print(f"\n📊 Portfolio replay ({elapsed:.1f}s)")
+    for key, value in summary.items():
+        print(f"  {key:>13}: {value:.4f}" if isinstance(value, float) else f"  {key:>13}: {value}")
+    print(f"✅ Trades saved to {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,9 @@
 # backtest/run_walkforward.py
 
 import sys
+import time
 from pathlib import Path
 
-import ccxt
 import pandas as pd
 
 
@@ -11,10 +11,8 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-try:
-    from backtest.simulator import HistoricalSimulator
-except ModuleNotFoundError:
-    from simulator import HistoricalSimulator
+from data.history import fetch_history
+from backtest.walkforward import walk_forward
 
 
 SYMBOL = "BTC/USDT"
@@ -23,105 +21,50 @@ TOTAL_CANDLES = 50_000
 
 TRAIN_SIZE = 8_000
 TEST_SIZE = 3_000
-
-
-def fetch_history() -> pd.DataFrame:
-    exchange = ccxt.binance({"enableRateLimit": True})
-    since = exchange.milliseconds() - TOTAL_CANDLES * 15 * 60 * 1000
-
-    all_bars: list[list] = []
-
-    while len(all_bars) < TOTAL_CANDLES:
-        bars = exchange.fetch_ohlcv(
-            SYMBOL,
-            TIMEFRAME,
-            since=since,
-            limit=1000,
-        )
-        if not bars:
-            break
-
-        all_bars.extend(bars)
-        since = bars[-1][0] + 1
-
-    return pd.DataFrame(
-        all_bars,
-        columns=["time", "open", "high", "low", "close", "volume"],
-    )
-
-
-def compute_metrics(trades: pd.DataFrame) -> dict:
-    wins = trades[trades["pnl"] > 0]
-    losses = trades[trades["pnl"] <= 0]
-
-    win_rate = len(wins) / len(trades)
-    avg_win = wins["pnl"].mean()
-    avg_loss = abs(losses["pnl"].mean())
-
-    expectancy = win_rate * avg_win - (1 - win_rate) * avg_loss
-
-    equity = trades["balance"]
-    peak = equity.cummax()
-    drawdown = (peak - equity) / peak
-
-    return {
-        "trades": len(trades),
-        "win_rate": win_rate,
-        "expectancy": expectancy,
-        "max_dd": drawdown.max(),
-    }
+WORKERS = None  # one per fold, up to the core count
+
+SUMMARY_COLUMNS = [
+    "fold",
+    "epochs",
+    "test_accuracy",
+    "test_f1",
+    "trades",
+    "win_rate",
+    "expectancy",
+    "return",
+    "max_dd",
+    "seconds",
+]
 
 
 def main():
     print("Fetching historical data...")
-    df = fetch_history()
+    df = fetch_history(SYMBOL, TIMEFRAME, candles=TOTAL_CANDLES)
     print(f"Fetched {len(df)} candles")
 
-    results = []
-    start = 0
-    segment = 1
-
-    while start + TRAIN_SIZE + TEST_SIZE <= len(df):
-        test_df = df.iloc[start + TRAIN_SIZE : start + TRAIN_SIZE + TEST_SIZE]
-
-        print(f"\n--- Walk Forward Segment {segment} ---")
-
-        sim = HistoricalSimulator(
-            model_path="models/ai_model.pt",
-            scaler_path="models/scaler.save",
-            starting_balance=500.0,
-        )
-
-        for i in range(sim.lookback, len(test_df)):
-            window = test_df.iloc[i - sim.lookback : i + 1]
-            sim.step(window)
-
-        trades = pd.DataFrame(sim.trades)
-        if trades.empty:
-            print("No trades.")
-        else:
-            metrics = compute_metrics(trades)
-            results.append({"segment": segment, **metrics})
-
-            print(
-                f"Trades={metrics['trades']} | "
-                f"WinRate={metrics['win_rate']:.3f} | "
-                f"Expectancy={metrics['expectancy']:.4f} | "
-                f"MaxDD={metrics['max_dd']:.4f}"
-            )
-
-        start += TEST_SIZE
-        segment += 1
+    started = time.perf_counter()
+    summary = walk_forward(
+        SYMBOL,
+        df,
+        timeframe=TIMEFRAME,
+        train_size=TRAIN_SIZE,
+        test_size=TEST_SIZE,
+        workers=WORKERS,
+    )
+    elapsed = time.perf_counter() - started
 
-    summary = pd.DataFrame(results)
     print("\n========== SUMMARY ==========")
-    print(summary)
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print(summary[[c for c in SUMMARY_COLUMNS if c in summary]].round(4).to_string(index=False))
 
-    if not summary.empty:
-        print("\nAverage Expectancy:", summary["expectancy"].mean())
-        print("Worst Drawdown:", summary["max_dd"].max())
+    done = summary[summary["trades"].notna()] if "trades" in summary else summary.iloc[0:0]
+    if not done.empty:
+        print("\nAverage Expectancy:", done["expectancy"].mean())
+        print("Average Test F1:", done["test_f1"].mean())
+        print("Worst Drawdown:", done["max_dd"].max())
+
+    print(f"\n⏱️ {len(summary)} folds in {elapsed:.1f}s (fold time {summary['seconds'].sum():.1f}s)")
 
 
 if __name__ == "__main__":
     main()
-
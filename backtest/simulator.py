@@ -1,9 +1,14 @@
 # backtest/simulator.py
 
+import numpy as np
 import pandas as pd
-import ta
 
 from execution.broker import PaperBroker
+from features.numpy_technicals import (
+    FeatureArray,
+    compute_core_features_numpy,
+    sliding_core_features,
+)
 from models.direction import DirectionModel
 from risk.limits import RiskLimits, RiskState
 from risk.sizing import fixed_fractional_size
@@ -19,10 +24,10 @@ class HistoricalSimulator:
     ):
         self.model = DirectionModel(model_path, scaler_path)
 
+        # Effectively unlimited: the simulator measures raw strategy behavior
         self.risk_limits = RiskLimits(
             max_daily_loss_pct=1.0,
-            max_weekly_loss_pct=1.0,
-            max_trades_per_day=100_000,
+            max_consecutive_losses=100_000,
         )
 
         self.risk_state = RiskState(starting_balance)
@@ -41,21 +46,84 @@ class HistoricalSimulator:
         self.highest_price: float | None = None
         self.lowest_price: float | None = None
 
+    def run(self, df: pd.DataFrame) -> None:
+        """
+        Simulate a full history: same ledger as feeding step() every
+        window df.iloc[i - lookback : i + 1] for i >= lookback, but the
+        windowed indicators and probabilities of all bars are computed
+        in one batched pass, then the trailing-stop / risk state
+        machine runs over plain arrays.
+        """
+        self._replay(df, self.lookback + 1)
+
     def step(self, df: pd.DataFrame) -> None:
-        current_date = pd.to_datetime(df.iloc[-1]["time"], unit="ms").date()
-        self.risk_state.reset_if_new_day(current_date)
+        """
+        One bar: the last row of `df`, with every indicator seeded at
+        the window's first bar.
+        """
+        self._replay(df, len(df))
+
+    def _replay(self, df: pd.DataFrame, window: int) -> None:
+        if len(df) < window or window < 1:
+            return
+
+        features = None
+        if window == len(df):
+            # Single window (step): the closed-form backend is faster
+            featured = compute_core_features_numpy(df, as_frame=False)
+            if len(featured.rows) and featured.rows[-1] == window - 1:
+                features = FeatureArray(
+                    featured.values[-1:].astype(np.float64), featured.columns, featured.rows[-1:]
+                )
+        if features is None:
+            features = sliding_core_features(df, window)
+
+        col = features.columns
+        values = features.values
+
+        model_cols = [col[name] for name in self.model.feature_columns]
+        valid = np.isfinite(values).all(axis=1)
+
+        probs = np.full(len(values), 0.5)
+        if valid.any():
+            probs[valid] = self.model.predict_proba_series(
+                values[valid][:, model_cols].astype(np.float32)
+            )
+
+        # A window whose last row the backend drops is scored on its last
+        # valid row, like predict_proba on the window. Without EMA200 /
+        # ATR on the bar no entry can happen, so its probability is moot.
+        tradable = np.isfinite(values[:, [col["ema200"], col["atr"]]]).all(axis=1)
+        for i in np.flatnonzero(~valid & tradable):
+            end = features.rows[i] + 1
+            probs[i] = self.model.predict_proba(df.iloc[end - window : end])
+
+        times = df["time"].to_numpy()[features.rows]
 
-        price = df.iloc[-1]["close"]
-        prob_up = self.model.predict_proba(df)
+        # One date object per bar, converted in a single vectorized call
+        dates = pd.to_datetime(times, unit="ms").date
+        prices = df["close"].to_numpy(dtype=np.float64)[features.rows].tolist()
+        ema200 = values[:, col["ema200"]].tolist()
+        atr = values[:, col["atr"]].tolist()
+        probs = probs.tolist()
 
-        df = df.copy()
-        df["ema200"] = ta.trend.EMAIndicator(df["close"], 200).ema_indicator()
-        df["atr"] = ta.volatility.AverageTrueRange(
-            df["high"], df["low"], df["close"], 14
-        ).average_true_range()
+        for i in range(len(times)):
+            self._decide(dates[i], prices[i], ema200[i], atr[i], probs[i])
+
+    def _decide(
+        self,
+        current_date,
+        price: float,
+        ema200: float,
+        atr: float,
+        prob_up: float,
+    ) -> None:
+        """
+        Exit / entry state machine for one bar, on plain scalars.
+        """
+        self.risk_state.reset_if_new_day(current_date)
 
-        ema200 = df.iloc[-1]["ema200"]
-        atr_pct = df.iloc[-1]["atr"] / price
+        atr_pct = atr / price
 
         # ================= EXIT =================
         if self.broker.position:
@@ -1,23 +1,38 @@
 # backtest/vector_engine.py
 
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
+from backtest.exits import ExitRules, simulate_long_trades
 from data.fetcher import MarketDataFetcher
 from models.direction import DirectionModel
-from features.technicals import compute_core_features
+from features.cache import FeatureCache
+from features.store import FeatureStore
 
 
 class VectorBacktestEngine:
     """
     Ultra-fast vectorized backtest (signal-level).
-    No execution latency, no trailing logic.
+    No execution latency. Without `exit_rules` every signal is a
+    one-bar hold; with them positions are held until a trailing /
+    fixed stop, take-profit or time exit resolved on the high/low path.
     Designed for:
       - strategy validation
       - threshold tuning
       - model comparison
+
+    A bar signals when prob_up >= long_threshold + THRESHOLD_OFFSET,
+    atr_pct > atr_floor and adx >= adx_floor. The floors default to
+    ATR_FLOOR / ADX_FLOOR, or the ones tuned together with the model's
+    optimized_long_threshold (metadata "optimized_gates").
     """
 
+    THRESHOLD_OFFSET = -0.03
+    ATR_FLOOR = 0.0012
+    ADX_FLOOR = 8.0
+
     def __init__(
         self,
         symbol: str,
@@ -26,48 +41,118 @@ class VectorBacktestEngine:
         scaler_path: str,
         lookback: int = 300,
         fee_pct: float = 0.0004,  # binance taker
+        exit_rules: ExitRules | None = None,
+        feature_store: FeatureStore | None = None,
     ):
         self.symbol = symbol
         self.timeframe = timeframe
         self.lookback = lookback
         self.fee_pct = fee_pct
+        self.exit_rules = exit_rules
+        self.feature_store = feature_store
+
+        self.trades: pd.DataFrame | None = None  # per-trade ledger with exit_rules
 
-        self.data = MarketDataFetcher()
-        self.model = DirectionModel(model_path, scaler_path)
+        self._data: MarketDataFetcher | None = None  # only needed when run() fetches
+        self.model = DirectionModel(
+            model_path,
+            scaler_path,
+            metadata_path=str(Path(model_path).with_name("metadata.json")),
+        )
 
-    def run(self, limit: int = 10_000) -> pd.DataFrame:
-        df = self.data.fetch_ohlcv(self.symbol, self.timeframe, limit=limit)
-        df = compute_core_features(df)
+        gates = self.model.metadata.get("optimized_gates") or {}
+        self.atr_floor = float(gates.get("atr_floor", self.ATR_FLOOR))
+        self.adx_floor = float(gates.get("adx_floor", self.ADX_FLOOR))
 
-        # ---- AI inference (vectorized loop, unavoidable) ----
-        probs = []
-        for i in range(self.lookback, len(df)):
-            window = df.iloc[i - self.lookback : i + 1]
-            probs.append(self.model.predict_proba(window))
+    @property
+    def signal_threshold(self) -> float:
+        return self.model.long_threshold + self.THRESHOLD_OFFSET
+
+    @property
+    def data(self) -> MarketDataFetcher:
+        if self._data is None:
+            self._data = MarketDataFetcher()
+        return self._data
+
+    def run(self, limit: int = 10_000, df: pd.DataFrame | None = None) -> pd.DataFrame:
+        """
+        Backtest the last `limit` bars, or an already-loaded OHLCV frame.
+        """
+        if df is None:
+            df = self.data.fetch_ohlcv(self.symbol, self.timeframe, limit=limit)
+        # ---- Features + AI inference (one batched pass) ----
+        if self.feature_store is not None:
+            # Same entry as training when the label spec and range match
+            label = {
+                k: self.model.metadata[k]
+                for k in ("horizon", "atr_multiplier")
+                if k in self.model.metadata
+            }
+            entry = self.feature_store.get(
+                df, self.symbol, self.timeframe, self.model.feature_columns, **label
+            )
+            df = entry.to_frame()
+            probs = self.model.predict_proba_series(np.asarray(entry.X))
+        else:
+            df = FeatureCache.shared().features(df, self.symbol, self.timeframe)
+            probs = self.model.predict_proba_series(df)
 
         df = df.iloc[self.lookback :].copy()
-        df["prob_up"] = probs
+        df["prob_up"] = probs[self.lookback :]
 
         # ---- Signals ----
-        long_th = self.model.long_threshold - 0.03
-
         df["signal"] = 0
         df.loc[
-            (df["prob_up"] >= long_th)
-            & (df["atr_pct"] > 0.0012)
-            & (df["adx"] >= 8),
+            (df["prob_up"] >= self.signal_threshold)
+            & (df["atr_pct"] > self.atr_floor)
+            & (df["adx"] >= self.adx_floor),
             "signal",
         ] = 1
 
         # ---- Returns ----
         df["ret"] = df["close"].pct_change().shift(-1)
-        df["strategy_ret"] = df["signal"] * df["ret"]
 
-        # ---- Fees ----
-        df["fees"] = df["signal"].abs() * self.fee_pct
+        if self.exit_rules is None:
+            df["strategy_ret"] = df["signal"] * df["ret"]
+            df["fees"] = df["signal"].abs() * self.fee_pct
+        else:
+            self._apply_exits(df)
+
         df["net_ret"] = df["strategy_ret"] - df["fees"]
 
         # ---- Equity ----
         df["equity"] = (1 + df["net_ret"]).cumprod()
 
         return df
+
+    # ----------------------------------
+    def _apply_exits(self, df: pd.DataFrame) -> None:
+        """
+        Mark-to-market bar returns of the trades `exit_rules` produce:
+        close-to-close while held, close-to-fill on the exit bar, one
+        fee on the entry bar and one on the exit bar.
+        """
+        trades = simulate_long_trades(df, df["signal"].to_numpy(), self.exit_rules)
+        trades["net_ret"] = trades["ret"] - 2 * self.fee_pct
+        self.trades = trades
+
+        close = df["close"].to_numpy(dtype=np.float64)
+        n = len(close)
+
+        held = np.zeros(n + 1, dtype=np.int64)
+        np.add.at(held, trades["entry_index"].to_numpy() + 1, 1)
+        np.add.at(held, trades["exit_index"].to_numpy() + 1, -1)
+        position = np.cumsum(held[:n]) > 0
+
+        bar_ret = np.zeros(n)
+        bar_ret[1:] = close[1:] / close[:-1] - 1
+        exit_index = trades["exit_index"].to_numpy()
+        bar_ret[exit_index] = trades["exit_price"].to_numpy() / close[exit_index - 1] - 1
+
+        fees = np.zeros(n)
+        np.add.at(fees, trades["entry_index"].to_numpy(), self.fee_pct)
+        np.add.at(fees, exit_index, self.fee_pct)
+
+        df["position"] = position.astype(int)
+        df["strategy_ret"] = np.where(position, bar_ret, 0.0)
+        df["fees"] = fees
@@ -0,0 +1,225 @@
+# backtest/walkforward.py
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.preprocessing import StandardScaler
+
+from backtest.exits import ExitRules, simulate_long_trades
+from backtest.vector_engine import VectorBacktestEngine
+from features.store import DEFAULT_STORE_DIR, FeatureStore
+from models.direction import default_long_threshold
+from models.registry import ModelRegistry
+from train.train_direction_model import (
+    ATR_MULTIPLIER,
+    FEATURE_COLUMNS,
+    HORIZON,
+    PURGE_BARS,
+    TRAIN_SPLIT,
+    DirectionNet,
+    fit_model,
+    limit_torch_threads,
+    predict_chunked,
+    validation_metrics,
+)
+
+
+class Fold(NamedTuple):
+    index: int
+    train_start: int
+    train_end: int   # exclusive; the last `purge` rows are not trained on
+    test_start: int
+    test_end: int
+
+
+def make_folds(rows: int, train_size: int, test_size: int) -> list[Fold]:
+    """
+    Rolling folds: train on [s, s + train_size), test on the next
+    test_size rows, then slide by test_size.
+    """
+    folds = []
+    start = 0
+    while start + train_size + test_size <= rows:
+        test_start = start + train_size
+        folds.append(Fold(len(folds) + 1, start, test_start, test_start, test_start + test_size))
+        start += test_size
+    return folds
+
+
+def purged_split(fold: Fold, purge_bars: int) -> tuple[int, int, int]:
+    """
+    (fit_end, split, usable_end) of a fold's training window: fit on
+    [train_start, fit_end), early-stop on [split, usable_end). Each
+    gap is `purge_bars` wide, so no label reaches into the next part.
+    """
+    usable_end = fold.train_end - purge_bars
+    split = fold.train_start + int((usable_end - fold.train_start) * TRAIN_SPLIT)
+    return split - purge_bars, split, usable_end
+
+
+def signal_gates(symbol: str) -> tuple[float, float, float]:
+    """
+    (long_threshold, atr_floor, adx_floor) as VectorBacktestEngine
+    reads them for `symbol`'s saved model: the optimized threshold
+    and gates from its metadata, else the engine's defaults.
+    """
+    metadata = ModelRegistry.shared().metadata(symbol) or {}
+    gates = metadata.get("optimized_gates") or {}
+
+    long_threshold = metadata.get("optimized_long_threshold") or default_long_threshold(
+        metadata.get("metrics", {})
+    )
+    return (
+        float(long_threshold),
+        float(gates.get("atr_floor", VectorBacktestEngine.ATR_FLOOR)),
+        float(gates.get("adx_floor", VectorBacktestEngine.ADX_FLOOR)),
+    )
+
+
+# ----------------------------------
+def run_fold(
+    store_root: str,
+    symbol: str,
+    timeframe: str,
+    key: str,
+    fold: Fold,
+    purge_bars: int,
+    long_threshold: float,
+    atr_floor: float,
+    adx_floor: float,
+    fee_pct: float,
+    exit_rules: ExitRules,
+) -> dict:
+    """
+    Train a fresh model on one fold's purged training window and
+    score its test window. Runs in a worker process and reads the
+    feature store entry memory-mapped.
+    """
+    started = time.perf_counter()
+    entry = FeatureStore(store_root).load(symbol, timeframe, key)
+    X, y = entry.X, entry.y.reshape(-1, 1)
+
+    # ---- purged split of the training window (fit / early-stopping val) ----
+    fit_end, split, usable_end = purged_split(fold, purge_bars)
+
+    scaler = StandardScaler()
+    X_fit = scaler.fit_transform(X[fold.train_start : fit_end])
+    X_val = scaler.transform(X[split:usable_end])
+    X_test = scaler.transform(X[fold.test_start : fold.test_end])
+
+    tag = f"{symbol}#{fold.index}"
+    model = DirectionNet(input_dim=X.shape[1])
+    epochs = fit_model(tag, model, X_fit, y[fold.train_start : fit_end], X_val, y[split:usable_end])
+    train_s = time.perf_counter() - started
+
+    # ---- out-of-sample: classification ----
+    y_test = y[fold.test_start : fold.test_end]
+    metrics = validation_metrics(tag, model, X_test, y_test)
+    probs = predict_chunked(model, torch.tensor(X_test, dtype=torch.float32)).numpy().ravel()
+
+    # ---- out-of-sample: trading ----
+    test = entry.to_frame().iloc[fold.test_start : fold.test_end].reset_index(drop=True)
+    signal = (
+        (probs >= long_threshold + VectorBacktestEngine.THRESHOLD_OFFSET)
+        & (test["atr_pct"].to_numpy() > atr_floor)
+        & (test["adx"].to_numpy() >= adx_floor)
+    )
+    trades = simulate_long_trades(test, signal, exit_rules)
+    net = trades["ret"].to_numpy() - 2 * fee_pct
+
+    equity = np.cumprod(1 + net)
+    peak = np.maximum.accumulate(np.concatenate([[1.0], equity]))[1:]
+
+    return {
+        "fold": fold.index,
+        "train_from": int(entry.frame[fold.train_start, 0]),
+        "test_from": int(test["time"].iloc[0]),
+        "test_to": int(test["time"].iloc[-1]),
+        "epochs": epochs,
+        **{k.replace("val_", "test_"): v for k, v in metrics.items()},
+        "trades": int(len(trades)),
+        "win_rate": float((net > 0).mean()) if len(net) else 0.0,
+        "expectancy": float(net.mean()) if len(net) else 0.0,
+        "return": float(equity[-1] - 1) if len(net) else 0.0,
+        "max_dd": float(((peak - equity) / peak).max()) if len(net) else 0.0,
+        "train_s": train_s,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+# ----------------------------------
+def walk_forward(
+    symbol: str,
+    df: pd.DataFrame,
+    timeframe: str = "15m",
+    train_size: int = 8_000,
+    test_size: int = 3_000,
+    purge_bars: int = PURGE_BARS,
+    long_threshold: float | None = None,
+    atr_floor: float | None = None,
+    adx_floor: float | None = None,
+    fee_pct: float = 0.0004,
+    exit_rules: ExitRules | None = None,
+    workers: int | None = None,
+    store_root: str = DEFAULT_STORE_DIR,
+) -> pd.DataFrame:
+    """
+    Walk-forward evaluation with a fresh model per fold.
+
+    Features and labels come from the feature store (built once here).
+    Every fold then trains on its own window, ending `purge_bars`
+    (at least the label horizon) before the test window, and scores
+    the test window in one batched pass. Signals use the same gates
+    as VectorBacktestEngine (thresholds left as None are read from
+    the symbol's metadata, see signal_gates), and exits use
+    `exit_rules`. Folds run in
+    parallel, one single-threaded torch process each. Returns one row
+    per fold.
+    """
+    purge_bars = max(purge_bars, HORIZON)
+    exit_rules = exit_rules or ExitRules()
+
+    saved = signal_gates(symbol)
+    long_threshold = saved[0] if long_threshold is None else long_threshold
+    atr_floor = saved[1] if atr_floor is None else atr_floor
+    adx_floor = saved[2] if adx_floor is None else adx_floor
+
+    entry = FeatureStore(store_root).get(df, symbol, timeframe, FEATURE_COLUMNS, HORIZON, ATR_MULTIPLIER)
+    folds = make_folds(entry.labeled, train_size, test_size)
+    if not folds:
+        raise ValueError(f"{entry.labeled} labeled rows: too few for one fold")
+
+    workers = workers or min(len(folds), os.cpu_count() or 1)
+    print(f"[WALKFORWARD] {symbol}: {len(folds)} folds on {workers} worker(s)")
+
+    rows = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=limit_torch_threads,
+        initargs=(1,),
+    ) as pool:
+        futures = {
+            pool.submit(
+                run_fold,
+                store_root, symbol, timeframe, entry.key, fold, purge_bars,
+                long_threshold, atr_floor, adx_floor, fee_pct, exit_rules,
+            ): fold
+            for fold in folds
+        }
+
+        for future in as_completed(futures):
+            fold = futures[future]
+            try:
+                rows.append(future.result())
+            except Exception as e:
+                print(f"❌ Fold {fold.index}: {e}")
+                rows.append({"fold": fold.index, "error": str(e)})
+
+    return pd.DataFrame(rows).sort_values("fold").reset_index(drop=True)
@@ -33,6 +33,7 @@ class LiveSettings:
 
     max_active_positions: int = 2
     sleep_seconds: int = 900
+    bar_settle_seconds: float = 3.0
 
     require_model_quality: bool = True
     min_model_val_f1: float = 0.10
@@ -41,6 +42,9 @@ class LiveSettings:
 
     lookback: int = 300
 
+    model_cache_size: int = 32
+    feature_cache_mb: float = 128.0
+
     @classmethod
     def from_env(cls) -> "LiveSettings":
         raw_symbols = os.getenv("TRADING_SYMBOLS", "BTC/USDT")
@@ -55,11 +59,14 @@ class LiveSettings:
             risk_per_trade=_env_float("RISK_PER_TRADE", 0.01),
             max_active_positions=_env_int("MAX_ACTIVE_POSITIONS", 2),
             sleep_seconds=_env_int("LOOP_SLEEP_SECONDS", 900),
+            bar_settle_seconds=_env_float("BAR_SETTLE_SECONDS", 3.0),
             require_model_quality=_env_bool("REQUIRE_MODEL_QUALITY", True),
             min_model_val_f1=_env_float("MIN_MODEL_VAL_F1", 0.10),
             min_model_val_precision=_env_float("MIN_MODEL_VAL_PRECISION", 0.10),
             min_model_val_recall=_env_float("MIN_MODEL_VAL_RECALL", 0.10),
             lookback=_env_int("LOOKBACK_BARS", 300),
+            model_cache_size=_env_int("MODEL_CACHE_SIZE", 32),
+            feature_cache_mb=_env_float("FEATURE_CACHE_MB", 128.0),
         )
 
     def validate(self) -> None:
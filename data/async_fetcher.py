@@ -0,0 +1,221 @@
+# data/async_fetcher.py
+
+import asyncio
+import threading
+
+import ccxt.async_support as ccxt_async
+import pandas as pd
+from ccxt.base.errors import RequestTimeout, NetworkError
+
+from data.candle_store import CandleStore, DEFAULT_STORE_DIR, OHLCV_COLUMNS
+from data.rate_limiter import AsyncRateLimiter
+
+
+class AsyncMarketDataFetcher:
+    """
+    Concurrent multi-symbol OHLCV fetcher.
+
+    All requests go through one ccxt async exchange running on a
+    background event loop, behind a shared rate limiter, so sync
+    callers can fetch a whole universe in one round trip.
+    Shares the candle store with MarketDataFetcher.
+    """
+
+    _loop = None  # 🔑 singleton loop + exchange
+    _exchange = None
+    _limiter = None
+
+    PAGE_LIMIT = 1000
+
+    def __init__(
+        self,
+        exchange_name: str = "binance",
+        store_dir: str | None = DEFAULT_STORE_DIR,
+        max_concurrency: int = 20,
+    ):
+        if AsyncMarketDataFetcher._loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, daemon=True).start()
+
+            AsyncMarketDataFetcher._loop = loop
+            AsyncMarketDataFetcher._exchange = self._run(self._init_exchange(exchange_name))
+            AsyncMarketDataFetcher._limiter = AsyncRateLimiter(
+                AsyncMarketDataFetcher._exchange.rateLimit
+            )
+
+        self.exchange = AsyncMarketDataFetcher._exchange
+        self.limiter = AsyncMarketDataFetcher._limiter
+        self.store = CandleStore(store_dir) if store_dir else None
+        self.max_concurrency = max_concurrency
+
+    async def _init_exchange(self, exchange_name: str):
+        if exchange_name != "binance":
+            raise ValueError(f"Unsupported exchange: {exchange_name}")
+
+        exchange = ccxt_async.binance({
+            "enableRateLimit": False,  # AsyncRateLimiter spaces requests
+            "timeout": 20000,  # 20s
+        })
+
+        # Load markets ONCE
+        await exchange.load_markets()
+        return exchange
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, AsyncMarketDataFetcher._loop).result()
+
+    # ----------------------------------
+    def fetch_many(
+        self,
+        symbols: list[str],
+        timeframe: str,
+        limit: int = 500,
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Blocking wrapper: latest `limit` bars for every symbol.
+        Symbols that fail are left out of the result.
+        """
+        return self._run(self.fetch_many_async(symbols, timeframe, limit))
+
+    async def fetch_many_async(
+        self,
+        symbols: list[str],
+        timeframe: str,
+        limit: int = 500,
+    ) -> dict[str, pd.DataFrame]:
+        gate = asyncio.Semaphore(self.max_concurrency)
+
+        async def guarded(symbol: str) -> pd.DataFrame:
+            async with gate:
+                return await self.fetch_ohlcv(symbol, timeframe, limit)
+
+        results = await asyncio.gather(
+            *(guarded(s) for s in symbols),
+            return_exceptions=True,
+        )
+
+        frames = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                print(f"[{symbol}] async fetch failed: {result}")
+                continue
+            frames[symbol] = result
+
+        return frames
+
+    # ----------------------------------
+    async def fetch_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int = 500,
+        retries: int = 3,
+    ) -> pd.DataFrame:
+        """
+        Same contract as MarketDataFetcher.fetch_ohlcv. Candle store
+        reads and writes run in worker threads, never on the event
+        loop, so disk I/O does not stall the other fetches.
+        """
+        if self.store is None:
+            return await self._fetch_remote(symbol, timeframe, limit, retries)
+
+        tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        last = await asyncio.to_thread(self.store.last_time, symbol, timeframe)
+
+        if last is not None:
+            fresh = await self._fetch_since(symbol, timeframe, last + tf_ms, retries)
+            now = self.exchange.milliseconds()
+            df = await asyncio.to_thread(
+                self._merge, symbol, timeframe, limit, fresh, tf_ms, now
+            )
+            if df is not None:
+                return df
+
+        now = self.exchange.milliseconds()
+        since = now - now % tf_ms - (limit - 1) * tf_ms
+        fresh = await self._fetch_since(symbol, timeframe, since, retries)
+
+        df = await asyncio.to_thread(
+            self._merge, symbol, timeframe, limit, fresh, tf_ms, now, True
+        )
+        if df.empty:
+            raise RuntimeError("empty OHLCV")
+        return df
+
+    def _merge(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        fresh: pd.DataFrame,
+        tf_ms: int,
+        now_ms: int,
+        partial: bool = False,
+    ) -> pd.DataFrame | None:
+        # Blocking: absorb the closed bars, then read the window back
+        forming = self.store.absorb(symbol, timeframe, fresh, tf_ms, now_ms)
+        return self.store.window(symbol, timeframe, limit, forming, partial=partial)
+
+    async def _fetch_since(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        retries: int = 3,
+    ) -> pd.DataFrame:
+        frames = []
+
+        while True:
+            bars = await self._request(symbol, timeframe, since, self.PAGE_LIMIT, retries)
+            if not bars:
+                break
+
+            frames.append(pd.DataFrame(bars, columns=OHLCV_COLUMNS))
+            if len(bars) < self.PAGE_LIMIT:
+                break
+            since = bars[-1][0] + 1
+
+        if not frames:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        return pd.concat(frames, ignore_index=True)
+
+    async def _fetch_remote(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        retries: int = 3,
+    ) -> pd.DataFrame:
+        bars = await self._request(symbol, timeframe, None, limit, retries)
+
+        if not bars:
+            raise RuntimeError("empty OHLCV")
+
+        return pd.DataFrame(bars, columns=OHLCV_COLUMNS)
+
+    async def _request(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int | None,
+        limit: int,
+        retries: int = 3,
+    ) -> list[list]:
+
+        for attempt in range(1, retries + 1):
+            await self.limiter.acquire()
+            try:
+                return await self.exchange.fetch_ohlcv(
+                    symbol,
+                    timeframe,
+                    since=since,
+                    limit=limit,
+                )
+
+            except (RequestTimeout, NetworkError):
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(2 * attempt)
+
+        raise RuntimeError("fetch_ohlcv failed after retries")
@@ -0,0 +1,210 @@
+# data/candle_store.py
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+
+OHLCV_COLUMNS = ["time", "open", "high", "low", "close", "volume"]
+DEFAULT_STORE_DIR = "data_outputs/candles"
+
+_ROW_WIDTH = len(OHLCV_COLUMNS)
+_ROW_BYTES = _ROW_WIDTH * 8
+_WRITE_LOCK = threading.Lock()  # shared by every store instance in this process
+
+
+@contextmanager
+def file_lock(path: Path):
+    """
+    Exclusive lock on `path` across threads and processes (training /
+    optimization pools write the same files), held through a sidecar
+    `.lock` file so the data file itself can be replaced.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _WRITE_LOCK, open(path.with_name(path.name + ".lock"), "a") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class CandleStore:
+    """
+    On-disk candle store, one file per (symbol, timeframe).
+
+    Each file is a flat float64 array of
+    [time, open, high, low, close, volume] rows sorted by time.
+    New bars are appended in place, reads are memory-mapped.
+    Only CLOSED bars belong here.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    # ----------------------------------
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / symbol.replace("/", "_") / f"{timeframe}.bin"
+
+    # ----------------------------------
+    def load(self, symbol: str, timeframe: str) -> np.ndarray:
+        """
+        Memory-mapped (n, 6) view of the stored bars.
+        """
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return np.empty((0, _ROW_WIDTH))
+
+        # Ignore a torn trailing row left by an interrupted append
+        rows = path.stat().st_size // _ROW_BYTES
+        if rows == 0:
+            return np.empty((0, _ROW_WIDTH))
+
+        return np.memmap(path, dtype="<f8", mode="r", shape=(rows, _ROW_WIDTH))
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        path = self.path(symbol, timeframe)
+        return path.stat().st_size // _ROW_BYTES if path.exists() else 0
+
+    def first_time(self, symbol: str, timeframe: str) -> int | None:
+        bars = self.load(symbol, timeframe)
+        return int(bars[0, 0]) if len(bars) else None
+
+    def last_time(self, symbol: str, timeframe: str) -> int | None:
+        bars = self.load(symbol, timeframe)
+        return int(bars[-1, 0]) if len(bars) else None
+
+    # ----------------------------------
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int | None = None,
+        since: int | None = None,
+        until: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Bars with since <= time < until, newest `limit` of them.
+        """
+        bars = self.load(symbol, timeframe)
+        times = bars[:, 0]
+
+        start = int(np.searchsorted(times, since, side="left")) if since is not None else 0
+        end = int(np.searchsorted(times, until, side="left")) if until is not None else len(bars)
+
+        if limit is not None:
+            start = max(start, end - limit)
+
+        return to_frame(bars[start:end])
+
+    # ----------------------------------
+    def write(self, symbol: str, timeframe: str, bars) -> int:
+        """
+        Merge bars into the store. Returns the number of new rows.
+        Bars newer than the last stored one are appended in place;
+        anything older forces a merge-and-rewrite.
+        """
+        new = to_array(bars)
+        if not len(new):
+            return 0
+
+        new = _dedupe(new)
+        path = self.path(symbol, timeframe)
+
+        with file_lock(path):
+            stored = self.load(symbol, timeframe)
+
+            if not len(stored) or new[0, 0] > stored[-1, 0]:
+                with path.open("ab") as f:
+                    f.truncate(len(stored) * _ROW_BYTES)
+                    f.write(new.astype("<f8").tobytes())
+                return len(new)
+
+            merged = _dedupe(np.concatenate([np.asarray(stored), new]))
+            added = len(merged) - len(stored)
+            if added == 0:
+                return 0
+
+            tmp = path.with_suffix(".tmp")
+            merged.astype("<f8").tofile(tmp)
+            del stored
+            os.replace(tmp, path)
+            return added
+
+    # ----------------------------------
+    def absorb(
+        self,
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        tf_ms: int,
+        now_ms: int,
+    ) -> pd.DataFrame:
+        """
+        Store the closed bars of a fresh fetch, return the
+        still-forming remainder.
+        """
+        if df.empty:
+            return df
+
+        closed = df["time"] + tf_ms <= now_ms
+        self.write(symbol, timeframe, df[closed])
+        return df[~closed].reset_index(drop=True)
+
+    def window(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        forming: pd.DataFrame | None = None,
+        partial: bool = False,
+    ) -> pd.DataFrame | None:
+        """
+        Latest `limit` bars with the forming bar on top, or None when
+        the store is too short to serve them (unless `partial`, then
+        whatever it has).
+        """
+        forming_rows = len(forming) if forming is not None else 0
+        needed = max(0, limit - forming_rows)
+
+        if not partial and self.count(symbol, timeframe) < needed:
+            return None
+
+        stored = self.read(symbol, timeframe, limit=needed)
+        if not forming_rows:
+            return stored
+
+        return pd.concat([stored, forming], ignore_index=True)
+
+
+# ----------------------------------
+def to_array(bars) -> np.ndarray:
+    if isinstance(bars, pd.DataFrame):
+        bars = bars[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+    return np.asarray(bars, dtype=np.float64).reshape(-1, _ROW_WIDTH)
+
+
+def to_frame(bars: np.ndarray) -> pd.DataFrame:
+    df = pd.DataFrame(np.array(bars, dtype=np.float64), columns=OHLCV_COLUMNS)
+    df["time"] = df["time"].astype(np.int64)
+    return df
+
+
+def _dedupe(bars: np.ndarray) -> np.ndarray:
+    # Sorted by time; on duplicates the later row wins
+    order = np.argsort(bars[:, 0], kind="stable")
+    bars = bars[order]
+    keep = np.ones(len(bars), dtype=bool)
+    keep[:-1] = bars[1:, 0] != bars[:-1, 0]
+    return bars[keep]
@@ -6,19 +6,33 @@ import ccxt
 import pandas as pd
 from ccxt.base.errors import RequestTimeout, NetworkError
 
+from data.candle_store import CandleStore, DEFAULT_STORE_DIR, OHLCV_COLUMNS
+from data.rate_limiter import RateLimiter
+
 
 class MarketDataFetcher:
     """
     Shared market data fetcher with retry & timeout safety.
+
+    When a candle store is configured, closed bars are persisted
+    locally and only bars newer than the last stored one are
+    requested from the exchange.
     """
 
     _exchange = None  # 🔑 singleton
 
-    def __init__(self, exchange_name: str = "binance"):
+    PAGE_LIMIT = 1000  # binance klines cap per request
+
+    def __init__(
+        self,
+        exchange_name: str = "binance",
+        store_dir: str | None = DEFAULT_STORE_DIR,
+    ):
         if MarketDataFetcher._exchange is None:
             MarketDataFetcher._exchange = self._init_exchange(exchange_name)
 
         self.exchange = MarketDataFetcher._exchange
+        self.store = CandleStore(store_dir) if store_dir else None
 
     def _init_exchange(self, exchange_name: str):
         if exchange_name != "binance":
@@ -33,6 +47,7 @@ class MarketDataFetcher:
         exchange.load_markets()
         return exchange
 
+    # ----------------------------------
     def fetch_ohlcv(
         self,
         symbol: str,
@@ -40,23 +55,119 @@ class MarketDataFetcher:
         limit: int = 500,
         retries: int = 3,
     ) -> pd.DataFrame:
+        """
+        Latest `limit` bars, the still-forming one included.
+        """
+        if self.store is None:
+            return self._fetch_remote(symbol, timeframe, limit=limit, retries=retries)
+
+        tf_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        last = self.store.last_time(symbol, timeframe)
+
+        if last is not None:
+            fresh = self._fetch_since(symbol, timeframe, last + tf_ms, retries=retries)
+            forming = self.store.absorb(
+                symbol, timeframe, fresh, tf_ms, self.exchange.milliseconds()
+            )
+
+            df = self.store.window(symbol, timeframe, limit, forming)
+            if df is not None:
+                return df
+
+        # Store too short: page the whole window in (PAGE_LIMIT bars per
+        # request), so lookbacks past the exchange cap are cached too
+        now = self.exchange.milliseconds()
+        since = now - now % tf_ms - (limit - 1) * tf_ms
+        fresh = self._fetch_since(symbol, timeframe, since, retries=retries)
+        forming = self.store.absorb(symbol, timeframe, fresh, tf_ms, now)
+
+        # Clamped to what the exchange has, e.g. a recent listing
+        df = self.store.window(symbol, timeframe, limit, forming, partial=True)
+        if df.empty:
+            raise RuntimeError("empty OHLCV")
+        return df
+
+    # ----------------------------------
+    def _fetch_since(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        retries: int = 3,
+    ) -> pd.DataFrame:
+        frames = []
+
+        while True:
+            bars = self._request(
+                symbol, timeframe, since=since, limit=self.PAGE_LIMIT, retries=retries
+            )
+            if not bars:
+                break
+
+            frames.append(pd.DataFrame(bars, columns=OHLCV_COLUMNS))
+            if len(bars) < self.PAGE_LIMIT:
+                break
+            since = bars[-1][0] + 1
+
+        if not frames:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        return pd.concat(frames, ignore_index=True)
+
+    # ----------------------------------
+    def _fetch_remote(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: int,
+        retries: int = 3,
+    ) -> pd.DataFrame:
+        bars = self._request(symbol, timeframe, limit=limit, retries=retries)
+
+        if not bars:
+            raise RuntimeError("empty OHLCV")
+
+        return pd.DataFrame(bars, columns=OHLCV_COLUMNS)
+
+    def fetch_page(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        limit: int | None = None,
+        retries: int = 3,
+        limiter: RateLimiter | None = None,
+    ) -> list[list]:
+        """
+        One raw page of bars starting at `since`. With a shared
+        `limiter`, every attempt (retries included) takes a slot.
+        """
+        return self._request(
+            symbol, timeframe, since=since, limit=limit or self.PAGE_LIMIT,
+            retries=retries, limiter=limiter,
+        )
+
+    def _request(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int | None = None,
+        limit: int = 500,
+        retries: int = 3,
+        limiter: RateLimiter | None = None,
+    ) -> list[list]:
 
         for attempt in range(1, retries + 1):
+            if limiter is not None:
+                limiter.acquire()
             try:
-                bars = self.exchange.fetch_ohlcv(
+                return self.exchange.fetch_ohlcv(
                     symbol,
                     timeframe,
+                    since=since,
                     limit=limit,
                 )
 
-                if not bars:
-                    raise RuntimeError("empty OHLCV")
-
-                return pd.DataFrame(
-                    bars,
-                    columns=["time", "open", "high", "low", "close", "volume"],
-                )
-
             except (RequestTimeout, NetworkError) as e:
                 if attempt == retries:
                     raise
@@ -0,0 +1,175 @@
+# data/history.py
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from data.candle_store import OHLCV_COLUMNS, file_lock, to_array, to_frame
+from data.fetcher import MarketDataFetcher
+from data.rate_limiter import RateLimiter
+
+
+def fetch_history(
+    symbol: str,
+    timeframe: str,
+    candles: int | None = None,
+    since: int | None = None,
+    until: int | None = None,
+    fetcher: MarketDataFetcher | None = None,
+    workers: int = 4,
+) -> pd.DataFrame:
+    """
+    Bulk closed-bar history for [since, until).
+
+    The range is split into exchange-sized pages on a fixed grid,
+    pages are fetched concurrently under a shared rate limit and
+    each finished page is checkpointed into the candle store, so an
+    interrupted download resumes where it stopped. If pages fail,
+    every other page is still checkpointed, then RuntimeError is
+    raised.
+
+    Either `candles` (counted back from the last closed bar) or
+    `since` must be given.
+    """
+    fetcher = fetcher or MarketDataFetcher()
+    exchange = fetcher.exchange
+
+    tf_ms = exchange.parse_timeframe(timeframe) * 1000
+    page_ms = fetcher.PAGE_LIMIT * tf_ms
+
+    now = exchange.milliseconds()
+    last_closed_end = now - now % tf_ms
+    until = min(until, last_closed_end) if until is not None else last_closed_end
+
+    if since is None:
+        if candles is None:
+            raise ValueError("fetch_history needs `candles` or `since`")
+        since = until - candles * tf_ms
+
+    ledger = _PageLedger(fetcher, symbol, timeframe)
+    pages = [
+        start
+        for start in range(since - since % page_ms, until, page_ms)
+        if not ledger.done(start)
+    ]
+
+    limiter = RateLimiter(getattr(exchange, "rateLimit", 50))
+    collected: list[np.ndarray] = []
+
+    # Pages finish out of order; they are written oldest first, as soon
+    # as every earlier page is in, so the store only ever appends
+    lock = threading.Lock()
+    finished: dict[int, np.ndarray] = {}
+    next_page = 0
+
+    def checkpoint(start: int, page: np.ndarray) -> None:
+        if fetcher.store is not None:
+            fetcher.store.write(symbol, timeframe, page)
+        else:
+            collected.append(page)
+
+        if start + page_ms <= last_closed_end:
+            ledger.mark(start)
+
+    def flush() -> None:
+        nonlocal next_page
+        while next_page < len(pages) and pages[next_page] in finished:
+            start = pages[next_page]
+            checkpoint(start, finished.pop(start))
+            next_page += 1
+
+    def fetch_page(start: int) -> None:
+        bars = fetcher.fetch_page(symbol, timeframe, since=start, limiter=limiter)
+
+        page = to_array(bars or [])
+        page = page[(page[:, 0] >= start) & (page[:, 0] + tf_ms <= last_closed_end)]
+
+        with lock:
+            finished[start] = page
+            flush()
+
+    failed: dict[int, Exception] = {}
+    if pages:
+        print(f"[HISTORY] {symbol} {timeframe}: fetching {len(pages)} page(s)")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(fetch_page, start): start for start in pages}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failed[futures[future]] = e
+
+    if failed:
+        # Pages queued behind a failed one are kept too, so a resume
+        # only refetches what actually failed
+        for start in sorted(finished):
+            checkpoint(start, finished.pop(start))
+
+        first = min(failed)
+        print(
+            f"❌ [HISTORY] {symbol} {timeframe}: {len(failed)} page(s) failed, "
+            f"first at {first}: {failed[first]}"
+        )
+        raise RuntimeError(
+            f"{symbol} {timeframe}: {len(failed)} history page(s) failed"
+        ) from failed[first]
+
+    if fetcher.store is not None:
+        df = fetcher.store.read(symbol, timeframe, since=since, until=until)
+    elif collected:
+        df = to_frame(np.concatenate(collected))
+        df = df[(df["time"] >= since) & (df["time"] < until)]
+        df = df.drop_duplicates("time", keep="last").sort_values("time", ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    gaps = int((df["time"].diff().dropna() != tf_ms).sum()) if len(df) > 1 else 0
+    if gaps:
+        print(f"⚠️ [HISTORY] {symbol} {timeframe}: {gaps} gap(s) in exchange data")
+
+    return df
+
+
+class _PageLedger:
+    """
+    Grid-aligned pages already fetched and fully closed.
+    Lives next to the candle store file; in-memory without a store.
+    Marks merge with whatever other processes recorded meanwhile.
+    """
+
+    def __init__(self, fetcher: MarketDataFetcher, symbol: str, timeframe: str):
+        self._lock = threading.Lock()
+        self.path = None
+        self.pages: set[int] = set()
+
+        if fetcher.store is None:
+            return
+
+        self.path = fetcher.store.path(symbol, timeframe).with_suffix(".pages.json")
+        # A ledger without its candle file is stale
+        if fetcher.store.count(symbol, timeframe):
+            self.pages = self._read()
+
+    def done(self, start: int) -> bool:
+        return start in self.pages
+
+    def mark(self, start: int) -> None:
+        with self._lock:
+            self.pages.add(start)
+            if self.path is None:
+                return
+
+            with file_lock(self.path):
+                self.pages |= self._read()
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(sorted(self.pages)), encoding="utf-8")
+                os.replace(tmp, self.path)
+
+    def _read(self) -> set[int]:
+        if not self.path.exists():
+            return set()
+        return set(json.loads(self.path.read_text(encoding="utf-8")))
@@ -0,0 +1,48 @@
+# data/rate_limiter.py
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe request spacer.
+    Guarantees at least `interval_ms` between request starts
+    across every thread sharing the instance.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class AsyncRateLimiter:
+    """
+    asyncio counterpart of RateLimiter for coroutines
+    sharing one event loop.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
@@ -0,0 +1,172 @@
+# execution/btc_context.py
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from data.fetcher import MarketDataFetcher
+from data.history import fetch_history
+from execution.scheduler import closed_bars, timeframe_ms
+from features.cache import FeatureCache
+from features.streaming import StreamingFeatures
+from models.registry import ModelRegistry
+
+
+BTC_SYMBOL = "BTC/USDT"
+
+
+@dataclass(frozen=True, slots=True)
+class BTCContext:
+    """
+    BTC snapshot for one closed bar, shared by every runner.
+    """
+
+    time: int
+    prob_up: float
+    features: dict
+
+
+class BTCContextService:
+    """
+    Fetches and featurizes BTC/USDT once per closed bar and scores it
+    with the BTC DirectionModel once, instead of once per alt runner.
+    """
+
+    def __init__(
+        self,
+        timeframe: str,
+        lookback: int = 300,
+        fetcher: MarketDataFetcher | None = None,
+        model=None,
+    ):
+        self.timeframe = timeframe
+        self.tf_ms = timeframe_ms(timeframe)
+        self.lookback = lookback
+
+        self._fetcher = fetcher  # created on first fetch; replays never need one
+        self.model = model or ModelRegistry.shared().get(BTC_SYMBOL)
+        self.features = StreamingFeatures()
+
+        self.latest: BTCContext | None = None
+        self.refreshes = 0
+
+    @property
+    def fetcher(self) -> MarketDataFetcher:
+        if self._fetcher is None:
+            self._fetcher = MarketDataFetcher()
+        return self._fetcher
+
+    # ----------------------------------
+    def refresh(
+        self,
+        df: pd.DataFrame | None = None,
+        now_ms: int | None = None,
+    ) -> BTCContext | None:
+        """
+        Bring the snapshot up to the last closed BTC bar. `df` lets the
+        caller hand over a window it already fetched. The model only
+        runs when a new bar has closed.
+        """
+        if df is None:
+            df = self.fetcher.fetch_ohlcv(BTC_SYMBOL, self.timeframe, self.lookback)
+        if now_ms is None:
+            now_ms = self.fetcher.exchange.milliseconds()
+
+        row = self.features.sync(closed_bars(df, self.timeframe, now_ms), forming=0)
+        if row is None:
+            return self.latest
+
+        if self.latest is not None and self.latest.time == int(row["time"]):
+            return self.latest
+
+        prob = float(self.model.predict_proba(pd.DataFrame([row])))
+        self.latest = BTCContext(time=int(row["time"]), prob_up=prob, features=row)
+        self.refreshes += 1
+        return self.latest
+
+    def prob_at(self, time: int) -> float:
+        """
+        Snapshot probability for a decision on the bar opening at
+        `time`. NEUTRAL unless the snapshot is the BTC bar covering that
+        time: a failed or late BTC fetch must not leave alts trading on
+        an older bar.
+        """
+        context = self.latest
+        if context is None or not context.time <= time < context.time + self.tf_ms:
+            return BTCContextModel.NEUTRAL
+        return context.prob_up
+
+    # ----------------------------------
+    def history_probs(self, df: pd.DataFrame) -> pd.Series:
+        """
+        BTC model probability per bar time of a closed BTC history,
+        in one batched pass.
+        """
+        featured = FeatureCache.shared().features(df, BTC_SYMBOL, self.timeframe)
+        probs = self.model.predict_proba_series(featured)
+        return pd.Series(probs, index=featured["time"].to_numpy())
+
+    def probs_at(self, times, df: pd.DataFrame | None = None) -> np.ndarray:
+        """
+        BTC probability as it was published at each bar time. `df` is
+        the BTC history to score; without it the history covering
+        `times` (plus warm-up) is loaded from the candle store.
+        """
+        times = np.asarray(times, dtype=np.int64)
+        if len(times) == 0:
+            return np.empty(0)
+
+        if df is None:
+            df = fetch_history(
+                BTC_SYMBOL,
+                self.timeframe,
+                since=int(times.min()) - self.lookback * self.tf_ms,
+                until=int(times.max()) + self.tf_ms,
+                fetcher=self.fetcher,
+            )
+
+        return align_probs(self.history_probs(df), times)
+
+
+def align_probs(probs: pd.Series, times) -> np.ndarray:
+    """
+    For each bar time, the probability of the latest BTC bar that
+    closed at or before it; neutral before the first one.
+    """
+    return (
+        probs.sort_index()
+        .reindex(np.asarray(times, dtype=np.int64), method="ffill")
+        .fillna(BTCContextModel.NEUTRAL)
+        .to_numpy()
+    )
+
+
+class BTCContextModel:
+    """
+    Ensemble member that reads the shared BTC probability instead of
+    running the BTC model on the symbol's own frame.
+    """
+
+    NEUTRAL = 0.5
+
+    def __init__(self, service: BTCContextService):
+        self.service = service
+
+    def predict_proba(self, df) -> float:
+        """
+        Shared snapshot for the decision bar (last row of `df`), or
+        NEUTRAL when the snapshot is not that bar's.
+        """
+        if "time" not in df.columns or len(df) == 0:
+            return self.NEUTRAL
+        return self.service.prob_at(int(df["time"].iloc[-1]))
+
+    def predict_proba_series(self, data) -> np.ndarray:
+        """
+        Per-bar BTC probabilities for a featured frame, looked up by
+        bar time, so history never sees the latest snapshot.
+        """
+        if not isinstance(data, pd.DataFrame) or "time" not in data.columns:
+            raise ValueError("BTCContextModel needs a frame with bar times for history")
+        return self.service.probs_at(data["time"].to_numpy())
@@ -1,8 +1,10 @@
 
 # execution/coin_selector.py
 
-import ta
-from data.fetcher import MarketDataFetcher
+import pandas as pd
+
+from data.async_fetcher import AsyncMarketDataFetcher
+from features.cache import FeatureCache
 
 
 class CoinSelector:
@@ -23,27 +25,24 @@ class CoinSelector:
         self.top_k = top_k
         self.min_atr_pct = min_atr_pct
         self.min_volume_ratio = min_volume_ratio
-        self.fetcher = MarketDataFetcher()
+        self.fetcher = AsyncMarketDataFetcher()
 
-    def _score_symbol(self, symbol: str) -> float | None:
+    def _score_symbol(self, symbol: str, df: pd.DataFrame | None) -> float | None:
         try:
-            df = self.fetcher.fetch_ohlcv(symbol, self.timeframe, limit=self.lookback)
             if df is None or len(df) < 100:
                 return None
 
-            atr = ta.volatility.AverageTrueRange(
-                df["high"], df["low"], df["close"], window=14
-            ).average_true_range()
-
-            adx = ta.trend.ADXIndicator(
-                df["high"], df["low"], df["close"], window=14
-            ).adx()
+            # ATR / ADX come from the shared core feature set
+            featured = FeatureCache.shared().features(df, symbol, self.timeframe)
+            if featured.empty or featured["time"].iloc[-1] != df["time"].iloc[-1]:
+                return None
+            last = featured.iloc[-1]
 
             vol_ma = df["volume"].rolling(20).mean()
 
-            atr_pct = atr.iloc[-1] / df["close"].iloc[-1]
+            atr_pct = last["atr_pct"]
             volume_ratio = df["volume"].iloc[-1] / vol_ma.iloc[-1]
-            trend_strength = min(adx.iloc[-1], 40.0)
+            trend_strength = min(last["adx"], 40.0)
 
             if atr_pct < self.min_atr_pct or volume_ratio < self.min_volume_ratio:
                 return None
@@ -54,10 +53,12 @@ class CoinSelector:
             return None
 
     def select(self, symbols: list[str]) -> list[str]:
+        frames = self.fetcher.fetch_many(symbols, self.timeframe, limit=self.lookback)
+
         scores = {
             symbol: score
             for symbol in symbols
-            if (score := self._score_symbol(symbol)) is not None
+            if (score := self._score_symbol(symbol, frames.get(symbol))) is not None
         }
 
         ranked = sorted(scores, key=scores.get, reverse=True)
@@ -1,12 +1,16 @@
 # execution/multi_runner.py
 
 import time
-import json
-from pathlib import Path
 
-from execution.runner import TradingRunner
+from data.async_fetcher import AsyncMarketDataFetcher
+from data.fetcher import MarketDataFetcher
+from execution.btc_context import BTC_SYMBOL, BTCContextService
+from execution.runner import CYCLE_NOT_READY, TradingRunner
+from execution.scheduler import BarCloseScheduler
+from features.cache import FeatureCache
 from execution.universe_manager import UniverseManager
 from config.live import LiveSettings
+from models.registry import ModelRegistry
 
 
 class MultiSymbolTradingSystem:
@@ -17,6 +21,15 @@ class MultiSymbolTradingSystem:
     def __init__(self, settings: LiveSettings):
         self.settings = settings
         self.runners: dict[str, TradingRunner] = {}
+        self.fetcher = AsyncMarketDataFetcher()
+        self.models = ModelRegistry.shared(max_models=settings.model_cache_size)
+        self.feature_cache = FeatureCache.shared(memory_budget_mb=settings.feature_cache_mb)
+        self.btc_context: BTCContextService | None = None
+
+        self.scheduler = BarCloseScheduler(
+            MarketDataFetcher().exchange,
+            settle_seconds=settings.bar_settle_seconds,
+        )
 
         self.universe = UniverseManager(
             all_symbols=settings.symbols,
@@ -26,14 +39,8 @@ class MultiSymbolTradingSystem:
 
     # ----------------------------------
     def _model_quality_ok(self, symbol: str) -> bool:
-        metadata_path = Path("models") / symbol.replace("/", "_") / "metadata.json"
-        if not metadata_path.exists():
-            return False
-
-        try:
-            data = json.loads(metadata_path.read_text(encoding="utf-8"))
-            metrics = data.get("metrics", {})
-        except Exception:
+        metrics = self.models.quality_metrics(symbol)
+        if metrics is None:
             return False
 
         return (
@@ -42,6 +49,17 @@ class MultiSymbolTradingSystem:
             and float(metrics.get("val_recall", 0.0)) >= self.settings.min_model_val_recall
         )
 
+    # ----------------------------------
+    def _ensure_btc_context(self) -> BTCContextService | None:
+        if self.btc_context is None:
+            try:
+                self.btc_context = BTCContextService(
+                    self.settings.timeframe, self.settings.lookback
+                )
+            except Exception as e:
+                print(f"⚠️ BTC context unavailable: {e}")
+        return self.btc_context
+
     # ----------------------------------
     def _ensure_runner(self, symbol: str):
         if symbol in self.runners:
@@ -59,11 +77,60 @@ class MultiSymbolTradingSystem:
             starting_balance_usdt=self.settings.starting_balance_usdt,
             cooldown_minutes=self.settings.cooldown_minutes,
             risk_per_trade=self.settings.risk_per_trade,
+            btc_context=self._ensure_btc_context() if symbol != BTC_SYMBOL else None,
         )
 
         self.runners[symbol] = runner
         print(f"➕ Runner added for {symbol}")
 
+    # ----------------------------------
+    def _dispatch(self, due: list[str], now_ms: int):
+        by_timeframe: dict[str, list[str]] = {}
+        for symbol in due:
+            by_timeframe.setdefault(self.runners[symbol].timeframe, []).append(symbol)
+
+        needs_btc = self.btc_context is not None and any(s != BTC_SYMBOL for s in due)
+        if needs_btc:
+            group = by_timeframe.setdefault(self.btc_context.timeframe, [])
+            if BTC_SYMBOL not in group:
+                group.append(BTC_SYMBOL)
+
+        frames: dict[tuple[str, str], object] = {}
+        for timeframe, symbols in by_timeframe.items():
+            fetched = self.fetcher.fetch_many(symbols, timeframe, limit=self.settings.lookback)
+            frames.update({(s, timeframe): df for s, df in fetched.items()})
+
+        # One BTC snapshot per cycle, shared by every alt runner; a
+        # snapshot older than an alt's bar reads as neutral
+        if needs_btc:
+            btc = frames.get((BTC_SYMBOL, self.btc_context.timeframe))
+            context = None if btc is None else self.btc_context.refresh(btc, now_ms)
+            tf_ms = self.btc_context.tf_ms
+            if context is None or context.time < (now_ms // tf_ms - 1) * tf_ms:
+                print("⚠️ BTC bar not available, alts use a neutral BTC context")
+
+        # Each runner on its own: a failure is retried later and never
+        # keeps the other due runners from their bar
+        for symbol in due:
+            df = frames.get((symbol, self.runners[symbol].timeframe))
+            if df is None:
+                print(f"⚠️ [{symbol}] no bars fetched, retrying")
+                self.scheduler.retry(symbol, now_ms)
+                continue
+
+            try:
+                outcome = self.runners[symbol].run_once(df=df, now_ms=now_ms)
+            except Exception as e:
+                print(f"❌ [{symbol}] cycle failed: {e}")
+                self.scheduler.retry(symbol, now_ms)
+                continue
+
+            if outcome == CYCLE_NOT_READY:
+                # Exchange is publishing late: re-arm instead of dropping the bar
+                self.scheduler.retry(symbol, now_ms)
+            else:
+                self.scheduler.done(symbol)
+
     # ----------------------------------
     def run_loop(self):
         print(f"🚀 Autonomous trading system started [MODE={self.settings.mode}]")
@@ -75,12 +142,20 @@ class MultiSymbolTradingSystem:
                 for symbol in active_symbols:
                     self._ensure_runner(symbol)
 
-                for symbol, runner in list(self.runners.items()):
-                    if symbol not in active_symbols:
-                        continue
-                    runner.run_once()
+                for symbol in self.scheduler.keys:
+                    if symbol not in active_symbols or symbol not in self.runners:
+                        self.scheduler.remove(symbol)
+                for symbol in active_symbols:
+                    if symbol in self.runners:
+                        self.scheduler.add(symbol, self.runners[symbol].timeframe)
+
+                # Only symbols whose bar just closed; sleep_seconds caps the
+                # wait so the universe is still refreshed on schedule
+                due = self.scheduler.wait(max_sleep=self.settings.sleep_seconds)
+                if not due:
+                    continue
 
-                time.sleep(self.settings.sleep_seconds)
+                self._dispatch(due, self.scheduler.now_ms())
 
             except KeyboardInterrupt:
                 print("Stopped by user")
@@ -2,6 +2,7 @@
 # execution/regime.py
 
 from enum import Enum
+import numpy as np
 import pandas as pd
 
 
@@ -28,3 +29,22 @@ def detect_regime(df: pd.DataFrame) -> MarketRegime:
         return MarketRegime.RANGING
 
     return MarketRegime.CHOPPY
+
+
+REGIME_ORDER = [MarketRegime.TRENDING, MarketRegime.RANGING, MarketRegime.CHOPPY]
+
+
+def detect_regime_series(df: pd.DataFrame) -> np.ndarray:
+    """
+    detect_regime for every row at once.
+    Returns indices into REGIME_ORDER.
+    """
+    adx = df["adx"].to_numpy()
+    price = df["close"].to_numpy()
+    ema200 = df["ema200"].to_numpy()
+
+    return np.select(
+        [(adx >= 25) & (price > ema200), adx < 15],
+        [0, 1],
+        default=2,
+    )
@@ -16,8 +16,11 @@ class RegimeController:
     """
 
     def detect(self, df: pd.DataFrame) -> MarketRegime:
-        adx = df.iloc[-1]["adx"]
-        atr_pct = df.iloc[-1]["atr_pct"]
+        return self.detect_row(df.iloc[-1])
+
+    def detect_row(self, row) -> MarketRegime:
+        adx = row["adx"]
+        atr_pct = row["atr_pct"]
 
         if adx >= 25 and atr_pct >= 0.002:
             return MarketRegime.TRENDING
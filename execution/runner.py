@@ -3,19 +3,29 @@
 import time
 from datetime import datetime, timedelta
 
+import pandas as pd
+
 from data.fetcher import MarketDataFetcher
-from models.direction import DirectionModel
+from models.registry import ModelRegistry
 from models.ensemble import EnsembleDirectionModel
+from execution.scheduler import BarCloseScheduler, closed_bars, timeframe_ms
+from execution.btc_context import BTC_SYMBOL, BTCContextModel, BTCContextService
 from execution.strategy import StrategyEngine
 from execution.shadow_broker import ShadowBroker
 from execution.regime_controller import RegimeController
 from execution.ai_supervisor import AISupervisor
 from execution.market_guard import MarketGuard
 from risk.limits import RiskLimits, RiskState
-from features.technicals import compute_core_features
+from features.streaming import StreamingFeatures
 from metrics.self_report import DailyAIReport
 
 
+# run_once outcomes
+CYCLE_PROCESSED = "processed"
+CYCLE_SKIPPED = "skipped"       # no new closed bar since the last cycle
+CYCLE_NOT_READY = "not_ready"   # bar closed, exchange has not published it yet
+
+
 class TradingRunner:
     def __init__(
         self,
@@ -26,23 +36,43 @@ class TradingRunner:
         starting_balance_usdt: float = 500.0,
         cooldown_minutes: int = 30,
         risk_per_trade: float = 0.01,
+        btc_context: BTCContextService | None = None,
+        fetcher: MarketDataFetcher | None = None,
+        verbose: bool = True,
     ):
         self.symbol = symbol
         self.timeframe = timeframe
         self.lookback = lookback
 
-        self.data = MarketDataFetcher()
+        self._data = fetcher  # created on first fetch; replays never need one
+        self.features = StreamingFeatures()
+
+        # New-bar detection: cycles without a fresh closed bar are skipped
+        self.last_bar_time: int | None = None
+        self.processed_cycles = 0
+        self.skipped_cycles = 0
+        self.not_ready_cycles = 0
 
-        base_model = DirectionModel.for_symbol(symbol)
+        # Shared read-only instance, loaded once per process
+        base_model = ModelRegistry.shared().get(symbol)
         models = [base_model]
-        if symbol != "BTC/USDT":
-            try:
-                models.append(DirectionModel.for_symbol("BTC/USDT"))
-            except Exception:
-                pass
+
+        # BTC market context: a caller-owned service is refreshed once per
+        # cycle for all runners; a standalone runner refreshes its own
+        self.btc_context = btc_context
+        self._owns_btc_context = False
+        if symbol != BTC_SYMBOL:
+            if self.btc_context is None:
+                try:
+                    self.btc_context = BTCContextService(timeframe, lookback, fetcher=self._data)
+                    self._owns_btc_context = True
+                except Exception:
+                    pass
+            if self.btc_context is not None:
+                models.append(BTCContextModel(self.btc_context))
 
         self.model = EnsembleDirectionModel(models)
-        self.strategy = StrategyEngine(self.model, risk_per_trade)
+        self.strategy = StrategyEngine(self.model, risk_per_trade, verbose=verbose)
 
         self.supervisor = AISupervisor()
         self.regime_ctrl = RegimeController()
@@ -67,12 +97,68 @@ class TradingRunner:
 
         print(f"[AUTONOMOUS AI] {symbol} ready")
 
+    @property
+    def data(self) -> MarketDataFetcher:
+        if self._data is None:
+            self._data = MarketDataFetcher()
+        return self._data
+
     # --------------------------------------------------
-    def run_once(self):
-        df = self.data.fetch_ohlcv(self.symbol, self.timeframe, self.lookback)
-        df = compute_core_features(df)
+    def run_once(self, df: pd.DataFrame | None = None, now_ms: int | None = None) -> str:
+        """
+        One decision cycle on the latest CLOSED bar. `df` lets a caller
+        hand over bars it already fetched (e.g. a concurrent multi-symbol
+        fetch), `now_ms` is the exchange clock used to drop the forming bar.
+
+        A cycle with no new closed bar since the previous one returns
+        CYCLE_SKIPPED before fetching, featurizing or running the model.
+        When the bar has closed but is missing from the fetched bars,
+        it returns CYCLE_NOT_READY and the caller should retry shortly.
+        """
+        if now_ms is None:
+            now_ms = self.data.exchange.milliseconds()
+
+        tf_ms = timeframe_ms(self.timeframe)
+        latest_closed = (now_ms // tf_ms - 1) * tf_ms
+        if self.last_bar_time is not None and latest_closed <= self.last_bar_time:
+            self.skipped_cycles += 1
+            return CYCLE_SKIPPED
+
+        if df is None:
+            df = self.data.fetch_ohlcv(self.symbol, self.timeframe, self.lookback)
+
+        closed = closed_bars(df, self.timeframe, now_ms)
+        if closed.empty or int(closed["time"].iloc[-1]) < latest_closed:
+            # Bar closed but the exchange has not published it yet
+            self.not_ready_cycles += 1
+            return CYCLE_NOT_READY
+
+        self.last_bar_time = int(closed["time"].iloc[-1])
+        self.processed_cycles += 1
+
+        if self._owns_btc_context:
+            self.btc_context.refresh(now_ms=now_ms)
+
+        row = self.features.sync(closed, forming=0)
+        if row is not None:
+            self.process_bar(row, now=datetime.utcnow())
+        return CYCLE_PROCESSED
 
-        today = datetime.utcnow().date()
+    # --------------------------------------------------
+    def process_bar(
+        self,
+        row: dict,
+        now: datetime,
+        prob_up: float | None = None,
+    ) -> dict | None:
+        """
+        Decision stack for one closed, featured bar at clock `now`.
+
+        `prob_up` lets a replay hand over a precomputed ensemble
+        probability; live it is computed on demand. Returns the trade
+        event ("entry" / "exit") if one happened.
+        """
+        today = now.date()
 
         self.risk_state.reset_if_new_day(today)
         self.supervisor.update_equity(self.risk_state.current_balance)
@@ -82,19 +168,20 @@ class TradingRunner:
             balance=self.risk_state.current_balance,
             today=today,
         ):
-            return
+            return None
 
-        regime = self.regime_ctrl.detect(df)
+        regime = self.regime_ctrl.detect_row(row)
         if not self.regime_ctrl.trading_allowed(regime):
-            return
+            return None
 
         decision = self.supervisor.decide()
         if not decision.trade_allowed:
-            return
+            return None
 
         # -------- EXIT --------
         if self.broker.position:
-            price = float(df.iloc[-1]["close"])
+            price = float(row["close"])
+            side = self.broker.position.side
             pnl = self.broker.close_position(price, self.symbol)
 
             self.market_guard.register_trade(pnl)
@@ -112,17 +199,20 @@ class TradingRunner:
             else:
                 self.daily["losses"] += 1
 
-            return
+            return {"event": "exit", "side": side, "price": price, "pnl": pnl}
 
         # -------- ENTRY --------
-        if self.last_trade_time and datetime.utcnow() - self.last_trade_time < self.cooldown:
-            return
+        if self.last_trade_time and now - self.last_trade_time < self.cooldown:
+            return None
+
+        if prob_up is None:
+            prob_up = self.model.predict_proba(pd.DataFrame([row]))
 
-        signal, _ = self.strategy.generate_signal(df)
+        signal, _ = self.strategy.signal_from_row(row, prob_up)
         if not signal:
-            return
+            return None
 
-        price = float(df.iloc[-1]["close"])
+        price = float(row["close"])
         risk_mult = decision.risk_multiplier * self.regime_ctrl.risk_multiplier(regime)
 
         qty = self.strategy.position_size(
@@ -132,20 +222,41 @@ class TradingRunner:
         )
 
         if qty <= 0:
-            return
+            return None
 
-        self.broker.open_position(signal, price, qty, self.symbol)
-        self.last_trade_time = datetime.utcnow()
+        self.broker.open_position(signal, price, qty, self.symbol, entry_time=now)
+        self.last_trade_time = now
+
+        return {"event": "entry", "side": signal, "price": price, "qty": qty, "prob_up": prob_up}
 
     # --------------------------------------------------
-    def run_loop(self, sleep_seconds: int = 900):
+    def run_loop(self, sleep_seconds: int = 900, settle_seconds: float = 3.0):
+        """
+        Runs one cycle right after every bar close; `sleep_seconds`
+        only caps how long a single wait may last.
+        """
         print(f"🚀 Autonomous AI Trader running [{self.symbol}]")
 
+        scheduler = BarCloseScheduler(self.data.exchange, settle_seconds=settle_seconds)
+        scheduler.add(self.symbol, self.timeframe)
+
         last_day = None
 
         while True:
             try:
-                self.run_once()
+                if not scheduler.wait(max_sleep=sleep_seconds):
+                    continue
+
+                try:
+                    outcome = self.run_once(now_ms=scheduler.now_ms())
+                except Exception:
+                    scheduler.retry(self.symbol)
+                    raise
+
+                if outcome == CYCLE_NOT_READY:
+                    scheduler.retry(self.symbol)
+                else:
+                    scheduler.done(self.symbol)
 
                 today = datetime.utcnow().date()
                 if last_day != today and self.daily["trades"] > 0:
@@ -173,8 +284,6 @@ class TradingRunner:
                     }
                     last_day = today
 
-                time.sleep(sleep_seconds)
-
             except KeyboardInterrupt:
                 print("Stopped by user")
                 break
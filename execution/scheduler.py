@@ -0,0 +1,192 @@
+# execution/scheduler.py
+
+import time
+
+import ccxt
+import pandas as pd
+
+
+def timeframe_ms(timeframe: str) -> int:
+    return int(ccxt.Exchange.parse_timeframe(timeframe) * 1000)
+
+
+def closed_bars(df: pd.DataFrame, timeframe: str, now_ms: int) -> pd.DataFrame:
+    """
+    Rows whose bar has fully closed at `now_ms` (exchange time).
+    """
+    return df[df["time"] + timeframe_ms(timeframe) <= now_ms]
+
+
+class BarCloseScheduler:
+    """
+    Wakes shortly after bar closes instead of sleeping a fixed period.
+
+    Keys (symbols) are registered with their own timeframe; each wake
+    returns only the keys whose bar actually closed since they were
+    last handled. A key counts as handled only once the caller reports
+    it with `done()`; a failed key is handed back to `retry()` and
+    becomes due again after a short backoff. Bar boundaries are
+    computed on the exchange clock (local clock + measured offset),
+    not the local one.
+    """
+
+    def __init__(
+        self,
+        exchange=None,
+        settle_seconds: float = 3.0,
+        resync_seconds: float = 1800.0,
+        retry_seconds: float = 5.0,
+        max_retries: int = 5,
+    ):
+        self.exchange = exchange
+        self.settle_ms = int(settle_seconds * 1000)
+        self.resync_seconds = resync_seconds
+        self.retry_ms = int(retry_seconds * 1000)
+        self.max_retries = max_retries
+
+        self.offset_ms = 0
+        self._last_sync = None
+
+        self._timeframes: dict[str, int] = {}
+        self._dispatched: dict[str, int] = {}  # key -> last handled bar open time
+        self._pending: dict[str, int] = {}     # key -> bar handed out by due()
+        self._retry_at: dict[str, int] = {}    # key -> not due again before (ms)
+        self._attempts: dict[str, int] = {}
+
+    # ----------------------------------
+    def add(self, key: str, timeframe: str) -> None:
+        tf_ms = timeframe_ms(timeframe)
+        if self._timeframes.get(key) != tf_ms:
+            self._timeframes[key] = tf_ms
+            self._forget(key)  # due right away
+
+    def remove(self, key: str) -> None:
+        self._timeframes.pop(key, None)
+        self._forget(key)
+
+    def _forget(self, key: str) -> None:
+        for state in (self._dispatched, self._pending, self._retry_at, self._attempts):
+            state.pop(key, None)
+
+    @property
+    def keys(self) -> list[str]:
+        return list(self._timeframes)
+
+    # ----------------------------------
+    def sync_clock(self) -> None:
+        """
+        Measure exchange time minus local time, halving the round trip.
+        """
+        if self.exchange is None:
+            return
+
+        try:
+            before = time.time() * 1000
+            server = self.exchange.fetch_time()
+            after = time.time() * 1000
+        except Exception as e:
+            print(f"⚠️ Clock sync failed, keeping offset {self.offset_ms} ms: {e}")
+            return
+
+        self.offset_ms = int(server - (before + after) / 2)
+        self._last_sync = time.monotonic()
+
+    def now_ms(self) -> int:
+        if self._last_sync is None or time.monotonic() - self._last_sync > self.resync_seconds:
+            self.sync_clock()
+            if self._last_sync is None:
+                self._last_sync = time.monotonic()  # unsynced: retry later
+        return int(time.time() * 1000) + self.offset_ms
+
+    # ----------------------------------
+    def last_close(self, key: str, now_ms: int) -> int:
+        """
+        Open time of the latest bar that has closed at `now_ms`.
+        """
+        tf_ms = self._timeframes[key]
+        return (now_ms // tf_ms) * tf_ms - tf_ms
+
+    def due(self, now_ms: int | None = None) -> list[str]:
+        """
+        Keys with a closed bar not yet handled and no retry backoff
+        pending. Nothing is marked: report each key with `done()` or
+        `retry()` once its cycle has run.
+        """
+        now_ms = self.now_ms() if now_ms is None else now_ms
+
+        ready = []
+        for key in self._timeframes:
+            closed = self.last_close(key, now_ms - self.settle_ms)
+            if self._dispatched.get(key) == closed:
+                continue
+            if self._pending.get(key) != closed:
+                # A newer bar closed: earlier retries no longer apply
+                self._retry_at.pop(key, None)
+                self._attempts.pop(key, None)
+            if now_ms < self._retry_at.get(key, 0):
+                continue
+
+            self._pending[key] = closed
+            ready.append(key)
+        return ready
+
+    def done(self, key: str) -> None:
+        """
+        The bar handed out for `key` has been handled.
+        """
+        closed = self._pending.pop(key, None)
+        if closed is not None and key in self._timeframes:
+            self._dispatched[key] = closed
+        self._retry_at.pop(key, None)
+        self._attempts.pop(key, None)
+
+    def retry(self, key: str, now_ms: int | None = None) -> bool:
+        """
+        The cycle for `key` failed or its bar was not published yet:
+        make it due again after a backoff (doubling per attempt).
+        After `max_retries` the bar is given up. Returns whether
+        it will be retried.
+        """
+        attempts = self._attempts.get(key, 0) + 1
+        if attempts > self.max_retries:
+            print(f"⚠️ {key}: giving up on bar after {self.max_retries} retries")
+            self.done(key)
+            return False
+
+        now_ms = self.now_ms() if now_ms is None else now_ms
+        self._attempts[key] = attempts
+        self._retry_at[key] = now_ms + self.retry_ms * 2 ** (attempts - 1)
+        return True
+
+    def next_wake_ms(self, now_ms: int) -> int | None:
+        if not self._timeframes:
+            return None
+
+        wakes = [
+            (now_ms - self.settle_ms) // tf_ms * tf_ms + tf_ms + self.settle_ms
+            for tf_ms in set(self._timeframes.values())
+        ]
+        wakes.extend(self._retry_at.values())
+        return min(wakes)
+
+    def wait(self, max_sleep: float | None = None) -> list[str]:
+        """
+        Sleep until the next bar close (+ settle delay) and return the
+        keys that became due. `max_sleep` caps the nap, so a caller can
+        do housekeeping in between; an early wake may return [].
+        """
+        ready = self.due()
+        if ready:
+            return ready
+
+        now_ms = self.now_ms()
+        wake = self.next_wake_ms(now_ms)
+        if wake is None:
+            delay = 1.0 if max_sleep is None else max_sleep
+        else:
+            delay = max(0.0, (wake - now_ms) / 1000)
+            if max_sleep is not None:
+                delay = min(delay, max_sleep)
+
+        time.sleep(delay)
+        return self.due()
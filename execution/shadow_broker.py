@@ -14,12 +14,19 @@ class ShadowBroker:
     def __init__(self):
         self.position: Optional[Position] = None
 
-    def open_position(self, side: str, price: float, qty: float, symbol: str):
+    def open_position(
+        self,
+        side: str,
+        price: float,
+        qty: float,
+        symbol: str,
+        entry_time: datetime | None = None,  # simulated clock in replays
+    ):
         self.position = Position(
             side=side,
             entry_price=price,
             qty=qty,
-            entry_time=datetime.utcnow(),
+            entry_time=entry_time or datetime.utcnow(),
         )
         return self.position
 
@@ -16,10 +16,12 @@ class StrategyEngine:
         model: DirectionModel,
         risk_per_trade: float = 0.01,
         min_adx: float = 8.0,
+        verbose: bool = True,
     ):
         self.model = model
         self.risk_per_trade = risk_per_trade
         self.min_adx = min_adx
+        self.verbose = verbose
 
         metrics = getattr(model, "metadata", {}).get("metrics", {})
         self.model_f1 = float(metrics.get("val_f1", 0.0))
@@ -34,15 +36,19 @@ class StrategyEngine:
 
     # ----------------------------------
     def generate_signal(self, df: pd.DataFrame):
-        row = df.iloc[-1]
+        prob_up = self.model.predict_proba(df)
+        return self.signal_from_row(df.iloc[-1], prob_up)
 
+    def signal_from_row(self, row, prob_up: float):
+        """
+        Threshold logic for one featured bar (Series or dict) whose
+        probability is already known, e.g. from a batched pass.
+        """
         price = row["close"]
         ema200 = row["ema200"]
         atr_pct = row["atr_pct"]
         adx = row["adx"]
 
-        prob_up = self.model.predict_proba(df)
-
         # Broken model protection
         if prob_up < 0.05 or prob_up > 0.95:
             return None, prob_up
@@ -66,6 +72,9 @@ class StrategyEngine:
         if prob_up >= long_th and adx >= self.min_adx:
             return "LONG", prob_up
 
+        if not self.verbose:
+            return None, prob_up
+
         print(
             f"DEBUG | prob={prob_up:.3f} | "
             f"f1={self.model_f1:.2f} | "
@@ -0,0 +1,152 @@
+# features/cache.py
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from data.candle_store import OHLCV_COLUMNS
+from features.technicals import (
+    CORE_FEATURE_COLUMNS,
+    INDICATOR_PARAMS,
+    compute_core_features,
+)
+
+
+# Changes whenever the indicator set or its windows change,
+# so stale frames can never be served after an edit
+FEATURE_SET_VERSION = "core-" + hashlib.sha1(
+    json.dumps([INDICATOR_PARAMS, CORE_FEATURE_COLUMNS], sort_keys=True).encode()
+).hexdigest()[:10]
+
+
+def ohlcv_digest(df: pd.DataFrame) -> str:
+    values = np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy(dtype=np.float64))
+    return hashlib.sha1(values.tobytes()).hexdigest()[:16]
+
+
+class FeatureCache:
+    """
+    Process-wide LRU cache of featured frames.
+
+    Entries are keyed by (symbol, timeframe, first bar time, last bar
+    time, last bar OHLCV, feature-set version); the first bar is part
+    of the key because EMA / Wilder values depend on where the window
+    starts, the last bar's values because a still-forming bar keeps
+    its time while its prices move. Frames with no symbol are keyed by
+    a digest of all their OHLCV values instead; callers that already
+    hold it (see ohlcv_digest) pass it in so it is computed once.
+    Returned frames are shared: treat them as read-only.
+    """
+
+    _shared = None  # 🔑 singleton
+
+    def __init__(self, memory_budget_mb: float = 128.0):
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+
+        self._frames: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
+        self._sizes: dict[tuple, int] = {}
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls, memory_budget_mb: float | None = None) -> "FeatureCache":
+        if cls._shared is None:
+            cls._shared = cls()
+        if memory_budget_mb is not None:
+            cls._shared.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        return cls._shared
+
+    # ----------------------------------
+    @staticmethod
+    def key(
+        df: pd.DataFrame,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+        digest: str | None = None,
+    ) -> tuple:
+        ohlcv = df[OHLCV_COLUMNS]
+        if symbol is None:
+            symbol = "#" + (digest or ohlcv_digest(df))
+
+        return (
+            symbol,
+            timeframe,
+            int(df["time"].iloc[0]),
+            int(df["time"].iloc[-1]),
+            tuple(ohlcv.iloc[-1].to_numpy(dtype=np.float64).tolist()),
+            FEATURE_SET_VERSION,
+        )
+
+    def features(
+        self,
+        df: pd.DataFrame,
+        symbol: str | None = None,
+        timeframe: str | None = None,
+        digest: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        compute_core_features(df), computed at most once per window.
+        """
+        if df.empty:
+            return compute_core_features(df, backend="numpy")
+
+        key = self.key(df, symbol, timeframe, digest)
+
+        with self._lock:
+            featured = self._frames.get(key)
+            if featured is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return featured
+
+        featured = compute_core_features(df, backend="numpy")
+
+        with self._lock:
+            self.misses += 1
+            self._frames[key] = featured
+            self._sizes[key] = int(featured.memory_usage(index=True).sum())
+            self._evict_over_budget(keep=key)
+
+        return featured
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+            self._sizes.clear()
+
+    # ----------------------------------
+    @property
+    def resident_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._frames),
+            "resident_mb": self.resident_bytes / (1024 * 1024),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def _evict_over_budget(self, keep: tuple) -> None:
+        while self.resident_bytes > self.memory_budget_bytes and len(self._frames) > 1:
+            key = next(iter(self._frames))
+            if key == keep:
+                break
+
+            self._frames.pop(key)
+            self._sizes.pop(key)
+            self.evictions += 1
@@ -0,0 +1,171 @@
+# features/labels.py
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+HORIZONS = [3, 5, 8, 12, 16, 24]
+MULTIPLIERS = [0.5, 0.8, 1.0, 1.5, 2.0]
+
+LABEL_KINDS = ["forward", "first_touch"]
+
+
+class LabelGrid(NamedTuple):
+    values: np.ndarray      # (rows, labels) float32, NaN where the future is unknown
+    names: list[str]        # one per column, e.g. "forward_h5_m0.8"
+    spec: list[dict]        # kind / horizon / multiplier per column
+
+    def column(self, kind: str, horizon: int, multiplier: float) -> np.ndarray:
+        return self.values[:, self.names.index(label_name(kind, horizon, multiplier))]
+
+    def describe(self) -> pd.DataFrame:
+        """
+        Labeled rows and positive rate of every label, side by side.
+        """
+        values = np.asarray(self.values)
+        labeled = np.isfinite(values).sum(axis=0)
+        with np.errstate(invalid="ignore"):
+            positive = np.nansum(values, axis=0) / labeled
+
+        return pd.DataFrame(self.spec).assign(
+            name=self.names,
+            labeled_rows=labeled,
+            positive_rate=positive,
+        )
+
+
+def label_name(kind: str, horizon: int, multiplier: float) -> str:
+    return f"{kind}_h{int(horizon)}_m{float(multiplier):g}"
+
+
+# ----------------------------------
+def forward_labels(
+    close: np.ndarray,
+    atr: np.ndarray,
+    horizons: list[int],
+    multipliers: list[float],
+) -> np.ndarray:
+    """
+    (rows, horizons, multipliers) tensor of
+    close[t + h] - close[t] > atr[t] * m, with one shift per horizon
+    and all multipliers broadcast at once. NaN for the last h rows.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+    mults = np.asarray(multipliers, dtype=np.float64)
+    n = len(close)
+
+    out = np.full((n, len(horizons), len(mults)), np.nan, dtype=np.float32)
+    for j, h in enumerate(horizons):
+        if n <= h:
+            continue
+        move = close[h:] - close[:-h]
+        out[:-h, j, :] = move[:, None] > atr[:-h, None] * mults[None, :]
+    return out
+
+
+def first_touch_labels(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr: np.ndarray,
+    horizons: list[int],
+    multipliers: list[float],
+    stop_multiplier: float | None = None,
+    chunk: int = 4096,
+) -> np.ndarray:
+    """
+    (rows, horizons, multipliers) tensor: 1 when the path over the
+    next h bars reaches close + atr * m before close - atr * s, else 0.
+    s is `stop_multiplier`, or m itself for a symmetric barrier.
+    A bar that touches both barriers counts as a stop, the same
+    convention as backtest/exits.py. NaN for the last h rows.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    atr = np.asarray(atr, dtype=np.float64)
+
+    mults = np.asarray(multipliers, dtype=np.float64)
+    stops = mults if stop_multiplier is None else np.full_like(mults, stop_multiplier)
+    horizons = np.asarray(horizons, dtype=np.int64)
+    h_max = int(horizons.max())
+    n = len(close)
+
+    # Bars past the end never touch anything
+    hi_path = np.concatenate([high[1:], np.full(h_max, -np.inf)])
+    lo_path = np.concatenate([low[1:], np.full(h_max, np.inf)])
+    hi_win = np.lib.stride_tricks.sliding_window_view(hi_path, h_max)[:n]
+    lo_win = np.lib.stride_tricks.sliding_window_view(lo_path, h_max)[:n]
+
+    out = np.empty((n, len(horizons), len(mults)), dtype=np.float32)
+    for start in range(0, n, chunk):
+        rows = slice(start, min(start + chunk, n))
+        hi, lo = hi_win[rows], lo_win[rows]        # (rows, h_max)
+        c, a = close[rows, None], atr[rows, None]
+
+        upper = c + a * mults[None, :]             # (rows, mults)
+        lower = c - a * stops[None, :]
+
+        hit_up = hi[:, :, None] >= upper[:, None, :]   # (rows, h_max, mults)
+        hit_dn = lo[:, :, None] <= lower[:, None, :]
+
+        t_up = np.where(hit_up.any(axis=1), hit_up.argmax(axis=1), h_max)
+        t_dn = np.where(hit_dn.any(axis=1), hit_dn.argmax(axis=1), h_max)
+
+        # Hit bar index < h, strictly before the stop
+        out[rows] = (t_up[:, None, :] < horizons[None, :, None]) & (t_up < t_dn)[:, None, :]
+
+    for j, h in enumerate(horizons):
+        out[max(0, n - h) :, j, :] = np.nan
+    return out
+
+
+# ----------------------------------
+def label_grid(
+    df: pd.DataFrame,
+    horizons: list[int] = HORIZONS,
+    multipliers: list[float] = MULTIPLIERS,
+    first_touch: bool = True,
+    stop_multiplier: float | None = None,
+) -> LabelGrid:
+    """
+    Every label definition for a featured frame (needs close / atr,
+    and high / low for first-touch), one column per
+    kind x horizon x multiplier.
+    """
+    close = df["close"].to_numpy(dtype=np.float64)
+    atr = df["atr"].to_numpy(dtype=np.float64)
+
+    blocks = {"forward": forward_labels(close, atr, horizons, multipliers)}
+    if first_touch:
+        blocks["first_touch"] = first_touch_labels(
+            df["high"].to_numpy(dtype=np.float64),
+            df["low"].to_numpy(dtype=np.float64),
+            close,
+            atr,
+            horizons,
+            multipliers,
+            stop_multiplier,
+        )
+
+    names, spec, columns = [], [], []
+    for kind, tensor in blocks.items():
+        for j, h in enumerate(horizons):
+            for k, m in enumerate(multipliers):
+                names.append(label_name(kind, h, m))
+                spec.append({"kind": kind, "horizon": int(h), "multiplier": float(m)})
+                columns.append(tensor[:, j, k])
+
+    return LabelGrid(np.column_stack(columns), names, spec)
+
+
+def atr_target(df: pd.DataFrame, horizon: int, atr_multiplier: float) -> np.ndarray:
+    """
+    The training target: forward label at one horizon / multiplier.
+    """
+    close = df["close"].to_numpy(dtype=np.float64)
+    atr = df["atr"].to_numpy(dtype=np.float64)
+    return forward_labels(close, atr, [horizon], [atr_multiplier])[:, 0, 0]
@@ -0,0 +1,377 @@
+# features/numpy_technicals.py
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from features.technicals import INDICATOR_PARAMS, CORE_FEATURE_COLUMNS
+
+
+COLUMN_INDEX = {name: i for i, name in enumerate(CORE_FEATURE_COLUMNS)}
+
+# Largest growth of the in-block rescaling factor: bounds the
+# cancellation error of the closed-form recurrence to ~1e-13
+_MAX_BLOCK_GROWTH = 1e3
+
+
+class FeatureArray(NamedTuple):
+    """
+    Raw backend output: `values[:, columns[name]]` is a feature,
+    `rows` the positions of those rows in the input frame.
+    """
+
+    values: np.ndarray
+    columns: dict[str, int]
+    rows: np.ndarray
+
+
+def linear_recurrence(x: np.ndarray, decay: float, gain: float, y0: float) -> np.ndarray:
+    """
+    y[0] = y0, y[t] = decay * y[t-1] + gain * x[t], without a Python
+    loop over t.
+
+    Inside a block of length B the recurrence has the closed form
+    y[j] = decay^(j+1) * y[-1] + gain * decay^j * cumsum(x[k] / decay^k),
+    so every block is solved at once with one cumsum; only the block
+    boundaries are chained sequentially.
+    """
+    n = len(x)
+    y = np.empty(n, dtype=np.float64)
+    y[0] = y0
+    if n == 1:
+        return y
+
+    rest = np.asarray(x[1:], dtype=np.float64)
+    block = max(1, min(len(rest), int(np.log(_MAX_BLOCK_GROWTH) / -np.log(decay))))
+    n_blocks = -(-len(rest) // block)
+
+    padded = np.zeros(n_blocks * block)
+    padded[: len(rest)] = rest
+    padded = padded.reshape(n_blocks, block)
+
+    powers = decay ** np.arange(block, dtype=np.float64)
+    local = gain * np.cumsum(padded / powers, axis=1) * powers
+
+    # Chain blocks: carry[b] = y just before block b
+    growth = decay ** (np.arange(block) + 1)
+    carry = np.empty(n_blocks)
+    prev = y0
+    step = decay ** block
+    ends = local[:, -1]
+    for b in range(n_blocks):
+        carry[b] = prev
+        prev = step * prev + ends[b]
+
+    y[1:] = (local + carry[:, None] * growth).ravel()[: len(rest)]
+    return y
+
+
+def ema(close: np.ndarray, window: int) -> np.ndarray:
+    """
+    ta EMAIndicator: ewm(span=window, adjust=False, min_periods=window).
+    """
+    alpha = 2 / (window + 1)
+    out = linear_recurrence(close, 1 - alpha, alpha, close[0])
+    out[: window - 1] = np.nan
+    return out
+
+
+def wilder(x: np.ndarray, window: int, start: int) -> np.ndarray:
+    """
+    Wilder smoothing seeded with mean(x[start-window+1 : start+1]) at
+    `start`; zeros before, as in ta's ATR / ADX.
+    """
+    out = np.zeros(len(x))
+    if len(x) <= start:
+        return out
+
+    seed = x[start - window + 1 : start + 1].mean()
+    out[start:] = linear_recurrence(x[start:], (window - 1) / window, 1 / window, seed)
+    return out
+
+
+def compute_core_features_numpy(
+    df: pd.DataFrame,
+    dtype=np.float64,
+    as_frame: bool = True,
+) -> pd.DataFrame | FeatureArray:
+    """
+    Vectorized NumPy backend of compute_core_features.
+
+    Every indicator is written straight into one preallocated
+    (bars, features) array; no intermediate Series or frame copies.
+    `dtype=np.float32` halves the output. With `as_frame=False` the
+    raw FeatureArray is returned instead of a frame.
+    """
+    p = INDICATOR_PARAMS
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+    n = len(close)
+
+    out = np.empty((n, len(CORE_FEATURE_COLUMNS)), dtype=dtype)
+    col = COLUMN_INDEX
+
+    if n == 0:
+        rows = np.arange(0)
+        return _finish(df, out, rows, as_frame)
+
+    out[:, col["ema_fast"]] = ema(close, p["ema_fast"])
+    out[:, col["ema_slow"]] = ema(close, p["ema_slow"])
+    out[:, col["ema200"]] = ema(close, p["ema200"])
+
+    out[:, col["rsi"]] = _rsi(close, p["rsi"])
+
+    # ---- returns / rolling std ----
+    ret = np.full(n, np.nan)
+    ret[1:] = close[1:] / close[:-1] - 1
+    out[:, col["ret"]] = ret
+    out[:, col["vol"]] = _rolling_std(ret, p["vol"])
+    del ret
+
+    # ---- ATR / ADX ----
+    tr, pos, neg = _directional_movement(high, low, close)
+
+    atr = out[:, col["atr"]]
+    atr[:] = wilder(tr, p["atr"], p["atr"] - 1)
+    np.divide(atr, close, out=out[:, col["atr_pct"]], casting="unsafe")
+
+    out[:, col["adx"]] = _adx(tr, pos, neg, p["adx"])
+    del tr, pos, neg
+
+    # Same rows dropna() keeps in the ta backend
+    valid = np.isfinite(out).all(axis=1)
+    valid &= df[["time", "open", "high", "low", "close", "volume"]].notna().to_numpy().all(axis=1)
+    rows = np.flatnonzero(valid)
+    return _finish(df, out, rows, as_frame)
+
+
+def sliding_core_features(df: pd.DataFrame, window: int) -> FeatureArray:
+    """
+    Last row of compute_core_features_numpy(df.iloc[t - window + 1 : t + 1])
+    for every t >= window - 1, before dropna: each window's EMA /
+    Wilder state starts at that window's own first bar.
+
+    The recurrences run over the `window` offsets, each step updating
+    all windows at once, instead of once per window. `rows` are the
+    positions of the windows' last bars; rows that the backend would
+    drop (warm-up, NaN input) come back non-finite.
+    """
+    p = INDICATOR_PARAMS
+    high = df["high"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    close = df["close"].to_numpy(dtype=np.float64)
+    n = len(close)
+    m = max(0, n - window + 1)
+
+    out = np.full((m, len(CORE_FEATURE_COLUMNS)), np.nan)
+    rows = np.arange(window - 1, window - 1 + m)
+    col = COLUMN_INDEX
+    if m == 0 or window < 1:
+        return FeatureArray(out, COLUMN_INDEX, rows)
+
+    def at(x: np.ndarray, j: int) -> np.ndarray:
+        return x[j : j + m]  # offset j of every window
+
+    last = window - 1
+    tr, pos, neg = _directional_movement(high, low, close)
+    tr0 = at(high, 0) - at(low, 0)  # a window's first bar has no previous close
+
+    spans = {name: 2 / (p[name] + 1) for name in ("ema_fast", "ema_slow", "ema200")}
+    emas = {name: at(close, 0).copy() for name in spans}
+
+    a_rsi = 1 / p["rsi"]
+    up = np.zeros(m)
+    down = np.zeros(m)
+
+    w_atr = p["atr"]
+    atr = np.zeros(m)
+    tr_sum = tr0.copy()
+
+    w_adx = p["adx"]
+    trs = np.zeros(m)
+    pos_s = np.zeros(m)
+    neg_s = np.zeros(m)
+    dx_sum = np.zeros(m)
+    adx = np.zeros(m)
+
+    for j in range(1, window):
+        c = at(close, j)
+        for name, alpha in spans.items():
+            emas[name] = (1 - alpha) * emas[name] + alpha * c
+
+        diff = c - at(close, j - 1)
+        up = (1 - a_rsi) * up + a_rsi * np.maximum(diff, 0.0)
+        down = (1 - a_rsi) * down + a_rsi * np.maximum(-diff, 0.0)
+
+        tr_j = at(tr, j)
+        if j < w_atr:
+            tr_sum = tr_sum + tr_j
+            if j == w_atr - 1:
+                atr = tr_sum / w_atr
+        else:
+            atr = atr * ((w_atr - 1) / w_atr) + tr_j / w_atr
+
+        # Wilder sums: plain sum over offsets 1..w_adx, then s - s/w + x
+        if j <= w_adx:
+            trs = trs + tr_j
+            pos_s = pos_s + at(pos, j)
+            neg_s = neg_s + at(neg, j)
+        else:
+            decay = (w_adx - 1) / w_adx
+            trs = decay * trs + tr_j
+            pos_s = decay * pos_s + at(pos, j)
+            neg_s = decay * neg_s + at(neg, j)
+
+        if j >= w_adx:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                di_pos = np.where(trs != 0, 100 * pos_s / trs, 0.0)
+                di_neg = np.where(trs != 0, 100 * neg_s / trs, 0.0)
+                di_total = di_pos + di_neg
+                dx = np.where(di_total != 0, 100 * np.abs((di_pos - di_neg) / di_total), 0.0)
+
+            # ADX seeded with the mean of the first w_adx DX values
+            if j < 2 * w_adx - 1:
+                dx_sum = dx_sum + dx
+            elif j == 2 * w_adx - 1:
+                adx = (dx_sum + dx) / w_adx
+            else:
+                adx = adx * ((w_adx - 1) / w_adx) + dx / w_adx
+
+    for name in spans:
+        if last >= p[name] - 1:
+            out[:, col[name]] = emas[name]
+
+    if last >= p["rsi"] - 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[:, col["rsi"]] = np.where(down == 0, 100.0, 100 - 100 / (1 + up / down))
+
+    # ret / vol only reach back p["vol"] bars: same as on the full history
+    if last >= 1:
+        ret = np.full(n, np.nan)
+        ret[1:] = close[1:] / close[:-1] - 1
+        out[:, col["ret"]] = at(ret, last)
+        if last >= p["vol"]:
+            out[:, col["vol"]] = at(_rolling_std(ret, p["vol"]), last)
+
+    out[:, col["atr"]] = atr if last >= w_atr - 1 else 0.0
+    out[:, col["atr_pct"]] = out[:, col["atr"]] / at(close, last)
+    out[:, col["adx"]] = adx if last >= 2 * w_adx - 1 else 0.0
+
+    ohlcv = df[["time", "open", "high", "low", "close", "volume"]].notna().to_numpy()
+    out[~ohlcv.all(axis=1)[rows]] = np.nan
+    return FeatureArray(out, COLUMN_INDEX, rows)
+
+
+def _rsi(close: np.ndarray, window: int) -> np.ndarray:
+    """
+    Wilder EMA of gains / losses; the first diff counts as 0.
+    """
+    diff = np.zeros(len(close))
+    diff[1:] = close[1:] - close[:-1]
+
+    alpha = 1 / window
+    up = linear_recurrence(np.maximum(diff, 0.0), 1 - alpha, alpha, 0.0)
+    down = linear_recurrence(np.maximum(-diff, 0.0), 1 - alpha, alpha, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = np.where(down == 0, 100.0, 100 - 100 / (1 + up / down))
+    rsi[: window - 1] = np.nan
+    return rsi
+
+
+def _directional_movement(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    True range and +DM / -DM per bar (bar 0: high - low, 0, 0).
+    """
+    n = len(close)
+    tr = high - low
+    pos = np.zeros(n)
+    neg = np.zeros(n)
+    if n < 2:
+        return tr, pos, neg
+
+    prev_close = close[:-1]
+    np.maximum(tr[1:], np.abs(high[1:] - prev_close), out=tr[1:])
+    np.maximum(tr[1:], np.abs(low[1:] - prev_close), out=tr[1:])
+
+    move_up = high[1:] - high[:-1]
+    move_down = low[:-1] - low[1:]
+    pos[1:] = np.where((move_up > move_down) & (move_up > 0), move_up, 0.0)
+    neg[1:] = np.where((move_down > move_up) & (move_down > 0), move_down, 0.0)
+    return tr, pos, neg
+
+
+def _rolling_std(ret: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sample std of ret[t-window+1 : t+1]; ret[0] is NaN so the first
+    value lands on bar `window`. Two-pass per offset to keep precision
+    without a (bars, window) temporary.
+    """
+    n = len(ret)
+    vol = np.full(n, np.nan)
+    if n <= window:
+        return vol
+
+    m = n - window
+    mean = np.zeros(m)
+    for k in range(window):
+        mean += ret[1 + k : 1 + k + m]
+    mean /= window
+
+    ss = np.zeros(m)
+    for k in range(window):
+        d = ret[1 + k : 1 + k + m] - mean
+        ss += d * d
+
+    vol[window:] = np.sqrt(ss / (window - 1))
+    return vol
+
+
+def _adx(tr: np.ndarray, pos: np.ndarray, neg: np.ndarray, window: int) -> np.ndarray:
+    n = len(tr)
+    adx = np.zeros(n)
+    if n <= window:
+        return adx
+
+    # Wilder sums: plain sum over bars 1..window, then s - s/window + x
+    def smoothed(x: np.ndarray) -> np.ndarray:
+        return linear_recurrence(
+            x[window:], (window - 1) / window, 1.0, x[1 : window + 1].sum()
+        )
+
+    trs = smoothed(tr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        di_pos = np.where(trs != 0, 100 * smoothed(pos) / trs, 0.0)
+        di_neg = np.where(trs != 0, 100 * smoothed(neg) / trs, 0.0)
+        di_total = di_pos + di_neg
+        dx = np.where(di_total != 0, 100 * np.abs((di_pos - di_neg) / di_total), 0.0)
+
+    # dx[k] belongs to bar window + k; ADX seeded at bar 2 * window - 1
+    adx[window:] = wilder(dx, window, window - 1)
+    return adx
+
+
+def _finish(
+    df: pd.DataFrame,
+    out: np.ndarray,
+    rows: np.ndarray,
+    as_frame: bool,
+) -> pd.DataFrame | FeatureArray:
+    # Contiguous tail (the usual case): keep a view, no copy
+    if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+        values = out[rows[0] : rows[-1] + 1]
+    else:
+        values = out[rows]
+
+    if not as_frame:
+        return FeatureArray(values, COLUMN_INDEX, rows)
+
+    data = {name: df[name].to_numpy()[rows] for name in df.columns}
+    data.update({name: values[:, i] for name, i in COLUMN_INDEX.items()})
+    return pd.DataFrame(data, index=df.index[rows])
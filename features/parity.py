@@ -0,0 +1,145 @@
+# features/parity.py
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from data.candle_store import CandleStore
+from features.numpy_technicals import compute_core_features_numpy
+from features.streaming import StreamingFeatures
+from features.technicals import compute_core_features, CORE_FEATURE_COLUMNS
+
+
+TIMEFRAME = "15m"
+TOLERANCE = 1e-9  # relative, per value
+TOLERANCE_FLOAT32 = 1e-6
+
+# Live lookback windows around the warmup edge, plus the full history
+WINDOW_SHAPES = [200, 220, 300, 1000, None]
+
+
+def max_rel_error(reference: pd.DataFrame, candidate: pd.DataFrame) -> dict[str, float]:
+    if len(reference) != len(candidate) or not np.array_equal(
+        reference["time"].to_numpy(), candidate["time"].to_numpy()
+    ):
+        raise AssertionError("feature rows do not line up with the reference")
+
+    errors = {}
+    for col in CORE_FEATURE_COLUMNS:
+        ref = reference[col].to_numpy(dtype=np.float64)
+        got = candidate[col].to_numpy(dtype=np.float64)
+        if not np.array_equal(np.isnan(ref), np.isnan(got)):
+            raise AssertionError(f"{col}: NaN rows differ from the reference")
+        if np.isnan(ref).all():
+            errors[col] = 0.0
+            continue
+        errors[col] = float(np.nanmax(np.abs(got - ref) / np.maximum(1.0, np.abs(ref))))
+    return errors
+
+
+def synthetic_ohlcv(bars: int, seed: int = 0, flat_from: int | None = None) -> pd.DataFrame:
+    """
+    Deterministic random-walk 15m bars. From `flat_from` on every
+    price is frozen at the last close (zero range, zero returns).
+    """
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.005, bars)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0.0, 0.003, bars))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0.0, 0.003, bars))
+
+    if flat_from is not None:
+        price = close[flat_from - 1] if flat_from > 0 else 100.0
+        for values in (open_, high, low, close):
+            values[flat_from:] = price
+
+    return pd.DataFrame({
+        "time": np.arange(bars, dtype=np.int64) * 900_000,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.uniform(1.0, 10.0, bars),
+    })
+
+
+def streaming_frame(df: pd.DataFrame) -> pd.DataFrame:
+    engine = StreamingFeatures()
+    rows = [
+        row
+        for bar in df[["time", "open", "high", "low", "close", "volume"]].itertuples(index=False)
+        if (row := engine.update(bar)) is not None
+    ]
+    return pd.DataFrame(rows)
+
+
+def numpy_frame(df: pd.DataFrame, dtype=np.float64) -> pd.DataFrame:
+    return compute_core_features_numpy(df, dtype=dtype).reset_index(drop=True)
+
+
+def check_symbol(symbol: str, df: pd.DataFrame) -> int:
+    """
+    Every backend against the `ta` reference on each window shape.
+    Returns the number of failed checks.
+    """
+    failures = 0
+
+    for shape in WINDOW_SHAPES:
+        window = df if shape is None else df.tail(shape).reset_index(drop=True)
+        reference = compute_core_features(window).reset_index(drop=True)
+
+        candidates = [
+            ("numpy", numpy_frame(window), TOLERANCE),
+            ("numpy32", numpy_frame(window, np.float32), TOLERANCE_FLOAT32),
+        ]
+        if shape is None:
+            candidates.append(("streaming", streaming_frame(window), TOLERANCE))
+
+        for name, frame, tolerance in candidates:
+            if reference.empty:
+                ok = frame.empty
+                detail = "empty"
+            else:
+                errors = max_rel_error(reference, frame)
+                worst = max(errors, key=errors.get)
+                ok = errors[worst] <= tolerance
+                detail = f"worst={worst}:{errors[worst]:.2e}"
+
+            failures += not ok
+            print(
+                f"[PARITY] {symbol} bars={len(window)} {name} "
+                f"{detail} {'OK' if ok else 'FAIL'}"
+            )
+
+    return failures
+
+
+def main():
+    store = CandleStore()
+
+    # Always checked, so a checkout without stored candles is not a pass
+    failures = check_symbol("SYNTHETIC", synthetic_ohlcv(1500))
+    failures += check_symbol("SYNTHETIC-FLAT", synthetic_ohlcv(1500, flat_from=700))
+
+    for folder in sorted(Path("models").glob("*_USDT")):
+        symbol = folder.name.replace("_", "/")
+        df = store.read(symbol, TIMEFRAME)
+        if len(df) < 300:
+            print(f"[PARITY] {symbol}: no stored candles, skipped")
+            continue
+
+        failures += check_symbol(symbol, df)
+
+    if failures:
+        raise SystemExit(f"{failures} parity failure(s)")
+
+
+if __name__ == "__main__":
+    main()
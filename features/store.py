@@ -0,0 +1,304 @@
+# features/store.py
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from data.candle_store import OHLCV_COLUMNS
+from features.cache import FEATURE_SET_VERSION, FeatureCache, ohlcv_digest
+from features.labels import HORIZONS, MULTIPLIERS, LabelGrid, atr_target, label_grid
+from features.technicals import CORE_FEATURE_COLUMNS, INDICATOR_PARAMS
+
+
+DEFAULT_STORE_DIR = "data_outputs/features"
+DEFAULT_KEEP = 3          # newest entries kept per symbol / timeframe / kind by prune()
+
+# Per-bar columns kept for backtests, next to the model inputs
+FRAME_COLUMNS = OHLCV_COLUMNS + CORE_FEATURE_COLUMNS
+
+
+class FeatureEntry(NamedTuple):
+    key: str
+    X: np.ndarray        # (rows, features) float32 model inputs, memory-mapped
+    y: np.ndarray        # (rows,) float32 labels, NaN where the future is unknown
+    frame: np.ndarray    # (rows, FRAME_COLUMNS) float64 bars + core features
+    meta: dict
+
+    @property
+    def labeled(self) -> int:
+        """
+        Rows with a label; they always form a prefix.
+        """
+        return int(self.meta["labeled_rows"])
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(np.asarray(self.frame), columns=FRAME_COLUMNS, copy=False)
+        df["time"] = df["time"].astype(np.int64)
+        return df
+
+
+class FeatureStore:
+    """
+    On-disk store of featured, labeled training matrices.
+
+    One directory per entry holding X.npy / y.npy / frame.npy and a
+    meta.json. Entries are keyed by a hash of everything they depend
+    on: symbol, timeframe, bar range, a digest of the OHLCV values,
+    feature columns, indicator parameters, label horizon and ATR
+    multiplier. So an entry is never stale (a corrected or re-fetched
+    history makes a new one), and a change to any of them makes a new
+    one. Reads are memory-mapped, so loading an entry copies nothing.
+
+    Label grids (features/labels.py) are stored the same way, row for
+    row aligned with the feature entries of the same bar range.
+    Superseded entries are removed with prune().
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+
+    # ----------------------------------
+    @staticmethod
+    def key(
+        symbol: str,
+        timeframe: str,
+        first_time: int,
+        last_time: int,
+        feature_columns: list[str],
+        horizon: int,
+        atr_multiplier: float,
+        data_digest: str,
+    ) -> str:
+        spec = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "first_time": int(first_time),
+            "last_time": int(last_time),
+            "data_digest": data_digest,
+            "feature_columns": list(feature_columns),
+            "indicator_params": INDICATOR_PARAMS,
+            "feature_set": FEATURE_SET_VERSION,
+            "horizon": int(horizon),
+            "atr_multiplier": float(atr_multiplier),
+        }
+        return _digest(spec)
+
+    def path(self, symbol: str, timeframe: str, key: str) -> Path:
+        return self.root / symbol.replace("/", "_") / f"{timeframe}-{key}"
+
+    # ----------------------------------
+    def load(self, symbol: str, timeframe: str, key: str) -> FeatureEntry | None:
+        path = self.path(symbol, timeframe, key)
+        try:
+            meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+            return FeatureEntry(
+                key=key,
+                X=np.load(path / "X.npy", mmap_mode="r"),
+                y=np.load(path / "y.npy", mmap_mode="r"),
+                frame=np.load(path / "frame.npy", mmap_mode="r"),
+                meta=meta,
+            )
+        except (OSError, ValueError):
+            return None
+
+    def get(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        timeframe: str,
+        feature_columns: list[str],
+        horizon: int = 5,
+        atr_multiplier: float = 0.8,
+    ) -> FeatureEntry:
+        """
+        Entry for a raw OHLCV history, built and written on first use.
+        """
+        data_digest = ohlcv_digest(df)
+        key = self.key(
+            symbol,
+            timeframe,
+            df["time"].iloc[0],
+            df["time"].iloc[-1],
+            feature_columns,
+            horizon,
+            atr_multiplier,
+            data_digest,
+        )
+
+        entry = self.load(symbol, timeframe, key)
+        if entry is not None:
+            return entry
+
+        # Keyed by content, so a corrected history is never served stale
+        featured = FeatureCache.shared().features(df, digest=data_digest)
+        y = atr_target(featured, horizon, atr_multiplier)
+
+        meta = {
+            "key": key,
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "first_time": int(df["time"].iloc[0]),
+            "last_time": int(df["time"].iloc[-1]),
+            "data_digest": data_digest,
+            "feature_columns": list(feature_columns),
+            "indicator_params": INDICATOR_PARAMS,
+            "feature_set": FEATURE_SET_VERSION,
+            "horizon": int(horizon),
+            "atr_multiplier": float(atr_multiplier),
+            "rows": int(len(featured)),
+            "labeled_rows": int(np.isfinite(y).sum()),
+            "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        }
+
+        self._write(
+            self.path(symbol, timeframe, key),
+            X=featured[feature_columns].to_numpy(dtype=np.float32),
+            y=y,
+            frame=featured[FRAME_COLUMNS].to_numpy(dtype=np.float64),
+            meta=meta,
+        )
+        return self.load(symbol, timeframe, key)
+
+    def get_labels(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        timeframe: str,
+        horizons: list[int] = HORIZONS,
+        multipliers: list[float] = MULTIPLIERS,
+        first_touch: bool = True,
+        stop_multiplier: float | None = None,
+    ) -> LabelGrid:
+        """
+        Label grid for a raw OHLCV history, built and written on first use.
+        """
+        data_digest = ohlcv_digest(df)
+        spec = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "first_time": int(df["time"].iloc[0]),
+            "last_time": int(df["time"].iloc[-1]),
+            "data_digest": data_digest,
+            "indicator_params": INDICATOR_PARAMS,
+            "feature_set": FEATURE_SET_VERSION,
+            "horizons": [int(h) for h in horizons],
+            "multipliers": [float(m) for m in multipliers],
+            "first_touch": bool(first_touch),
+            "stop_multiplier": stop_multiplier,
+        }
+        key = _digest(spec)
+        path = self.root / symbol.replace("/", "_") / f"{timeframe}-labels-{key}"
+
+        grid = self._load_labels(path)
+        if grid is not None:
+            return grid
+
+        featured = FeatureCache.shared().features(df, digest=data_digest)
+        grid = label_grid(featured, horizons, multipliers, first_touch, stop_multiplier)
+
+        meta = {
+            "key": key,
+            **spec,
+            "rows": int(len(featured)),
+            "names": grid.names,
+            "spec": grid.spec,
+            "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write(path, meta=meta, labels=grid.values)
+        return self._load_labels(path)
+
+    @staticmethod
+    def _load_labels(path: Path) -> LabelGrid | None:
+        try:
+            meta = json.loads((path / "meta.json").read_text(encoding="utf-8"))
+            values = np.load(path / "labels.npy", mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        return LabelGrid(values, meta["names"], meta["spec"])
+
+    def entries(self, symbol: str | None = None) -> list[dict]:
+        """
+        meta.json of every stored entry (feature and label), with
+        its directory under "path".
+        """
+        pattern = f"{symbol.replace('/', '_')}/*/meta.json" if symbol else "*/*/meta.json"
+        entries = []
+        for p in sorted(self.root.glob(pattern)):
+            if p.parent.name.startswith("."):
+                continue  # entry still being written
+            try:
+                meta = json.loads(p.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            entries.append({**meta, "path": str(p.parent)})
+        return entries
+
+    def prune(
+        self,
+        symbol: str | None = None,
+        keep: int = DEFAULT_KEEP,
+        max_age_days: float | None = None,
+        protect: set[str] = frozenset(),
+    ) -> list[str]:
+        """
+        Delete superseded entries: per symbol, timeframe and kind
+        (features / labels) only the `keep` newest survive, and with
+        `max_age_days` none older than that. Keys in `protect` (e.g.
+        the feature_store_key of saved models) are never deleted.
+        Returns the deleted keys.
+        """
+        now = datetime.now(timezone.utc)
+        groups: dict[tuple, list[dict]] = {}
+        for meta in self.entries(symbol):
+            kind = "labels" if "names" in meta else "features"
+            groups.setdefault((meta["symbol"], meta["timeframe"], kind), []).append(meta)
+
+        deleted = []
+        for metas in groups.values():
+            metas.sort(key=lambda m: m.get("created_at_utc", ""), reverse=True)
+            for rank, meta in enumerate(metas):
+                if meta["key"] in protect:
+                    continue
+
+                age_days = (now - datetime.fromisoformat(meta["created_at_utc"])).total_seconds() / 86400
+                expired = max_age_days is not None and age_days > max_age_days
+                if rank < keep and not expired:
+                    continue
+
+                shutil.rmtree(meta["path"], ignore_errors=True)
+                deleted.append(meta["key"])
+        return deleted
+
+    # ----------------------------------
+    @staticmethod
+    def _write(path: Path, meta: dict, **arrays: np.ndarray) -> None:
+        """
+        Build the entry in a temp dir and rename it into place, so a
+        reader never sees a partial entry. A concurrent writer of the
+        same key loses the rename and its copy is discarded.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=path.parent, prefix=".building-"))
+        try:
+            for name, values in arrays.items():
+                np.save(tmp / f"{name}.npy", np.ascontiguousarray(values))
+            (tmp / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+            os.rename(tmp, path)
+        except OSError:
+            if not path.exists():
+                raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _digest(spec: dict) -> str:
+    return hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:16]
+
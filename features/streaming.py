@@ -0,0 +1,243 @@
+# features/streaming.py
+
+import math
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from features.technicals import INDICATOR_PARAMS
+
+
+@dataclass(slots=True)
+class _IndicatorState:
+    bars: int = 0
+    time: int | None = None
+
+    prev_high: float = math.nan
+    prev_low: float = math.nan
+    prev_close: float = math.nan
+
+    ema_fast: float = math.nan
+    ema_slow: float = math.nan
+    ema200: float = math.nan
+
+    rsi_up: float = 0.0
+    rsi_down: float = 0.0
+
+    rets: tuple = ()
+
+    tr_seed: float = 0.0
+    atr: float = 0.0
+
+    dm_sum: float = 0.0     # Wilder-smoothed true range (ADX)
+    dip_sum: float = 0.0
+    din_sum: float = 0.0
+    dx_seed: float = 0.0
+    adx: float = 0.0
+
+
+class StreamingFeatures:
+    """
+    Incremental version of compute_core_features.
+
+    Every indicator carries its own running state, so a new closed
+    bar costs O(1) instead of recomputing the whole window. The
+    recursions mirror the `ta` implementations bar for bar, so the
+    output matches compute_core_features on the same history.
+    """
+
+    def __init__(self, params: dict | None = None):
+        self.params = {**INDICATOR_PARAMS, **(params or {})}
+        self.state = _IndicatorState()
+        self.last_row: dict | None = None
+        self.warmup = max(self.params["ema200"] - 1, self.params["vol"])
+
+    # ----------------------------------
+    @classmethod
+    def from_history(cls, df: pd.DataFrame) -> "StreamingFeatures":
+        engine = cls()
+        engine.seed(df)
+        return engine
+
+    def seed(self, df: pd.DataFrame) -> dict | None:
+        self.state = _IndicatorState()
+        self.last_row = None
+
+        row = None
+        for bar in df[["time", "open", "high", "low", "close", "volume"]].itertuples(index=False):
+            row = self.update(bar)
+        return row
+
+    # ----------------------------------
+    def update(self, bar) -> dict | None:
+        """
+        Commit a CLOSED bar. Returns its feature row,
+        or None while the indicators are still warming up.
+        """
+        self.state, row = self._step(self.state, bar)
+        self.last_row = row
+        return row
+
+    def peek(self, bar) -> dict | None:
+        """
+        Feature row for a still-forming bar, state untouched.
+        """
+        _, row = self._step(self.state, bar)
+        return row
+
+    def sync(self, df: pd.DataFrame, forming: int = 1) -> dict | None:
+        """
+        Bring the engine up to date with a fetched window.
+
+        Closed bars newer than the last committed one are applied,
+        the trailing `forming` rows are only peeked. A window that
+        no longer overlaps the state (e.g. after downtime) reseeds.
+        """
+        closed = df.iloc[: len(df) - forming] if forming else df
+        last = self.state.time
+
+        if last is None or not (closed["time"] == last).any():
+            row = self.seed(closed)
+        else:
+            row = None
+            fresh = closed[closed["time"] > last]
+            for bar in fresh[["time", "open", "high", "low", "close", "volume"]].itertuples(index=False):
+                row = self.update(bar)
+
+            if row is None and fresh.empty:
+                row = self.last_row
+
+        for bar in df.iloc[len(closed):][["time", "open", "high", "low", "close", "volume"]].itertuples(index=False):
+            row = self.peek(bar)
+
+        return row
+
+    # ----------------------------------
+    def _step(self, s: _IndicatorState, bar) -> tuple[_IndicatorState, dict | None]:
+        p = self.params
+        time, open_, high, low, close, volume = bar
+        t = s.bars
+
+        def ema(prev: float, x: float, alpha: float) -> float:
+            return x if t == 0 else (1 - alpha) * prev + alpha * x
+
+        ema_fast = ema(s.ema_fast, close, 2 / (p["ema_fast"] + 1))
+        ema_slow = ema(s.ema_slow, close, 2 / (p["ema_slow"] + 1))
+        ema200 = ema(s.ema200, close, 2 / (p["ema200"] + 1))
+
+        # ---- true range / directional movement ----
+        if t == 0:
+            ret = math.nan
+            up = down = pos = neg = 0.0
+            tr = high - low
+        else:
+            pc = s.prev_close
+            diff = close - pc
+            up = diff if diff > 0 else 0.0
+            down = -diff if diff < 0 else 0.0
+            ret = close / pc - 1
+
+            tr = max(high - low, abs(high - pc), abs(low - pc))
+
+            move_up = high - s.prev_high
+            move_down = s.prev_low - low
+            pos = move_up if (move_up > move_down and move_up > 0) else 0.0
+            neg = move_down if (move_down > move_up and move_down > 0) else 0.0
+
+        # ---- RSI (Wilder EMA of gains / losses) ----
+        n = p["rsi"]
+        rsi_up = ema(s.rsi_up, up, 1 / n)
+        rsi_down = ema(s.rsi_down, down, 1 / n)
+
+        if t < n - 1:
+            rsi = math.nan
+        elif rsi_down == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - 100 / (1 + rsi_up / rsi_down)
+
+        # ---- rolling return std ----
+        rets = s.rets if t == 0 else (s.rets + (ret,))[-p["vol"]:]
+        vol = float(np.std(rets, ddof=1)) if len(rets) == p["vol"] else math.nan
+
+        # ---- ATR ----
+        n = p["atr"]
+        tr_seed = s.tr_seed
+        if t < n:
+            tr_seed += tr
+            atr = tr_seed / n if t == n - 1 else 0.0
+        else:
+            atr = (s.atr * (n - 1) + tr) / n
+
+        # ---- ADX ----
+        n = p["adx"]
+        dm_sum, dip_sum, din_sum = s.dm_sum, s.dip_sum, s.din_sum
+        dx_seed, adx = s.dx_seed, 0.0
+
+        if 1 <= t <= n:
+            dm_sum += tr
+            dip_sum += pos
+            din_sum += neg
+        elif t > n:
+            dm_sum = dm_sum - dm_sum / n + tr
+            dip_sum = dip_sum - dip_sum / n + pos
+            din_sum = din_sum - din_sum / n + neg
+
+        if t >= n:
+            di_pos = 100 * (dip_sum / dm_sum) if dm_sum != 0 else 0.0
+            di_neg = 100 * (din_sum / dm_sum) if dm_sum != 0 else 0.0
+            di_total = di_pos + di_neg
+            dx = 100 * abs((di_pos - di_neg) / di_total) if di_total != 0 else 0.0
+
+            if t < 2 * n - 1:
+                dx_seed += dx
+            elif t == 2 * n - 1:
+                dx_seed += dx
+                adx = dx_seed / n
+            else:
+                adx = (s.adx * (n - 1) + dx) / n
+
+        state = replace(
+            s,
+            bars=t + 1,
+            time=int(time),
+            prev_high=high,
+            prev_low=low,
+            prev_close=close,
+            ema_fast=ema_fast,
+            ema_slow=ema_slow,
+            ema200=ema200,
+            rsi_up=rsi_up,
+            rsi_down=rsi_down,
+            rets=rets,
+            tr_seed=tr_seed,
+            atr=atr,
+            dm_sum=dm_sum,
+            dip_sum=dip_sum,
+            din_sum=din_sum,
+            dx_seed=dx_seed,
+            adx=adx,
+        )
+
+        if t < self.warmup:
+            return state, None
+
+        row = {
+            "time": int(time),
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "ema_fast": ema_fast,
+            "ema_slow": ema_slow,
+            "ema200": ema200,
+            "rsi": rsi,
+            "ret": ret,
+            "vol": vol,
+            "atr": atr,
+            "atr_pct": atr / close,
+            "adx": adx,
+        }
+        return state, row
@@ -5,30 +5,65 @@ import ta
 import pandas as pd
 
 
-def compute_core_features(df: pd.DataFrame) -> pd.DataFrame:
+# Window lengths shared by every feature backend
+INDICATOR_PARAMS = {
+    "ema_fast": 9,
+    "ema_slow": 21,
+    "ema200": 200,
+    "rsi": 14,
+    "vol": 10,
+    "atr": 14,
+    "adx": 14,
+}
+
+CORE_FEATURE_COLUMNS = [
+    "ema_fast",
+    "ema_slow",
+    "ema200",
+    "rsi",
+    "ret",
+    "vol",
+    "atr",
+    "atr_pct",
+    "adx",
+]
+
+
+def compute_core_features(df: pd.DataFrame, backend: str = "ta") -> pd.DataFrame:
     """
     Core indicators used by:
     - models
     - regime detection
     - strategy
+
+    backend="numpy" runs the vectorized implementation in
+    features/numpy_technicals.py (same rows and values, much faster
+    on long histories).
     """
+    if backend == "numpy":
+        from features.numpy_technicals import compute_core_features_numpy
+
+        return compute_core_features_numpy(df)
+    if backend != "ta":
+        raise ValueError(f"Unknown feature backend: {backend}")
 
+    p = INDICATOR_PARAMS
     df = df.copy()
 
-    df["ema_fast"] = ta.trend.EMAIndicator(df["close"], 9).ema_indicator()
-    df["ema_slow"] = ta.trend.EMAIndicator(df["close"], 21).ema_indicator()
-    df["ema200"] = ta.trend.EMAIndicator(df["close"], 200).ema_indicator()
+    df["ema_fast"] = ta.trend.EMAIndicator(df["close"], p["ema_fast"]).ema_indicator()
+    df["ema_slow"] = ta.trend.EMAIndicator(df["close"], p["ema_slow"]).ema_indicator()
+    df["ema200"] = ta.trend.EMAIndicator(df["close"], p["ema200"]).ema_indicator()
 
-    df["rsi"] = ta.momentum.RSIIndicator(df["close"], 14).rsi()
+    df["rsi"] = ta.momentum.RSIIndicator(df["close"], p["rsi"]).rsi()
 
     df["ret"] = df["close"].pct_change()
-    df["vol"] = df["ret"].rolling(10).std()
+    df["vol"] = df["ret"].rolling(p["vol"]).std()
 
     atr = ta.volatility.AverageTrueRange(
         high=df["high"],
         low=df["low"],
         close=df["close"],
-        window=14,
+        window=p["atr"],
     )
     df["atr"] = atr.average_true_range()
     df["atr_pct"] = df["atr"] / df["close"]
@@ -37,7 +72,7 @@ def compute_core_features(df: pd.DataFrame) -> pd.DataFrame:
         high=df["high"],
         low=df["low"],
         close=df["close"],
-        window=14,
+        window=p["adx"],
     )
     df["adx"] = adx.adx()
 
@@ -2,21 +2,30 @@
 
 import os
 import json
-import torch
-import joblib
 import numpy as np
 
-from features.technicals import compute_core_features
+from features.cache import FeatureCache
 from models.model_identity import MODEL_NAME, MODEL_VERSION
+from models.numpy_runtime import (
+    NumpyDirectionNet,
+    bundle_path,
+    fold_scaler,
+    source_digest,
+    torch_layers,
+)
 
 
 class DirectionModel:
     """
     Directional AI model.
+
+    Runs on the torch-free NumPy bundle (scaler folded into the
+    first layer) whenever an up-to-date one sits next to model.pt,
+    otherwise falls back to torch + the pickled scaler.
     """
 
     @classmethod
-    def for_symbol(cls, symbol: str) -> "DirectionModel":
+    def for_symbol(cls, symbol: str, metadata: dict | None = None) -> "DirectionModel":
         folder = f"models/{symbol.replace('/', '_')}"
         model_path = f"{folder}/model.pt"
         scaler_path = f"{folder}/scaler.save"
@@ -29,6 +38,7 @@ class DirectionModel:
             model_path=model_path,
             scaler_path=scaler_path,
             metadata_path=metadata_path,
+            metadata=metadata,
         )
 
     def __init__(
@@ -36,6 +46,8 @@ class DirectionModel:
         model_path: str,
         scaler_path: str,
         metadata_path: str | None = None,
+        runtime: str = "auto",  # auto | numpy | torch
+        metadata: dict | None = None,  # already-parsed metadata.json
     ):
         self.model_name = MODEL_NAME
         self.model_version = MODEL_VERSION
@@ -51,18 +63,36 @@ class DirectionModel:
         ]
 
         self.metadata: dict = {}
-        if metadata_path and os.path.exists(metadata_path):
+        if metadata is None and metadata_path and os.path.exists(metadata_path):
             with open(metadata_path, "r", encoding="utf-8") as f:
-                self.metadata = json.load(f)
+                metadata = json.load(f)
 
+        if metadata:
+            self.metadata = metadata
             self.feature_columns = self.metadata.get(
                 "feature_columns", self.feature_columns
             )
             self.model_name = self.metadata.get("model_name", self.model_name)
             self.model_version = self.metadata.get("model_version", self.model_version)
 
-        self.model = self._load_model(model_path)
-        self.scaler = joblib.load(scaler_path)
+        self.runtime: NumpyDirectionNet | None = None
+        self.model = None
+        self.scaler = None
+
+        if runtime != "torch":
+            self.runtime = NumpyDirectionNet.load(
+                bundle_path(model_path),
+                expected_digest=source_digest(model_path, scaler_path),
+            )
+
+        if self.runtime is None:
+            if runtime == "numpy":
+                raise FileNotFoundError(f"No up-to-date NumPy bundle for {model_path}")
+
+            import joblib
+
+            self.model = self._load_model(model_path)
+            self.scaler = joblib.load(scaler_path)
 
         opt_th = self.metadata.get("optimized_long_threshold")
         if opt_th:
@@ -71,7 +101,39 @@ class DirectionModel:
         else:
             self._init_thresholds()
 
-    def _load_model(self, model_path: str) -> torch.nn.Module:
+    def numpy_net(self) -> NumpyDirectionNet:
+        """
+        NumPy forward pass of this model. Without a bundle the
+        scaler is folded into the torch weights in memory.
+        """
+        if self.runtime is not None:
+            return self.runtime
+
+        return NumpyDirectionNet(
+            fold_scaler(
+                torch_layers(self.model.state_dict()),
+                getattr(self.scaler, "mean_", None),
+                getattr(self.scaler, "scale_", None),
+            )
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Approximate resident size of weights + scaler.
+        """
+        if self.runtime is not None:
+            return self.runtime.nbytes
+
+        size = sum(p.numel() * p.element_size() for p in self.model.parameters())
+        for attr in ("mean_", "scale_", "var_"):
+            value = getattr(self.scaler, attr, None)
+            size += getattr(value, "nbytes", 0)
+        return size
+
+    def _load_model(self, model_path: str) -> "torch.nn.Module":
+        import torch
+
         state_dict = torch.load(model_path, map_location="cpu")
 
         w0 = state_dict["net.0.weight"]
@@ -102,22 +164,7 @@ class DirectionModel:
         return model
 
     def _init_thresholds(self) -> None:
-        metrics = self.metadata.get("metrics", {})
-
-        pos_rate = float(metrics.get("val_positive_rate", 0.5))
-        f1 = float(metrics.get("val_f1", 0.0))
-
-        if pos_rate < 0.20:
-            long_th = 0.45
-        elif pos_rate < 0.30:
-            long_th = 0.50
-        else:
-            long_th = 0.55
-
-        if f1 < 0.20:
-            long_th += 0.05
-
-        self.long_threshold = float(np.clip(long_th, 0.40, 0.65))
+        self.long_threshold = default_long_threshold(self.metadata.get("metrics", {}))
         self.short_threshold = 1.0 - self.long_threshold
 
         print(
@@ -126,10 +173,45 @@ class DirectionModel:
             f"SHORT_TH={self.short_threshold:.2f}"
         )
 
+    def feature_matrix(self, df) -> np.ndarray:
+        """
+        Model inputs for every row of a featured frame.
+        """
+        if "ema200" not in df.columns or "atr_pct" not in df.columns:
+            df = FeatureCache.shared().features(df)
+
+        return df[self.feature_columns].to_numpy(dtype=np.float32)
+
+    def predict_proba_series(self, data) -> np.ndarray:
+        """
+        Probabilities for every row in one scaler transform and one
+        forward pass. `data` is a feature matrix or a featured frame
+        (a raw OHLCV frame is featurized first; the result then lines
+        up with the featured rows).
+        """
+        features = data if isinstance(data, np.ndarray) else self.feature_matrix(data)
+        if len(features) == 0:
+            return np.empty(0)
+
+        probs = self._forward(features)
+        return np.where((probs >= 0.0) & (probs <= 1.0), probs, 0.5)
+
+    def _forward(self, features: np.ndarray) -> np.ndarray:
+        if self.runtime is not None:
+            return self.runtime(features)
+
+        import torch
+
+        features = self.scaler.transform(features)
+        tensor = torch.tensor(features, dtype=torch.float32)
+
+        with torch.no_grad():
+            return self.model(tensor).numpy().ravel().astype(np.float64)
+
     def predict_proba(self, df) -> float:
         # Prevent double indicator computation
         if "ema200" not in df.columns or "atr_pct" not in df.columns:
-            df = compute_core_features(df)
+            df = FeatureCache.shared().features(df)
 
         if df is None or df.empty:
             return 0.5
@@ -144,10 +226,27 @@ class DirectionModel:
         except KeyError:
             return 0.5
 
-        features = self.scaler.transform(features)
-        tensor = torch.tensor(features, dtype=torch.float32)
+        prob = float(self._forward(features)[0])
 
-        with torch.no_grad():
-            prob = float(self.model(tensor).item())
+        return prob if 0.0 <= prob <= 1.0 else 0.5
+
+
+def default_long_threshold(metrics: dict) -> float:
+    """
+    LONG threshold for a model without an optimized one, from its
+    validation positive rate and F1.
+    """
+    pos_rate = float(metrics.get("val_positive_rate", 0.5))
+    f1 = float(metrics.get("val_f1", 0.0))
+
+    if pos_rate < 0.20:
+        long_th = 0.45
+    elif pos_rate < 0.30:
+        long_th = 0.50
+    else:
+        long_th = 0.55
+
+    if f1 < 0.20:
+        long_th += 0.05
 
-        return prob if 0.0 <= prob <= 1.0 else 0.5
\ No newline at end of file
+    return float(np.clip(long_th, 0.40, 0.65))
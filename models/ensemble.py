@@ -3,13 +3,23 @@
 from typing import List
 import numpy as np
 
-from execution.regime import detect_regime, MarketRegime
+from features.cache import FeatureCache
+from execution.regime import (
+    REGIME_ORDER,
+    MarketRegime,
+    detect_regime,
+    detect_regime_series,
+)
 
 
 class EnsembleDirectionModel:
     """
     Combines multiple DirectionModels using
     regime-aware weighted averaging.
+
+    When every member shares its feature columns and layer shapes,
+    the members' (scaler-folded) weights are stacked and the whole
+    ensemble runs as one batched forward pass over a shared input.
     """
 
     def __init__(self, models: List):
@@ -20,8 +30,66 @@ class EnsembleDirectionModel:
         # Default weights (will be adjusted dynamically)
         self.base_weights = np.ones(len(models)) / len(models)
 
+        self._stack = self._build_stack()
+
+    # ----------------------------------
+    def _build_stack(self):
+        if not all(hasattr(m, "numpy_net") for m in self.models):
+            return None
+
+        columns = self.models[0].feature_columns
+        if any(m.feature_columns != columns for m in self.models):
+            return None
+
+        nets = [m.numpy_net() for m in self.models]
+        shapes = [[w.shape for w, _ in net.layers] for net in nets]
+        if any(s != shapes[0] for s in shapes):
+            return None
+
+        # Layer 0: one wide matmul; deeper layers: batched per member
+        w0 = np.concatenate([net.layers[0][0] for net in nets], axis=1)
+        b0 = np.concatenate([net.layers[0][1] for net in nets])
+        deeper = [
+            (
+                np.stack([net.layers[i][0] for net in nets]),
+                np.stack([net.layers[i][1] for net in nets])[:, None, :],
+            )
+            for i in range(1, len(nets[0].layers))
+        ]
+        return w0, b0, deeper
+
+    def member_probs(self, df) -> np.ndarray:
+        """
+        (rows, members) probabilities for every row of a featured frame.
+        """
+        if self._stack is None:
+            return np.column_stack([m.predict_proba_series(df) for m in self.models])
+
+        features = self.models[0].feature_matrix(df).astype(np.float64)
+        w0, b0, deeper = self._stack
+
+        n_members = len(self.models)
+        h = np.maximum(features @ w0 + b0, 0.0)
+        h = h.reshape(len(features), n_members, -1).transpose(1, 0, 2)
+
+        for i, (w, b) in enumerate(deeper):
+            h = h @ w + b
+            if i < len(deeper) - 1:
+                h = np.maximum(h, 0.0)
+
+        probs = np.exp(-np.logaddexp(0.0, -h[:, :, 0].T))
+        return np.where((probs >= 0.0) & (probs <= 1.0), probs, 0.5)
+
+    # ----------------------------------
     def predict_proba(self, df):
-        probs = np.array([m.predict_proba(df) for m in self.models])
+        if "ema200" not in df.columns or "atr_pct" not in df.columns:
+            df = FeatureCache.shared().features(df)
+
+        if self._stack is None:
+            # One live bar: members resolve it themselves (BTC snapshot)
+            probs = np.array([m.predict_proba(df) for m in self.models])
+        else:
+            probs = self.member_probs(df.iloc[[-1]])[0]
 
         regime = detect_regime(df)
         weights = self._weights_for_regime(regime)
@@ -29,6 +97,26 @@ class EnsembleDirectionModel:
         prob = float(np.average(probs, weights=weights))
         return prob
 
+    def predict_proba_series(self, df) -> np.ndarray:
+        """
+        Ensemble probability for every bar of a featured history,
+        each bar weighted by its own regime.
+        """
+        if len(df) == 0:
+            return np.empty(0)
+
+        return self.combine(self.member_probs(df), df)
+
+    def combine(self, probs: np.ndarray, df) -> np.ndarray:
+        """
+        Regime-weighted average of a (rows, members) probability
+        matrix whose rows line up with the featured frame `df`.
+        """
+        table = np.stack([self._weights_for_regime(r) for r in REGIME_ORDER])
+        weights = table[detect_regime_series(df)]
+
+        return (probs * weights).sum(axis=1) / weights.sum(axis=1)
+
     def _weights_for_regime(self, regime: MarketRegime):
         n = len(self.models)
 
@@ -47,4 +135,3 @@ class EnsembleDirectionModel:
 
         # CHOPPY → be conservative
         return np.array([0.6, 0.4])[:n]
-
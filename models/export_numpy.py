@@ -0,0 +1,75 @@
+# models/export_numpy.py
+
+import sys
+from pathlib import Path
+
+import joblib
+import numpy as np
+import torch
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from models.direction import DirectionModel
+from models.numpy_runtime import (
+    NumpyDirectionNet,
+    bundle_path,
+    fold_scaler,
+    save_bundle,
+    source_digest,
+    torch_layers,
+)
+
+
+TOLERANCE = 1e-5  # max |p_numpy - p_torch|
+
+
+def export_numpy_bundle(model_path: str, scaler_path: str) -> Path:
+    """
+    Fold the scaler into the first layer, check the result against
+    the torch path and write the array bundle next to model.pt.
+    """
+    state_dict = torch.load(model_path, map_location="cpu")
+    scaler = joblib.load(scaler_path)
+
+    layers = fold_scaler(
+        torch_layers(state_dict),
+        getattr(scaler, "mean_", None),
+        getattr(scaler, "scale_", None),
+    )
+    runtime = NumpyDirectionNet(layers)
+
+    # Probe around the training distribution
+    rng = np.random.default_rng(0)
+    mean = getattr(scaler, "mean_", np.zeros(runtime.input_dim))
+    scale = getattr(scaler, "scale_", np.ones(runtime.input_dim))
+    probe = (mean + scale * rng.normal(0.0, 2.0, (2048, runtime.input_dim))).astype(np.float32)
+
+    reference = DirectionModel(model_path, scaler_path, runtime="torch")
+    error = float(np.abs(runtime(probe) - reference.predict_proba_series(probe)).max())
+    if error > TOLERANCE:
+        raise RuntimeError(f"NumPy bundle mismatch for {model_path}: {error:.2e}")
+
+    path = bundle_path(model_path)
+    save_bundle(path, layers, source_digest(model_path, scaler_path))
+    print(f"✅ Exported {path} (max |Δp| {error:.1e})")
+    return path
+
+
+def main():
+    for model_path in sorted(Path("models").glob("**/*.pt")):
+        scaler_path = model_path.with_name("scaler.save")
+        if not scaler_path.exists():
+            print(f"⚠️ No scaler next to {model_path}, skipped")
+            continue
+
+        try:
+            export_numpy_bundle(str(model_path), str(scaler_path))
+        except Exception as e:
+            print(f"❌ Export failed for {model_path}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# models/metadata.py
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+
+def metadata_path(symbol: str, root: str = "models") -> Path:
+    return Path(root) / symbol.replace("/", "_") / "metadata.json"
+
+
+def read_metadata(path: str | Path) -> dict | None:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def write_metadata(path: str | Path, metadata: dict) -> None:
+    """
+    Replace metadata.json atomically: readers see either the old
+    file or the new one, never a half-written one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".metadata.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def update_metadata(symbol: str, updates: dict, root: str = "models") -> dict:
+    """
+    Merge `updates` into a symbol's metadata.json and return the result.
+    """
+    path = metadata_path(symbol, root)
+    metadata = read_metadata(path)
+    if metadata is None:
+        raise FileNotFoundError(f"No metadata.json for {symbol}")
+
+    metadata.update(updates)
+    write_metadata(path, metadata)
+    return metadata
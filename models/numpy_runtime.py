@@ -0,0 +1,127 @@
+# models/numpy_runtime.py
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+
+
+BUNDLE_SUFFIX = ".npz"
+
+
+def bundle_path(model_path: str) -> Path:
+    return Path(model_path).with_suffix(BUNDLE_SUFFIX)
+
+
+def source_digest(*paths: str) -> str:
+    """
+    Fingerprint of the torch checkpoint + scaler a bundle came from,
+    so a retrained model never runs with a stale bundle.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def torch_layers(state_dict: dict) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    (weight, bias) pairs of the `net` Sequential, in order.
+    """
+    indices = sorted(
+        int(key.split(".")[1]) for key in state_dict if key.endswith(".weight")
+    )
+    return [
+        (
+            state_dict[f"net.{i}.weight"].detach().cpu().numpy(),
+            state_dict[f"net.{i}.bias"].detach().cpu().numpy(),
+        )
+        for i in indices
+    ]
+
+
+def fold_scaler(
+    layers: list[tuple[np.ndarray, np.ndarray]],
+    mean: np.ndarray | None,
+    scale: np.ndarray | None,
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Fold (x - mean) / scale into the first Linear layer:
+    W0 @ ((x - mean) / scale) + b0 == (W0 / scale) @ x + (b0 - (W0 / scale) @ mean)
+    """
+    w0, b0 = layers[0]
+    w0 = np.asarray(w0, dtype=np.float64)
+    b0 = np.asarray(b0, dtype=np.float64)
+
+    if scale is not None:
+        w0 = w0 / np.asarray(scale, dtype=np.float64)
+    if mean is not None:
+        b0 = b0 - w0 @ np.asarray(mean, dtype=np.float64)
+
+    rest = [
+        (np.asarray(w, dtype=np.float64), np.asarray(b, dtype=np.float64))
+        for w, b in layers[1:]
+    ]
+    return [(w0, b0), *rest]
+
+
+class NumpyDirectionNet:
+    """
+    Pure-NumPy forward pass of the direction MLP:
+    Linear → ReLU → ... → Linear → Sigmoid, scaler already folded in.
+    """
+
+    def __init__(self, layers: list[tuple[np.ndarray, np.ndarray]]):
+        # Stored transposed so a batch is X @ W + b
+        self.layers = [(np.ascontiguousarray(w.T), b) for w, b in layers]
+
+    @classmethod
+    def load(cls, path: Path, expected_digest: str | None = None) -> "NumpyDirectionNet | None":
+        """
+        None when the bundle is missing or was exported from
+        another checkpoint.
+        """
+        if not path.exists():
+            return None
+
+        with np.load(path) as bundle:
+            if expected_digest and str(bundle["source_digest"]) != expected_digest:
+                return None
+
+            n_layers = int(bundle["n_layers"])
+            layers = [(bundle[f"w{i}"], bundle[f"b{i}"]) for i in range(n_layers)]
+
+        return cls(layers)
+
+    @property
+    def input_dim(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(w.nbytes + b.nbytes for w, b in self.layers)
+
+    def __call__(self, features: np.ndarray) -> np.ndarray:
+        h = np.asarray(features, dtype=np.float64)
+
+        for w, b in self.layers[:-1]:
+            h = np.maximum(h @ w + b, 0.0)
+
+        w, b = self.layers[-1]
+        z = (h @ w + b).ravel()
+        return np.exp(-np.logaddexp(0.0, -z))  # overflow-safe sigmoid
+
+
+def save_bundle(
+    path: Path,
+    layers: list[tuple[np.ndarray, np.ndarray]],
+    digest: str,
+) -> None:
+    arrays = {"n_layers": np.array(len(layers)), "source_digest": np.array(digest)}
+    for i, (w, b) in enumerate(layers):
+        arrays[f"w{i}"] = w
+        arrays[f"b{i}"] = b
+
+    tmp = path.with_suffix(".tmp.npz")
+    np.savez(tmp, **arrays)
+    tmp.replace(path)
@@ -0,0 +1,111 @@
+# models/registry.py
+
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+from models.direction import DirectionModel
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of per-symbol DirectionModels.
+
+    Each symbol's weights, scaler and metadata are loaded once and the
+    same instance is handed to every caller, so treat it as read-only.
+    Idle models are evicted least-recently-used first once more than
+    `max_models` are cached. A model still held by a caller is
+    re-adopted instead of reloaded.
+
+    The cap is a count, not bytes: the weights are a few KB, and the
+    real footprint (torch modules, scaler, metadata, allocator
+    buffers) is roughly constant per model and not measurable.
+    """
+
+    _shared = None  # 🔑 singleton
+
+    def __init__(self, root: str = "models", max_models: int = 32):
+        self.root = Path(root)
+        self.max_models = max(1, int(max_models))
+
+        self._models: OrderedDict[str, DirectionModel] = OrderedDict()
+        self._alive: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._metadata: dict[str, dict | None] = {}
+        self._lock = threading.RLock()
+
+        self.loads = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls, max_models: int | None = None) -> "ModelRegistry":
+        if cls._shared is None:
+            cls._shared = cls()
+        if max_models is not None:
+            cls._shared.max_models = max(1, int(max_models))
+            with cls._shared._lock:
+                cls._shared._evict_over_cap()
+        return cls._shared
+
+    # ----------------------------------
+    def folder(self, symbol: str) -> Path:
+        return self.root / symbol.replace("/", "_")
+
+    def metadata(self, symbol: str) -> dict | None:
+        """
+        Parsed metadata.json, read from disk once. None if missing
+        or unreadable.
+        """
+        with self._lock:
+            if symbol not in self._metadata:
+                path = self.folder(symbol) / "metadata.json"
+                try:
+                    self._metadata[symbol] = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    self._metadata[symbol] = None
+            return self._metadata[symbol]
+
+    def quality_metrics(self, symbol: str) -> dict | None:
+        metadata = self.metadata(symbol)
+        return None if metadata is None else metadata.get("metrics", {})
+
+    # ----------------------------------
+    def get(self, symbol: str) -> DirectionModel:
+        with self._lock:
+            model = self._models.get(symbol)
+            if model is None:
+                model = self._alive.get(symbol)
+
+            if model is None:
+                model = DirectionModel.for_symbol(symbol, metadata=self.metadata(symbol))
+                self._alive[symbol] = model
+                self.loads += 1
+
+            self._models[symbol] = model
+            self._models.move_to_end(symbol)
+
+            self._evict_over_cap()
+            return model
+
+    def invalidate(self, symbol: str) -> None:
+        """
+        Forget a symbol after its files changed on disk.
+        """
+        with self._lock:
+            self._models.pop(symbol, None)
+            self._alive.pop(symbol, None)
+            self._metadata.pop(symbol, None)
+
+    @property
+    def resident_bytes(self) -> int:
+        """
+        Weights + scaler of the cached models (informational).
+        """
+        return sum(m.nbytes for m in self._models.values())
+
+    def _evict_over_cap(self) -> None:
+        # The most recent model is last, so it is never the one dropped
+        while len(self._models) > self.max_models:
+            self._models.popitem(last=False)
+            self.evictions += 1
@@ -39,7 +39,10 @@ def main():
         risk_per_trade=settings.risk_per_trade,
     )
 
-    runner.run_loop(sleep_seconds=settings.sleep_seconds)
+    runner.run_loop(
+        sleep_seconds=settings.sleep_seconds,
+        settle_seconds=settings.bar_settle_seconds,
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+# tests/test_async_fetcher.py
+
+import asyncio
+import threading
+
+from data.async_fetcher import AsyncMarketDataFetcher
+from data.candle_store import CandleStore
+from data.rate_limiter import AsyncRateLimiter
+
+TF_MS = 15 * 60 * 1000
+NOW = 10_000 * TF_MS + 60_000
+
+
+class FakeExchange:
+    def parse_timeframe(self, timeframe: str) -> int:
+        return TF_MS // 1000
+
+    def milliseconds(self) -> int:
+        return NOW
+
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        start = since if since is not None else NOW - NOW % TF_MS - (limit - 1) * TF_MS
+        return [
+            [t, 1.0, 2.0, 0.5, 1.5, 10.0]
+            for t in range(start, NOW + 1, TF_MS)
+        ][:limit]
+
+
+class RecordingStore(CandleStore):
+    """
+    Records the thread every store call runs on.
+    """
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.threads: set[int] = set()
+
+    def load(self, symbol, timeframe):
+        self.threads.add(threading.get_ident())
+        return super().load(symbol, timeframe)
+
+    def write(self, symbol, timeframe, bars):
+        self.threads.add(threading.get_ident())
+        return super().write(symbol, timeframe, bars)
+
+
+def make_fetcher(tmp_path) -> AsyncMarketDataFetcher:
+    fetcher = AsyncMarketDataFetcher.__new__(AsyncMarketDataFetcher)
+    fetcher.exchange = FakeExchange()
+    fetcher.limiter = AsyncRateLimiter(0)
+    fetcher.store = RecordingStore(str(tmp_path))
+    fetcher.max_concurrency = 4
+    return fetcher
+
+
+def test_store_io_stays_off_the_event_loop(tmp_path):
+    fetcher = make_fetcher(tmp_path)
+
+    async def fetch_twice():
+        loop_thread = threading.get_ident()
+        symbols = ["BTC/USDT", "ETH/USDT"]
+        first = await fetcher.fetch_many_async(symbols, "15m", limit=50)
+        again = await fetcher.fetch_many_async(symbols, "15m", limit=50)
+        return loop_thread, first, again
+
+    loop_thread, first, again = asyncio.run(fetch_twice())
+
+    assert fetcher.store.threads
+    assert loop_thread not in fetcher.store.threads
+    for frames in (first, again):
+        assert set(frames) == {"BTC/USDT", "ETH/USDT"}
+        assert all(len(df) == 50 for df in frames.values())
+        assert all(int(df["time"].iloc[-1]) == NOW - NOW % TF_MS for df in frames.values())
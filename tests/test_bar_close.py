@@ -0,0 +1,125 @@
+# tests/test_bar_close.py
+
+import numpy as np
+import pandas as pd
+
+from execution.multi_runner import MultiSymbolTradingSystem
+from execution.runner import CYCLE_NOT_READY, CYCLE_PROCESSED, TradingRunner
+from execution.scheduler import BarCloseScheduler
+
+TF_MS = 15 * 60 * 1000
+SYMBOL = "ETH/USDT"
+
+
+def bars(last_open: int, count: int = 50) -> pd.DataFrame:
+    times = np.arange(last_open - (count - 1) * TF_MS, last_open + 1, TF_MS)
+    close = np.linspace(100.0, 110.0, count)
+    return pd.DataFrame({
+        "time": times,
+        "open": close,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": 1.0,
+    })
+
+
+class LastRow:
+    def sync(self, closed: pd.DataFrame, forming: int = 0) -> dict:
+        return closed.iloc[-1].to_dict()
+
+
+def make_runner() -> TradingRunner:
+    # Only the new-bar bookkeeping of run_once is exercised
+    runner = TradingRunner.__new__(TradingRunner)
+    runner.symbol = SYMBOL
+    runner.timeframe = "15m"
+    runner.lookback = 50
+    runner.features = LastRow()
+    runner.last_bar_time = None
+    runner.processed_cycles = 0
+    runner.skipped_cycles = 0
+    runner.not_ready_cycles = 0
+    runner._owns_btc_context = False
+    runner.decisions = []
+    runner.process_bar = lambda row, now: runner.decisions.append(int(row["time"]))
+    return runner
+
+
+class FakeFetcher:
+    """
+    Serves bars up to `published`, the last bar the exchange has out.
+    """
+
+    def __init__(self, published: int):
+        self.published = published
+
+    def fetch_many(self, symbols, timeframe, limit=500):
+        return {s: bars(self.published) for s in symbols}
+
+
+def make_system(runner: TradingRunner, fetcher: FakeFetcher) -> MultiSymbolTradingSystem:
+    system = MultiSymbolTradingSystem.__new__(MultiSymbolTradingSystem)
+    system.settings = type("Settings", (), {"lookback": 50})()
+    system.runners = {SYMBOL: runner}
+    system.fetcher = fetcher
+    system.btc_context = None
+    system.scheduler = BarCloseScheduler(settle_seconds=3.0, retry_seconds=5.0)
+    system.scheduler.add(SYMBOL, "15m")
+    return system
+
+
+def test_run_once_reports_a_late_bar_as_not_ready():
+    runner = make_runner()
+    bar = 1_000 * TF_MS
+    now = bar + TF_MS + 3_000
+
+    assert runner.run_once(df=bars(bar - TF_MS), now_ms=now) == CYCLE_NOT_READY
+    assert runner.decisions == []
+
+    assert runner.run_once(df=bars(bar), now_ms=now + 5_000) == CYCLE_PROCESSED
+    assert runner.decisions == [bar]
+
+
+def test_late_published_bar_is_retried_not_dropped():
+    runner = make_runner()
+    bar = 1_000 * TF_MS
+    fetcher = FakeFetcher(published=bar - TF_MS)    # newest bar not out yet
+    system = make_system(runner, fetcher)
+    scheduler = system.scheduler
+
+    now = bar + TF_MS + 3_000
+    due = scheduler.due(now)
+    assert due == [SYMBOL]
+    system._dispatch(due, now)
+    assert runner.decisions == []
+
+    # Still inside the backoff: not due
+    assert scheduler.due(now + 1_000) == []
+
+    fetcher.published = bar
+    now += 5_000
+    due = scheduler.due(now)
+    assert due == [SYMBOL]
+    system._dispatch(due, now)
+    assert runner.decisions == [bar]
+
+    # Handled: nothing more until the next close
+    assert scheduler.due(now + 60_000) == []
+
+
+def test_failing_runner_does_not_starve_the_others():
+    bar = 1_000 * TF_MS
+    good, bad = make_runner(), make_runner()
+    bad.run_once = lambda df=None, now_ms=None: 1 / 0
+
+    system = make_system(good, FakeFetcher(published=bar))
+    system.runners = {"BAD/USDT": bad, SYMBOL: good}
+    system.scheduler.add("BAD/USDT", "15m")
+
+    now = bar + TF_MS + 3_000
+    due = system.scheduler.due(now)
+    system._dispatch(due, now)
+
+    assert good.decisions == [bar]
+    assert system.scheduler.due(now + 5_000) == ["BAD/USDT"]
@@ -0,0 +1,76 @@
+# tests/test_btc_context.py
+
+import numpy as np
+import pandas as pd
+
+from execution.btc_context import BTCContextModel, BTCContextService
+from features.parity import synthetic_ohlcv
+from features.technicals import compute_core_features
+from models.ensemble import EnsembleDirectionModel
+
+TF_MS = 15 * 60 * 1000
+FEATURED = compute_core_features(synthetic_ohlcv(400, seed=1), backend="numpy")
+
+
+class ConstantModel:
+    feature_columns = ["ema_fast", "ema_slow", "rsi", "ret", "vol", "atr_pct", "adx"]
+
+    def __init__(self, prob: float):
+        self.prob = prob
+
+    def predict_proba(self, df) -> float:
+        return self.prob
+
+    def predict_proba_series(self, data) -> np.ndarray:
+        return np.full(len(data), self.prob)
+
+
+def refreshed_service(bars: int = 400) -> tuple[BTCContextService, int]:
+    service = BTCContextService("15m", model=ConstantModel(0.8))
+    df = synthetic_ohlcv(bars)
+    last_open = int(df["time"].iloc[-1])
+    service.refresh(df, now_ms=last_open + TF_MS + 1_000)
+    return service, last_open
+
+
+def decision_row(time: int) -> pd.DataFrame:
+    """
+    A featured alt bar opening at `time`.
+    """
+    row = FEATURED.iloc[[-1]].copy()
+    row["time"] = time
+    return row
+
+
+def test_snapshot_serves_its_own_bar():
+    service, last_open = refreshed_service()
+    model = BTCContextModel(service)
+
+    assert service.latest.time == last_open
+    assert model.predict_proba(decision_row(last_open)) == 0.8
+
+
+def test_stale_snapshot_reads_neutral():
+    service, last_open = refreshed_service()
+    model = BTCContextModel(service)
+
+    # BTC fetch failed / bar late: the alt decides the next bar
+    assert model.predict_proba(decision_row(last_open + TF_MS)) == BTCContextModel.NEUTRAL
+
+
+def test_missing_snapshot_reads_neutral():
+    service = BTCContextService("15m", model=ConstantModel(0.8))
+    model = BTCContextModel(service)
+
+    assert model.predict_proba(decision_row(1_000 * TF_MS)) == BTCContextModel.NEUTRAL
+
+
+def test_ensemble_decision_uses_the_bar_time():
+    service, last_open = refreshed_service()
+    ensemble = EnsembleDirectionModel([ConstantModel(0.6), BTCContextModel(service)])
+
+    fresh = ensemble.predict_proba(decision_row(last_open))
+    stale = ensemble.predict_proba(decision_row(last_open + TF_MS))
+
+    assert fresh > stale
+    assert 0.5 < stale < 0.6
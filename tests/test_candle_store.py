@@ -0,0 +1,69 @@
+# tests/test_candle_store.py
+
+import multiprocessing
+
+import numpy as np
+
+from data.candle_store import CandleStore
+
+SYMBOL = "BTC/USDT"
+TF_MS = 15 * 60 * 1000
+WORKERS = 4
+ROUNDS = 25
+
+
+def bars(times: np.ndarray) -> np.ndarray:
+    price = 100.0 + times / TF_MS
+    return np.column_stack([times, price, price + 1, price - 1, price, np.ones(len(times))])
+
+
+def write_interleaved(root: str, worker: int) -> None:
+    """
+    Every worker owns every WORKERS-th bar and writes them newest
+    round first, so most writes land before stored bars and force
+    a merge-and-rewrite.
+    """
+    store = CandleStore(root)
+    for r in reversed(range(ROUNDS)):
+        times = np.array([(r * WORKERS + worker) * TF_MS], dtype=np.float64)
+        store.write(SYMBOL, "15m", bars(times))
+
+
+def mark_pages(root: str, worker: int) -> None:
+    from data.history import _PageLedger
+
+    fetcher = type("Fetcher", (), {"store": CandleStore(root)})()
+    ledger = _PageLedger(fetcher, SYMBOL, "15m")
+    for r in range(ROUNDS):
+        ledger.mark(r * WORKERS + worker)
+
+
+def run_workers(target, root: str) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=target, args=(root, w)) for w in range(WORKERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(timeout=120)
+        assert p.exitcode == 0
+
+
+def test_concurrent_processes_lose_no_bars(tmp_path):
+    run_workers(write_interleaved, str(tmp_path))
+
+    stored = CandleStore(str(tmp_path)).read(SYMBOL, "15m")
+    expected = np.arange(WORKERS * ROUNDS) * TF_MS
+    np.testing.assert_array_equal(stored["time"].to_numpy(), expected)
+
+
+def test_concurrent_processes_lose_no_ledger_pages(tmp_path):
+    from data.history import _PageLedger
+
+    store = CandleStore(str(tmp_path))
+    store.write(SYMBOL, "15m", bars(np.array([0.0])))
+
+    run_workers(mark_pages, str(tmp_path))
+
+    fetcher = type("Fetcher", (), {"store": store})()
+    ledger = _PageLedger(fetcher, SYMBOL, "15m")
+    assert ledger.pages == set(range(WORKERS * ROUNDS))
@@ -0,0 +1,179 @@
+# tests/test_exits.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.exits import ExitRules, simulate_long_trades
+from features.parity import synthetic_ohlcv
+
+
+def reference_trades(df: pd.DataFrame, signal: np.ndarray, rules: ExitRules) -> pd.DataFrame:
+    """
+    Per-bar loop: enter at the close of a signal bar when flat, then
+    walk bar by bar: stop / trailing first, then take-profit, then the
+    time exit; only flat bars after the exit bar can enter again.
+    """
+    o, h, l, c = (df[k].to_numpy(dtype=np.float64) for k in ("open", "high", "low", "close"))
+    n = len(c)
+    trades = []
+
+    i = 0
+    while i < n:
+        if not signal[i]:
+            i += 1
+            continue
+
+        entry = c[i]
+        fixed = entry * (1 - rules.stop_loss_pct) if rules.stop_loss_pct is not None else -np.inf
+        target = entry * (1 + rules.take_profit_pct) if rules.take_profit_pct is not None else None
+        peak = entry
+        exit_index, exit_price, reason = n - 1, c[n - 1], "end"
+
+        for j in range(i + 1, n):
+            level, trailing = fixed, False
+            if rules.trailing_pct is not None:
+                trail = peak * (1 - rules.trailing_pct)
+                trailing = trail > fixed
+                level = max(fixed, trail)
+
+            if l[j] <= level:
+                exit_index, exit_price = j, min(o[j], level)
+                reason = "trailing" if trailing else "stop"
+                break
+            if target is not None and h[j] >= target:
+                exit_index, exit_price, reason = j, max(o[j], target), "take_profit"
+                break
+            if j - i == rules.max_bars:
+                exit_index, exit_price, reason = j, c[j], "time"
+                break
+            peak = max(peak, h[j])
+
+        if exit_index > i:
+            trades.append({
+                "entry_index": i,
+                "exit_index": exit_index,
+                "entry_price": entry,
+                "exit_price": exit_price,
+                "reason": reason,
+            })
+        i = exit_index + 1
+
+    return pd.DataFrame(trades, columns=["entry_index", "exit_index", "entry_price", "exit_price", "reason"])
+
+
+def bars(rows: list[tuple[float, float, float, float]]) -> pd.DataFrame:
+    o, h, l, c = map(np.array, zip(*rows))
+    return pd.DataFrame({"open": o, "high": h, "low": l, "close": c})
+
+
+def only_first(n: int) -> np.ndarray:
+    signal = np.zeros(n, dtype=bool)
+    signal[0] = True
+    return signal
+
+
+def assert_matches_reference(df: pd.DataFrame, signal: np.ndarray, rules: ExitRules) -> pd.DataFrame:
+    got = simulate_long_trades(df, signal, rules)
+    expected = reference_trades(df, signal, rules)
+
+    assert len(got) == len(expected)
+    for col in ("entry_index", "exit_index"):
+        np.testing.assert_array_equal(got[col].to_numpy(), expected[col].to_numpy())
+    for col in ("entry_price", "exit_price"):
+        np.testing.assert_allclose(got[col].to_numpy(dtype=float), expected[col].to_numpy(dtype=float))
+    assert list(got["reason"]) == list(expected["reason"])
+    return got
+
+
+def test_stop_wins_a_bar_that_touches_both_levels():
+    rules = ExitRules(trailing_pct=None, stop_loss_pct=0.01, take_profit_pct=0.01)
+    df = bars([
+        (100, 100, 100, 100),
+        (100, 101.5, 98.5, 100),    # through the target and the stop
+    ])
+
+    trade = assert_matches_reference(df, only_first(2), rules).iloc[0]
+    assert trade["reason"] == "stop"
+    assert trade["exit_price"] == pytest.approx(99.0)
+
+
+def test_gap_through_the_stop_fills_at_the_open():
+    rules = ExitRules(trailing_pct=None, stop_loss_pct=0.01)
+    df = bars([
+        (100, 100, 100, 100),
+        (100, 100.5, 99.5, 100),
+        (97, 97.5, 96, 97),         # opens below 99
+    ])
+
+    trade = assert_matches_reference(df, only_first(3), rules).iloc[0]
+    assert (trade["exit_index"], trade["reason"]) == (2, "stop")
+    assert trade["exit_price"] == pytest.approx(97.0)
+
+
+def test_gap_through_the_target_fills_at_the_open():
+    rules = ExitRules(trailing_pct=None, stop_loss_pct=0.01, take_profit_pct=0.02)
+    df = bars([
+        (100, 100, 100, 100),
+        (104, 105, 103.5, 104),     # opens above 102
+    ])
+
+    trade = assert_matches_reference(df, only_first(2), rules).iloc[0]
+    assert trade["reason"] == "take_profit"
+    assert trade["exit_price"] == pytest.approx(104.0)
+
+
+def test_trailing_stop_ratchets_on_prior_highs():
+    rules = ExitRules(trailing_pct=0.01, stop_loss_pct=0.02)
+    df = bars([
+        (100, 100, 100, 100),
+        (100, 103, 100, 103),       # peak 103: trail 101.97 from the next bar on
+        (103, 106, 102.5, 105),     # peak 106: this bar still uses 101.97
+        (105, 105.5, 104.5, 105),   # trail 104.94 > low 104.5
+    ])
+
+    trade = assert_matches_reference(df, only_first(4), rules).iloc[0]
+    assert (trade["exit_index"], trade["reason"]) == (3, "trailing")
+    assert trade["exit_price"] == pytest.approx(106 * 0.99)
+
+
+def test_time_exit_after_max_bars():
+    rules = ExitRules(trailing_pct=None, stop_loss_pct=0.05, max_bars=3)
+    df = bars([(100, 100.5, 99.5, 100 + k * 0.1) for k in range(6)])
+
+    trade = assert_matches_reference(df, only_first(6), rules).iloc[0]
+    assert (trade["exit_index"], trade["reason"]) == (3, "time")
+    assert trade["exit_price"] == pytest.approx(100.3)
+
+
+def test_open_position_closes_at_the_end_of_data():
+    rules = ExitRules(trailing_pct=None, stop_loss_pct=0.05, max_bars=10)
+    df = bars([(100, 100.5, 99.5, 100)] * 4)
+
+    trade = assert_matches_reference(df, only_first(4), rules).iloc[0]
+    assert (trade["exit_index"], trade["reason"]) == (3, "end")
+
+
+def test_entries_never_overlap():
+    rules = ExitRules(trailing_pct=None, stop_loss_pct=0.05, max_bars=3)
+    df = bars([(100, 100.5, 99.5, 100)] * 12)
+    signal = np.ones(12, dtype=bool)
+
+    trades = assert_matches_reference(df, signal, rules)
+    assert list(trades["entry_index"]) == [0, 4, 8]
+    assert list(trades["exit_index"]) == [3, 7, 11]
+
+
+@pytest.mark.parametrize("rules", [
+    ExitRules(),
+    ExitRules(trailing_pct=None, stop_loss_pct=0.01, take_profit_pct=0.015, max_bars=40),
+    ExitRules(trailing_pct=0.005, stop_loss_pct=None, take_profit_pct=0.02, max_bars=20),
+    ExitRules(trailing_pct=0.004, stop_loss_pct=0.003, max_bars=8),
+])
+@pytest.mark.parametrize("seed", [0, 1])
+def test_random_paths_match_the_per_bar_loop(rules, seed):
+    df = synthetic_ohlcv(3_000, seed=seed)
+    signal = np.random.default_rng(seed).random(len(df)) < 0.05
+
+    trades = assert_matches_reference(df, signal, rules)
+    assert len(trades) > 20
@@ -0,0 +1,107 @@
+# tests/test_feature_parity.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.parity import (
+    TOLERANCE,
+    TOLERANCE_FLOAT32,
+    max_rel_error,
+    streaming_frame,
+    synthetic_ohlcv,
+)
+from features.streaming import StreamingFeatures
+from features.technicals import CORE_FEATURE_COLUMNS, compute_core_features
+
+OHLCV = ["time", "open", "high", "low", "close", "volume"]
+
+# Around the warm-up edge (no rows / first rows) and well past it
+WINDOWS = [150, 199, 200, 201, 220, 300, 1500]
+
+HISTORIES = {
+    "random_walk": synthetic_ohlcv(1500, seed=1),
+    "flat_tail": synthetic_ohlcv(1500, seed=2, flat_from=700),
+    "flat": synthetic_ohlcv(1500, seed=3, flat_from=0),
+}
+
+
+def reference(df: pd.DataFrame) -> pd.DataFrame:
+    return compute_core_features(df).reset_index(drop=True)
+
+
+@pytest.mark.parametrize("name", list(HISTORIES))
+@pytest.mark.parametrize("bars", WINDOWS)
+def test_numpy_backend_matches_ta(name, bars):
+    window = HISTORIES[name].tail(bars).reset_index(drop=True)
+    expected = reference(window)
+    got = compute_core_features(window, backend="numpy").reset_index(drop=True)
+
+    if expected.empty:
+        assert got.empty
+        return
+
+    errors = max_rel_error(expected, got)
+    assert max(errors.values()) <= TOLERANCE, errors
+
+
+@pytest.mark.parametrize("name", list(HISTORIES))
+def test_numpy_backend_float32_matches_ta(name):
+    from features.numpy_technicals import compute_core_features_numpy
+
+    df = HISTORIES[name]
+    got = compute_core_features_numpy(df, dtype=np.float32).reset_index(drop=True)
+
+    errors = max_rel_error(reference(df), got)
+    assert max(errors.values()) <= TOLERANCE_FLOAT32, errors
+
+
+@pytest.mark.parametrize("name", list(HISTORIES))
+def test_streaming_matches_ta(name):
+    df = HISTORIES[name]
+    errors = max_rel_error(reference(df), streaming_frame(df))
+    assert max(errors.values()) <= TOLERANCE, errors
+
+
+def test_streaming_emits_nothing_before_warmup():
+    df = HISTORIES["random_walk"]
+    warmup = len(df) - len(reference(df))
+
+    engine = StreamingFeatures()
+    rows = [engine.update(bar) for bar in df[OHLCV].itertuples(index=False)]
+
+    assert all(row is None for row in rows[:warmup])
+    assert rows[warmup] is not None
+
+
+def test_streaming_seeded_from_history_continues_exactly():
+    df = HISTORIES["random_walk"]
+    expected = reference(df).set_index("time")
+
+    engine = StreamingFeatures.from_history(df.iloc[:1000])
+    for bar in df.iloc[1000:][OHLCV].itertuples(index=False):
+        row = engine.update(bar)
+        ref = expected.loc[row["time"], CORE_FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        got = np.array([row[c] for c in CORE_FEATURE_COLUMNS], dtype=np.float64)
+        np.testing.assert_allclose(got, ref, rtol=TOLERANCE, atol=TOLERANCE, equal_nan=True)
+
+
+@pytest.mark.parametrize("name", list(HISTORIES))
+@pytest.mark.parametrize("window", [30, 199, 200, 301])
+def test_sliding_windows_match_per_window_ta(name, window):
+    from features.numpy_technicals import sliding_core_features
+
+    df = HISTORIES[name].iloc[:window + 40]
+    got = sliding_core_features(df, window)
+
+    assert list(got.rows) == list(range(window - 1, len(df)))
+    for i, end in enumerate(got.rows + 1):
+        expected = reference(df.iloc[end - window : end])
+        values = got.values[i]
+        if expected.empty or expected["time"].iloc[-1] != df["time"].iloc[end - 1]:
+            # The backend drops this window's last row
+            assert not np.isfinite(values).all()
+            continue
+
+        ref = expected[CORE_FEATURE_COLUMNS].iloc[-1].to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(values, ref, rtol=TOLERANCE, atol=TOLERANCE)
@@ -0,0 +1,99 @@
+# tests/test_feature_store.py
+
+import json
+
+from features.parity import synthetic_ohlcv
+from features.store import FeatureStore
+from features.technicals import CORE_FEATURE_COLUMNS
+
+SYMBOL = "BTC/USDT"
+COLUMNS = ["ema_fast", "ema_slow", "rsi", "ret", "vol", "atr_pct", "adx"]
+
+
+def test_same_history_reuses_the_entry(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    df = synthetic_ohlcv(600)
+
+    first = store.get(df, SYMBOL, "15m", COLUMNS)
+    again = store.get(df.copy(), SYMBOL, "15m", COLUMNS)
+
+    assert again.key == first.key
+    assert len(store.entries()) == 1
+
+
+def test_corrected_history_with_same_range_is_rebuilt(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    df = synthetic_ohlcv(600)
+    original = store.get(df, SYMBOL, "15m", COLUMNS)
+
+    corrected = df.copy()
+    corrected.loc[500, ["close", "high"]] *= 1.05
+    rebuilt = store.get(corrected, SYMBOL, "15m", COLUMNS)
+
+    assert rebuilt.key != original.key
+    assert rebuilt.meta["first_time"] == original.meta["first_time"]
+    assert rebuilt.meta["last_time"] == original.meta["last_time"]
+
+    row = CORE_FEATURE_COLUMNS.index("ema_fast") + 6
+    assert not (rebuilt.frame[:, row] == original.frame[:, row]).all()
+
+
+def _age(store: FeatureStore, key: str, created: str) -> None:
+    meta_path = next(store.root.glob(f"*/*{key}/meta.json"))
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["created_at_utc"] = created
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+
+def test_prune_keeps_newest_and_protected(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    df = synthetic_ohlcv(800)
+
+    keys = []
+    for day, end in enumerate((500, 600, 700, 800), start=1):
+        entry = store.get(df.iloc[:end], SYMBOL, "15m", COLUMNS)
+        _age(store, entry.key, f"2026-01-0{day}T00:00:00+00:00")
+        keys.append(entry.key)
+
+    deleted = store.prune(keep=2, protect={keys[0]})
+
+    assert deleted == [keys[1]]
+    assert {m["key"] for m in store.entries()} == {keys[0], keys[2], keys[3]}
+    assert store.load(SYMBOL, "15m", keys[1]) is None
+
+
+def test_prune_by_age(tmp_path):
+    store = FeatureStore(str(tmp_path))
+    df = synthetic_ohlcv(600)
+
+    old = store.get(df.iloc[:500], SYMBOL, "15m", COLUMNS)
+    _age(store, old.key, "2020-01-01T00:00:00+00:00")
+    fresh = store.get(df, SYMBOL, "15m", COLUMNS)
+
+    assert store.prune(max_age_days=30) == [old.key]
+    assert [m["key"] for m in store.entries()] == [fresh.key]
+
+
+def test_building_an_entry_hashes_the_history_once(tmp_path, monkeypatch):
+    import features.cache as cache_module
+    import features.store as store_module
+
+    digest = cache_module.ohlcv_digest
+    calls = []
+
+    def counting_digest(df):
+        calls.append(len(df))
+        return digest(df)
+
+    monkeypatch.setattr(cache_module.FeatureCache, "_shared", cache_module.FeatureCache())
+    monkeypatch.setattr(store_module, "ohlcv_digest", counting_digest)
+    monkeypatch.setattr(cache_module, "ohlcv_digest", counting_digest)
+
+    store = FeatureStore(str(tmp_path))
+    df = synthetic_ohlcv(600)
+
+    store.get(df, SYMBOL, "15m", COLUMNS)
+    assert len(calls) == 1
+
+    store.get_labels(df, SYMBOL, "15m", horizons=[5], multipliers=[0.8])
+    assert len(calls) == 2
@@ -0,0 +1,67 @@
+# tests/test_history.py
+
+import pytest
+
+from data.candle_store import CandleStore
+from data.history import _PageLedger, fetch_history
+
+SYMBOL = "BTC/USDT"
+TF_MS = 15 * 60 * 1000
+PAGE_LIMIT = 10
+PAGE_MS = PAGE_LIMIT * TF_MS
+NOW = 100 * PAGE_MS + 5_000
+
+
+class FakeExchange:
+    rateLimit = 0
+
+    def parse_timeframe(self, timeframe: str) -> int:
+        return TF_MS // 1000
+
+    def milliseconds(self) -> int:
+        return NOW
+
+
+class FakeFetcher:
+    """
+    Serves full pages, except that starts in `failing` raise.
+    """
+
+    PAGE_LIMIT = PAGE_LIMIT
+
+    def __init__(self, root: str, failing: set[int] = frozenset()):
+        self.exchange = FakeExchange()
+        self.store = CandleStore(root)
+        self.failing = set(failing)
+        self.requested: list[int] = []
+
+    def fetch_page(self, symbol, timeframe, since, limit=None, retries=3, limiter=None):
+        self.requested.append(since)
+        if since in self.failing:
+            raise ConnectionError(f"page {since} failed")
+        return [[since + i * TF_MS, 1.0, 2.0, 0.5, 1.5, 1.0] for i in range(PAGE_LIMIT)]
+
+
+def test_failed_page_keeps_every_other_page(tmp_path):
+    since = 90 * PAGE_MS
+    failing = 92 * PAGE_MS
+    fetcher = FakeFetcher(str(tmp_path), failing={failing})
+
+    with pytest.raises(RuntimeError):
+        fetch_history(SYMBOL, "15m", since=since, fetcher=fetcher, workers=3)
+
+    stored = set(fetcher.store.read(SYMBOL, "15m")["time"] // PAGE_MS * PAGE_MS)
+    expected = set(range(since, 100 * PAGE_MS, PAGE_MS)) - {failing}
+    assert stored == expected
+
+    ledger = _PageLedger(fetcher, SYMBOL, "15m")
+    assert ledger.pages == expected
+
+    # Resume: only the failed page is fetched again
+    fetcher.failing.clear()
+    fetcher.requested.clear()
+    df = fetch_history(SYMBOL, "15m", since=since, fetcher=fetcher, workers=3)
+
+    assert fetcher.requested == [failing]
+    assert len(df) == 10 * PAGE_LIMIT
+    assert (df["time"].diff().dropna() == TF_MS).all()
@@ -0,0 +1,57 @@
+# tests/test_model_registry.py
+
+import gc
+
+import models.registry as registry_module
+from models.registry import ModelRegistry
+
+
+class FakeModel:
+    nbytes = 1024
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+
+    @classmethod
+    def for_symbol(cls, symbol: str, metadata: dict | None = None) -> "FakeModel":
+        return cls(symbol)
+
+
+def make_registry(monkeypatch, tmp_path, max_models: int) -> ModelRegistry:
+    monkeypatch.setattr(registry_module, "DirectionModel", FakeModel)
+    return ModelRegistry(root=str(tmp_path), max_models=max_models)
+
+
+def test_evicts_least_recently_used_over_cap(monkeypatch, tmp_path):
+    registry = make_registry(monkeypatch, tmp_path, max_models=2)
+
+    registry.get("A/USDT")
+    registry.get("B/USDT")
+    registry.get("A/USDT")          # B is now the least recently used
+    registry.get("C/USDT")
+
+    assert list(registry._models) == ["A/USDT", "C/USDT"]
+    assert registry.evictions == 1
+    assert registry.loads == 3
+
+
+def test_evicted_model_is_reloaded_once_released(monkeypatch, tmp_path):
+    registry = make_registry(monkeypatch, tmp_path, max_models=1)
+
+    registry.get("A/USDT")
+    registry.get("B/USDT")          # evicts A, nobody holds it
+    gc.collect()
+
+    registry.get("A/USDT")
+    assert registry.loads == 3
+    assert registry.evictions == 2
+
+
+def test_evicted_model_still_held_is_readopted(monkeypatch, tmp_path):
+    registry = make_registry(monkeypatch, tmp_path, max_models=1)
+
+    held = registry.get("A/USDT")
+    registry.get("B/USDT")
+
+    assert registry.get("A/USDT") is held
+    assert registry.loads == 2
@@ -0,0 +1,105 @@
+# tests/test_promotion_gate.py
+
+import io
+
+import numpy as np
+import torch
+
+from train.train_direction_model import DirectionNet, promotion_gate, validation_metrics
+
+
+def synthetic_split(rows: int = 2000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, 4)).astype(np.float32)
+    y = (X[:, 0] > 0).astype(np.float32).reshape(-1, 1)
+    return X, y
+
+
+def linear_model(sign: float) -> DirectionNet:
+    """
+    Single-layer net scoring sign * feature 0: +1 is near perfect on
+    synthetic_split, -1 is the same model with its weights flipped.
+    """
+    model = DirectionNet(input_dim=4, hidden=())
+    with torch.no_grad():
+        model.net[0].weight.zero_()
+        model.net[0].weight[0, 0] = 5.0 * sign
+        model.net[0].bias.zero_()
+    return model
+
+
+def scores(model, X, y) -> dict:
+    return validation_metrics("TEST", model, X, y, verbose=False)
+
+
+def test_known_worse_model_is_rejected():
+    X, y = synthetic_split()
+    saved = scores(linear_model(+1.0), X, y)
+    candidate = scores(linear_model(-1.0), X, y)
+
+    assert candidate["val_f1"] < saved["val_f1"]
+    assert not promotion_gate(candidate, saved)
+
+
+def test_better_model_is_promoted():
+    X, y = synthetic_split()
+    saved = scores(linear_model(-1.0), X, y)
+    candidate = scores(linear_model(+1.0), X, y)
+
+    assert promotion_gate(candidate, saved)
+
+
+def test_same_model_passes_and_tolerance_applies():
+    X, y = synthetic_split()
+    saved = scores(linear_model(+1.0), X, y)
+    slightly_worse = {m: v - 0.01 for m, v in saved.items()}
+
+    assert promotion_gate(saved, saved)
+    assert not promotion_gate(slightly_worse, saved)
+    assert promotion_gate(slightly_worse, saved, tolerance=0.02)
+
+
+def test_warm_start_split_is_seeded_and_keeps_the_gate_unseen():
+    from train.train_direction_model import PURGE_BARS, RECENT_BARS, warm_start_split
+
+    n = RECENT_BARS + 5_000
+    split = warm_start_split(n)
+    again = warm_start_split(n)
+
+    np.testing.assert_array_equal(split.train_rows, again.train_rows)
+    assert split.replay_rows > 0
+
+    train_end = split.train_rows.max() + 1
+    assert split.stop.start - train_end >= PURGE_BARS
+    assert split.gate.start - split.stop.stop >= PURGE_BARS
+    assert split.gate.stop == n
+    assert split.stop.stop > split.stop.start
+    assert split.gate.stop > split.gate.start
+
+
+def test_incremental_refresh_is_reproducible(tmp_path, monkeypatch):
+    import train.train_direction_model as trainer
+    from features.parity import synthetic_ohlcv
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(trainer, "RECENT_BARS", 1_500)
+    monkeypatch.setattr(trainer, "promotion_gate", lambda candidate, baseline: True)
+    df = synthetic_ohlcv(3_000, seed=7)
+
+    trainer.train_for_symbol("TEST/USDT", df)
+    saved = (tmp_path / "models/TEST_USDT/model.pt").read_bytes()
+
+    states = []
+    for _ in range(2):
+        (tmp_path / "models/TEST_USDT/model.pt").write_bytes(saved)
+        trainer.retrain_incremental("TEST/USDT", df)
+        states.append(torch.load(tmp_path / "models/TEST_USDT/model.pt"))
+
+    original = trainer.DirectionNet(input_dim=7)
+    original.load_state_dict(torch.load(io.BytesIO(saved)))
+    assert any(
+        not torch.equal(tensor, states[0][name])
+        for name, tensor in original.state_dict().items()
+    )
+    for name, tensor in states[0].items():
+        assert torch.equal(tensor, states[1][name]), name
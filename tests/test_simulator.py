@@ -0,0 +1,104 @@
+# tests/test_simulator.py
+
+import numpy as np
+import pandas as pd
+import pytest
+import ta
+
+import backtest.simulator as simulator_module
+from backtest.simulator import HistoricalSimulator
+from features.parity import synthetic_ohlcv
+from features.technicals import compute_core_features
+
+LOOKBACK = 300
+
+
+class FakeModel:
+    """
+    prob_up = rsi / 100: longs above 40, shorts below 25.
+    """
+
+    feature_columns = ["ema_fast", "ema_slow", "rsi", "ret", "vol", "atr_pct", "adx"]
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def predict_proba_series(self, features: np.ndarray) -> np.ndarray:
+        return np.asarray(features, dtype=np.float64)[:, 2] / 100
+
+    def predict_proba(self, df: pd.DataFrame) -> float:
+        featured = compute_core_features(df)
+        if featured.empty:
+            return 0.5
+        # float32 inputs, as DirectionModel feeds its network
+        return float(np.float32(featured["rsi"].iloc[-1])) / 100
+
+
+def make_simulator(monkeypatch) -> HistoricalSimulator:
+    monkeypatch.setattr(simulator_module, "DirectionModel", FakeModel)
+    return HistoricalSimulator("model.pt", "scaler.save", lookback=LOOKBACK)
+
+
+def baseline_loop(sim: HistoricalSimulator, df: pd.DataFrame) -> None:
+    """
+    The original per-window step(): ta indicators and predict_proba
+    recomputed on every df.iloc[i - lookback : i + 1].
+    """
+    for i in range(sim.lookback, len(df)):
+        window = df.iloc[i - sim.lookback : i + 1].copy()
+        prob_up = sim.model.predict_proba(window)
+        ema200 = ta.trend.EMAIndicator(window["close"], 200).ema_indicator().iloc[-1]
+        atr = ta.volatility.AverageTrueRange(
+            window["high"], window["low"], window["close"], 14
+        ).average_true_range().iloc[-1]
+
+        sim._decide(
+            pd.to_datetime(window["time"].iloc[-1], unit="ms").date(),
+            window["close"].iloc[-1],
+            ema200,
+            atr,
+            prob_up,
+        )
+
+
+def assert_same_ledger(got: list[dict], expected: list[dict]) -> None:
+    assert len(got) == len(expected)
+    got, expected = pd.DataFrame(got), pd.DataFrame(expected)
+    assert (got["side"] == expected["side"]).all()
+    for col in ("entry_price", "exit_price", "pnl", "balance", "prob_up_entry"):
+        np.testing.assert_allclose(got[col], expected[col], rtol=1e-9)
+
+
+def test_run_matches_the_windowed_baseline(monkeypatch):
+    df = synthetic_ohlcv(650, seed=4)
+
+    reference = make_simulator(monkeypatch)
+    baseline_loop(reference, df)
+
+    sim = make_simulator(monkeypatch)
+    sim.run(df)
+
+    assert len(reference.trades) > 5
+    assert {t["side"] for t in reference.trades} == {"LONG", "SHORT"}
+    assert_same_ledger(sim.trades, reference.trades)
+
+
+def test_step_matches_run(monkeypatch):
+    df = synthetic_ohlcv(600, seed=6)
+
+    stepped = make_simulator(monkeypatch)
+    for i in range(stepped.lookback, len(df)):
+        stepped.step(df.iloc[i - stepped.lookback : i + 1])
+
+    sim = make_simulator(monkeypatch)
+    sim.run(df)
+
+    assert len(sim.trades) > 0
+    assert_same_ledger(stepped.trades, sim.trades)
+
+
+def test_short_history_does_nothing(monkeypatch):
+    sim = make_simulator(monkeypatch)
+    sim.run(synthetic_ohlcv(LOOKBACK))
+
+    assert sim.trades == []
@@ -0,0 +1,115 @@
+# tests/test_sweep.py
+
+import math
+
+import pytest
+
+from features.parity import synthetic_ohlcv
+from features.store import FeatureStore
+from train.sweep import (
+    FEATURE_SETS,
+    PRUNE_WARMUP_EPOCHS,
+    SEARCH_SPACE,
+    grid,
+    median_curve,
+    record,
+    run_trial,
+    sample,
+    should_prune,
+)
+from train.train_direction_model import ATR_MULTIPLIER, HORIZON, TIMEFRAME
+
+SYMBOL = "TEST/USDT"
+CONFIG = {
+    "hidden": (8,),
+    "lr": 1e-3,
+    "batch_size": 256,
+    "epochs": 6,
+    "purge_bars": 10,
+    "features": "stationary",
+}
+
+
+def test_median_curve_per_epoch():
+    curves = [[1.0, 0.8, 0.6], [2.0, 1.0], [3.0, 1.2, 0.4]]
+
+    assert median_curve(curves, min_trials=2) == [2.0, 1.0, 0.5]
+
+
+def test_median_curve_needs_min_trials_per_epoch():
+    curves = [[1.0, 0.8, 0.6], [2.0, 1.0], [3.0, 1.2]]
+
+    medians = median_curve(curves, min_trials=3)
+    assert medians[:2] == [2.0, 1.0]
+    assert math.isinf(medians[2])   # only one trial got this far
+
+    assert all(math.isinf(m) for m in median_curve(curves, min_trials=4))
+    assert median_curve([], min_trials=1) == []
+
+
+def test_prune_rule_waits_for_the_warm_up():
+    medians = [0.0] * 10
+
+    for epoch in range(PRUNE_WARMUP_EPOCHS - 1):
+        assert not should_prune(epoch, 1.0, medians)
+    assert should_prune(PRUNE_WARMUP_EPOCHS - 1, 1.0, medians)
+
+
+def test_prune_rule_compares_against_the_same_epoch():
+    epoch = PRUNE_WARMUP_EPOCHS
+    medians = [0.5] * (epoch + 1)
+
+    assert should_prune(epoch, 0.6, medians)
+    assert not should_prune(epoch, 0.5, medians)
+    assert not should_prune(epoch, 0.4, medians)
+    assert not should_prune(epoch + 1, 9.9, medians)               # past the medians
+    assert not should_prune(epoch, 9.9, [float("inf")] * (epoch + 1))
+
+
+def test_pruned_trials_stay_out_of_the_median_pool():
+    curves = []
+
+    kept = record({"trial": 0, "pruned": False, "curve": [1.0, 0.9]}, curves)
+    cut = record({"trial": 1, "pruned": True, "curve": [5.0, 5.0, 5.0]}, curves)
+
+    assert curves == [[1.0, 0.9]]
+    assert "curve" not in kept and "curve" not in cut
+
+
+def test_sample_is_deterministic():
+    first = sample(SEARCH_SPACE, 20, seed=3)
+
+    assert first == sample(SEARCH_SPACE, 20, seed=3)
+    assert first != sample(SEARCH_SPACE, 20, seed=4)
+    assert len(first) == 20
+    assert all(config in grid(SEARCH_SPACE) for config in first)
+    assert sample(SEARCH_SPACE, None) == grid(SEARCH_SPACE)
+
+
+@pytest.fixture(scope="module")
+def stored_entry(tmp_path_factory):
+    root = str(tmp_path_factory.mktemp("features"))
+    columns = list(dict.fromkeys(c for cols in FEATURE_SETS.values() for c in cols))
+    entry = FeatureStore(root).get(
+        synthetic_ohlcv(2_000, seed=2), SYMBOL, TIMEFRAME, columns, HORIZON, ATR_MULTIPLIER
+    )
+    return root, entry.key
+
+
+def test_trial_is_pruned_right_after_the_warm_up(stored_entry):
+    root, key = stored_entry
+
+    row = run_trial(0, CONFIG, root, SYMBOL, key, median_curve=[0.0] * CONFIG["epochs"])
+
+    assert row["pruned"]
+    assert row["epochs_run"] == PRUNE_WARMUP_EPOCHS
+    assert len(row["curve"]) == PRUNE_WARMUP_EPOCHS
+
+
+def test_trial_without_medians_runs_to_the_end(stored_entry):
+    root, key = stored_entry
+
+    row = run_trial(0, CONFIG, root, SYMBOL, key, median_curve=[float("inf")] * CONFIG["epochs"])
+
+    assert not row["pruned"]
+    assert len(row["curve"]) == row["epochs_run"]
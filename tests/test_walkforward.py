@@ -0,0 +1,62 @@
+# tests/test_walkforward.py
+
+import json
+
+import pytest
+
+from backtest.vector_engine import VectorBacktestEngine
+from backtest.walkforward import Fold, make_folds, purged_split, signal_gates
+from models.registry import ModelRegistry
+from train.train_direction_model import HORIZON, PURGE_BARS
+
+
+def test_folds_roll_by_the_test_size():
+    folds = make_folds(rows=20_000, train_size=8_000, test_size=3_000)
+
+    assert [f.index for f in folds] == [1, 2, 3, 4]
+    assert folds[0] == Fold(1, 0, 8_000, 8_000, 11_000)
+    for prev, fold in zip(folds, folds[1:]):
+        assert fold.train_start == prev.train_start + 3_000
+        assert fold.test_start == prev.test_end
+    for fold in folds:
+        assert fold.train_end - fold.train_start == 8_000
+        assert fold.test_start == fold.train_end
+    assert folds[-1].test_end <= 20_000
+
+
+def test_too_few_rows_make_no_folds():
+    assert make_folds(rows=10_999, train_size=8_000, test_size=3_000) == []
+    assert len(make_folds(rows=11_000, train_size=8_000, test_size=3_000)) == 1
+
+
+@pytest.mark.parametrize("purge", [HORIZON, PURGE_BARS, 50])
+def test_purged_split_keeps_labels_out_of_the_next_part(purge):
+    for fold in make_folds(rows=20_000, train_size=8_000, test_size=3_000):
+        fit_end, split, usable_end = purged_split(fold, purge)
+
+        assert fold.train_start < fit_end < split < usable_end < fold.test_start
+        assert split - fit_end == purge
+        assert fold.test_start - usable_end == purge
+        # labels look HORIZON bars ahead: the last fit / val labels stay
+        # before the next part's first bar
+        assert fit_end - 1 + HORIZON < split
+        assert usable_end - 1 + HORIZON < fold.test_start
+
+
+def test_signal_gates_follow_the_engine(tmp_path, monkeypatch):
+    registry = ModelRegistry(root=str(tmp_path))
+    monkeypatch.setattr(ModelRegistry, "_shared", registry)
+
+    folder = registry.folder("TUNED/USDT")
+    folder.mkdir(parents=True)
+    (folder / "metadata.json").write_text(json.dumps({
+        "optimized_long_threshold": 0.58,
+        "optimized_gates": {"atr_floor": 0.002, "adx_floor": 12.0},
+    }))
+
+    assert signal_gates("TUNED/USDT") == (0.58, 0.002, 12.0)
+
+    long_threshold, atr_floor, adx_floor = signal_gates("UNTUNED/USDT")
+    assert 0.40 <= long_threshold <= 0.65
+    assert atr_floor == VectorBacktestEngine.ATR_FLOOR
+    assert adx_floor == VectorBacktestEngine.ADX_FLOOR
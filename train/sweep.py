@@ -0,0 +1,275 @@
+#train/sweep.py
+
+import itertools
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import torch
+from sklearn.preprocessing import StandardScaler
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from data.history import fetch_history
+from features.store import DEFAULT_STORE_DIR, FeatureStore
+from train.train_direction_model import (
+    ATR_MULTIPLIER,
+    CANDLES,
+    FEATURE_COLUMNS,
+    HORIZON,
+    TIMEFRAME,
+    TRAIN_SPLIT,
+    DirectionNet,
+    fit_model,
+    limit_torch_threads,
+    validation_metrics,
+)
+
+
+# =========================
+# CONFIG
+# =========================
+SYMBOL = "BTC/USDT"
+N_TRIALS = None           # None = full grid, else a random sample of it
+WORKERS = None            # default: one single-threaded trial per core
+RESULTS_PATH = "data_outputs/sweep_results.csv"
+
+FEATURE_SETS = {
+    "core": FEATURE_COLUMNS,
+    "core+ema200": FEATURE_COLUMNS + ["ema200"],
+    "stationary": ["rsi", "ret", "vol", "atr_pct", "adx"],
+}
+
+SEARCH_SPACE = {
+    "hidden": [(16, 8), (32, 16), (64, 32), (64, 32, 16)],
+    "lr": [3e-4, 1e-3, 3e-3],
+    "batch_size": [128, 256, 1024],
+    "epochs": [10, 20],
+    "purge_bars": [10, 24],
+    "features": list(FEATURE_SETS),
+}
+
+# Median pruning: stop a trial whose validation loss is worse than the
+# median of finished trials at the same epoch
+PRUNE_WARMUP_EPOCHS = 3
+PRUNE_MIN_TRIALS = 5
+
+
+def grid(space: dict) -> list[dict]:
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*space.values())]
+
+
+def sample(space: dict, n: int | None, seed: int = 0) -> list[dict]:
+    configs = grid(space)
+    if n is None or n >= len(configs):
+        return configs
+    picks = np.random.default_rng(seed).choice(len(configs), size=n, replace=False)
+    return [configs[i] for i in sorted(picks)]
+
+
+def should_prune(epoch: int, val_loss: float, medians: list[float]) -> bool:
+    """
+    Median rule for one epoch: never during the warm-up epochs or
+    past the end of `medians`, else prune when worse than the median.
+    """
+    if epoch + 1 < PRUNE_WARMUP_EPOCHS or epoch >= len(medians):
+        return False
+    return val_loss > medians[epoch]
+
+
+# =========================
+# TRIAL (worker process)
+# =========================
+def run_trial(
+    trial: int,
+    config: dict,
+    store_root: str,
+    symbol: str,
+    key: str,
+    median_curve: list[float],
+    seed: int = 0,
+) -> dict:
+    """
+    Train and validate one configuration on the stored feature
+    matrix, with the same purged split as train_for_symbol.
+    """
+    started = time.perf_counter()
+    torch.manual_seed(seed + trial)
+
+    entry = FeatureStore(store_root).load(symbol, TIMEFRAME, key)
+    columns = entry.meta["feature_columns"]
+    idx = [columns.index(c) for c in FEATURE_SETS[config["features"]]]
+
+    X = entry.X[: entry.labeled][:, idx]
+    y = entry.y[: entry.labeled].reshape(-1, 1)
+
+    split_idx = int(len(X) * TRAIN_SPLIT)
+    train_end = max(0, split_idx - config["purge_bars"])
+
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X[:train_end])
+    X_val = scaler.transform(X[split_idx:])
+
+    curve: list[float] = []
+    pruned = False
+
+    def on_epoch(epoch: int, val_loss: float) -> bool:
+        nonlocal pruned
+        curve.append(val_loss)
+        pruned = should_prune(epoch, val_loss, median_curve)
+        return pruned
+
+    model = DirectionNet(input_dim=len(idx), hidden=tuple(config["hidden"]))
+    epochs = fit_model(
+        f"trial {trial}",
+        model,
+        X_train,
+        y[:train_end],
+        X_val,
+        y[split_idx:],
+        epochs=config["epochs"],
+        lr=config["lr"],
+        batch_size=config["batch_size"],
+        verbose=False,
+        on_epoch=on_epoch,
+    )
+    metrics = validation_metrics(f"trial {trial}", model, X_val, y[split_idx:], verbose=False)
+
+    return {
+        "trial": trial,
+        **config,
+        "hidden": "x".join(str(h) for h in config["hidden"]),
+        "epochs_run": epochs,
+        "pruned": pruned,
+        "best_val_loss": min(curve),
+        **metrics,
+        "seconds": time.perf_counter() - started,
+        "curve": curve,
+    }
+
+
+# =========================
+# DRIVER
+# =========================
+def median_curve(curves: list[list[float]], min_trials: int = PRUNE_MIN_TRIALS) -> list[float]:
+    """
+    Per-epoch median validation loss over finished trials. Epochs
+    reached by fewer than `min_trials` of them never prune (inf).
+    """
+    longest = max((len(c) for c in curves), default=0)
+    medians = []
+    for epoch in range(longest):
+        values = [c[epoch] for c in curves if len(c) > epoch]
+        medians.append(float(np.median(values)) if len(values) >= min_trials else float("inf"))
+    return medians
+
+
+def record(row: dict, curves: list[list[float]]) -> dict:
+    """
+    Strip the loss curve off a trial result; only trials that were
+    not pruned add theirs to `curves` (the median pool).
+    """
+    curve = row.pop("curve")
+    if not row["pruned"]:
+        curves.append(curve)
+    return row
+
+
+def sweep(
+    symbol: str,
+    df: pd.DataFrame,
+    space: dict = SEARCH_SPACE,
+    n_trials: int | None = N_TRIALS,
+    workers: int | None = WORKERS,
+    prune: bool = True,
+    results_path: str | None = RESULTS_PATH,
+    store_root: str = DEFAULT_STORE_DIR,
+    seed: int = 0,
+) -> pd.DataFrame:
+    """
+    Run every sampled configuration across a process pool.
+
+    The feature matrix is built once into the feature store, with the
+    union of all feature sets, and each worker maps it read-only.
+    Trials are handed out one at a time as workers free up, so each
+    new trial is pruned against the curves finished so far. Every
+    result row is appended to `results_path` as it arrives, tagged
+    with this sweep's start time, so an interrupted sweep keeps what
+    it finished.
+    """
+    columns = list(dict.fromkeys(c for cols in FEATURE_SETS.values() for c in cols))
+    entry = FeatureStore(store_root).get(df, symbol, TIMEFRAME, columns, HORIZON, ATR_MULTIPLIER)
+
+    configs = sample(space, n_trials, seed)
+    workers = workers or os.cpu_count() or 1
+    print(f"[SWEEP] {symbol}: {len(configs)} trials on {workers} worker(s)")
+
+    if results_path:
+        Path(results_path).parent.mkdir(parents=True, exist_ok=True)
+    sweep_id = time.strftime("%Y%m%dT%H%M%S")
+
+    rows, curves = [], []
+    pending = list(enumerate(configs))
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=limit_torch_threads,
+        initargs=(1,),
+    ) as pool:
+        running = set()
+        while pending or running:
+            while pending and len(running) < workers:
+                trial, config = pending.pop(0)
+                medians = median_curve(curves) if prune else []
+                running.add(
+                    pool.submit(run_trial, trial, config, store_root, symbol, entry.key, medians, seed)
+                )
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    row = future.result()
+                except Exception as e:
+                    print(f"❌ Trial failed: {e}")
+                    continue
+
+                rows.append(record(row, curves))
+
+                if results_path:
+                    pd.DataFrame([{"sweep": sweep_id, **row}]).to_csv(
+                        results_path, mode="a", header=not os.path.exists(results_path), index=False
+                    )
+
+                status = "✂️ pruned" if row["pruned"] else f"F1={row['val_f1']:.3f}"
+                print(
+                    f"[{len(rows)}/{len(configs)}] trial {row['trial']} | "
+                    f"loss={row['best_val_loss']:.4f} | {status} | {row['seconds']:.1f}s"
+                )
+
+    print(f"⏱️ {len(rows)} trials in {time.perf_counter() - started:.1f}s")
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values("best_val_loss").reset_index(drop=True)
+
+
+def main():
+    df = fetch_history(SYMBOL, TIMEFRAME, candles=CANDLES)
+    results = sweep(SYMBOL, df)
+
+    print("\n===== TOP 10 =====")
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print(results.head(10).round(4).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
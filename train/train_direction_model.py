@@ -1,17 +1,19 @@
 #train/train_direction_model.py
 
+import multiprocessing
 import os
-import json
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import NamedTuple
 
 import torch
 import joblib
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from torch.utils.data import DataLoader, TensorDataset, WeightedRandomSampler
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 if str(BASE_DIR) not in sys.path:
@@ -19,11 +21,20 @@ if str(BASE_DIR) not in sys.path:
 
 
 def _load_project_modules():
-    from data.fetcher import MarketDataFetcher
-    from features.technicals import compute_core_features
+    from data.history import fetch_history
+    from features.store import FeatureStore
+    from models.export_numpy import export_numpy_bundle
+    from models.metadata import write_metadata
     from models.model_identity import MODEL_NAME, MODEL_VERSION
 
-    return MarketDataFetcher, compute_core_features, MODEL_NAME, MODEL_VERSION
+    return (
+        fetch_history,
+        FeatureStore,
+        export_numpy_bundle,
+        write_metadata,
+        MODEL_NAME,
+        MODEL_VERSION,
+    )
 
 
 # =========================
@@ -37,11 +48,23 @@ ATR_MULTIPLIER = 0.8      # ATR-based dynamic target
 
 EPOCHS = 10
 BATCH_SIZE = 256
+VAL_CHUNK = 65_536        # validation rows per forward pass (None = all at once)
 LR = 1e-3
 TRAIN_SPLIT = 0.8
 EARLY_STOPPING_PATIENCE = 3
 PURGE_BARS = 10           # leakage protection
 
+# Warm-start refresh (retrain_incremental)
+INCREMENTAL = False       # main(): fine-tune the saved models instead of training from scratch
+RECENT_BARS = 8_000       # newest labeled bars to fine-tune and validate on
+REPLAY_RATIO = 0.5        # older rows replayed per recent training row
+INCREMENTAL_EPOCHS = 5
+INCREMENTAL_LR = 3e-4
+INCREMENTAL_SEED = 0      # replay sample + batch draws: same data, same refresh
+STOPPING_SPLIT = 0.5      # share of the recent validation rows used for early stopping
+PROMOTION_METRICS = ["val_f1", "val_accuracy"]
+PROMOTION_TOLERANCE = 0.0  # a candidate may trail the saved metrics by this much
+
 FEATURE_COLUMNS = [
     "ema_fast",
     "ema_slow",
@@ -65,69 +88,109 @@ SYMBOLS = [
     "DOGE/USDT",
 ]
 
+WORKERS = None            # training processes; default: cores / THREADS_PER_WORKER
+THREADS_PER_WORKER = 1    # torch intra-op threads per process
+PREFETCH = 1              # download threads feeding the pool
+
 
 # =========================
 # MODEL
 # =========================
 class DirectionNet(torch.nn.Module):
-    def __init__(self, input_dim: int):
+    def __init__(self, input_dim: int, hidden: tuple[int, ...] = (32, 16)):
         super().__init__()
-        self.net = torch.nn.Sequential(
-            torch.nn.Linear(input_dim, 32),
-            torch.nn.ReLU(),
-            torch.nn.Linear(32, 16),
-            torch.nn.ReLU(),
-            torch.nn.Linear(16, 1),
-            torch.nn.Sigmoid(),
-        )
+        layers = []
+        for width in hidden:
+            layers += [torch.nn.Linear(input_dim, width), torch.nn.ReLU()]
+            input_dim = width
+        self.net = torch.nn.Sequential(*layers, torch.nn.Linear(input_dim, 1), torch.nn.Sigmoid())
 
     def forward(self, x):
         return self.net(x)
 
 
-# =========================
-# TRAINING
-# =========================
-def train_for_symbol(symbol: str):
-    MarketDataFetcher, compute_core_features, MODEL_NAME, MODEL_VERSION = _load_project_modules()
-    print(f"\n🚀 Training {MODEL_NAME} {MODEL_VERSION} for {symbol}")
-
-    fetcher = MarketDataFetcher()
-    df = fetcher.fetch_ohlcv(symbol, TIMEFRAME, limit=CANDLES)
-
-    df = compute_core_features(df)
-
-    # -------------------------
-    # ATR-based classification target
-    # -------------------------
-    df["future_close"] = df["close"].shift(-HORIZON)
-    df["atr_future"] = df["atr"] * ATR_MULTIPLIER
-
-    df["target"] = (
-        (df["future_close"] - df["close"]) > df["atr_future"]
-    ).astype(int)
-
-    df.dropna(inplace=True)
-
-    X = df[FEATURE_COLUMNS].values.astype(np.float32)
-    y = df["target"].values.astype(np.float32).reshape(-1, 1)
+class WeightedBatches:
+    """
+    In-memory replacement for DataLoader + WeightedRandomSampler.
+
+    Each epoch draws all sample indices with replacement in one
+    multinomial call (the same draw WeightedRandomSampler makes),
+    then slices batches straight out of the tensors, with no
+    per-sample collation.
+    """
+
+    def __init__(
+        self,
+        X: torch.Tensor,
+        y: torch.Tensor,
+        weights: np.ndarray,
+        batch_size: int,
+        generator: torch.Generator | None = None,
+    ):
+        self.X = X
+        self.y = y
+        self.weights = torch.as_tensor(weights, dtype=torch.double)
+        self.batch_size = batch_size
+        self.generator = generator
+
+    def __len__(self) -> int:
+        return -(-len(self.weights) // self.batch_size)
+
+    def __iter__(self):
+        idx = torch.multinomial(
+            self.weights, len(self.weights), replacement=True, generator=self.generator
+        )
+        X, y = self.X[idx], self.y[idx]
 
-    # -------------------------
-    # Train / Validation split with purge gap
-    # -------------------------
-    split_idx = int(len(df) * TRAIN_SPLIT)
-    train_end = max(0, split_idx - PURGE_BARS)
+        for start in range(0, len(idx), self.batch_size):
+            yield X[start : start + self.batch_size], y[start : start + self.batch_size]
 
-    X_train = X[:train_end]
-    y_train = y[:train_end]
 
-    X_val = X[split_idx:]
-    y_val = y[split_idx:]
+def predict_chunked(model: torch.nn.Module, X: torch.Tensor, chunk: int | None = VAL_CHUNK) -> torch.Tensor:
+    """
+    Forward pass over `X` in chunks of `chunk` rows (no grad).
+    """
+    with torch.no_grad():
+        if chunk is None or len(X) <= chunk:
+            return model(X)
+        return torch.cat([model(X[i : i + chunk]) for i in range(0, len(X), chunk)])
 
-    scaler = StandardScaler()
-    X_train = scaler.fit_transform(X_train)
-    X_val = scaler.transform(X_val)
 
+# =========================
+# TRAINING
+# =========================
+def load_history(symbol: str):
+    fetch_history = _load_project_modules()[0]
+    return fetch_history(symbol, TIMEFRAME, candles=CANDLES)
+
+
+def _timed_load(symbol: str):
+    started = time.perf_counter()
+    df = load_history(symbol)
+    return df, time.perf_counter() - started
+
+
+def fit_model(
+    symbol: str,
+    model: torch.nn.Module,
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    epochs: int = EPOCHS,
+    lr: float = LR,
+    batch_size: int = BATCH_SIZE,
+    verbose: bool = True,
+    on_epoch=None,
+    generator: torch.Generator | None = None,
+) -> int:
+    """
+    Class-balanced training with early stopping on validation loss.
+    `model` ends up with its best-epoch weights. Returns the number
+    of epochs run. `on_epoch(epoch, val_loss)` is called after every
+    epoch; returning True stops training (used to prune sweeps).
+    `generator` seeds the batch draws.
+    """
     X_train_tensor = torch.tensor(X_train, dtype=torch.float32)
     y_train_tensor = torch.tensor(y_train, dtype=torch.float32)
     X_val_tensor = torch.tensor(X_val, dtype=torch.float32)
@@ -136,8 +199,7 @@ def train_for_symbol(symbol: str):
     # -------------------------
     # Handle class imbalance
     # -------------------------
-    train_dataset = TensorDataset(X_train_tensor, y_train_tensor)
-    y_train_flat = y_train.flatten()
+    y_train_flat = np.asarray(y_train).flatten()
     class_counts = np.bincount(y_train_flat.astype(int), minlength=2)
 
     if class_counts.min() == 0:
@@ -149,32 +211,29 @@ def train_for_symbol(symbol: str):
         1.0 / class_counts[0],
     )
 
-    sampler = WeightedRandomSampler(
-        weights=torch.tensor(sample_weights, dtype=torch.float32),
-        num_samples=len(sample_weights),
-        replacement=True,
-    )
-
-    loader = DataLoader(
-        train_dataset,
-        batch_size=BATCH_SIZE,
-        sampler=sampler,
+    loader = WeightedBatches(
+        X_train_tensor,
+        y_train_tensor,
+        weights=sample_weights,
+        batch_size=batch_size,
+        generator=generator,
     )
 
     # -------------------------
     # Model training
     # -------------------------
-    model = DirectionNet(input_dim=len(FEATURE_COLUMNS))
-    optimizer = torch.optim.Adam(model.parameters(), lr=LR)
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
     loss_fn = torch.nn.BCELoss()
 
     best_state = None
     best_val_loss = float("inf")
     no_improve_epochs = 0
+    epochs_run = 0
 
-    for epoch in range(EPOCHS):
+    for epoch in range(epochs):
+        epochs_run = epoch + 1
         model.train()
-        total_loss = 0.0
+        total_loss = torch.zeros(())
 
         for xb, yb in loader:
             optimizer.zero_grad()
@@ -182,18 +241,20 @@ def train_for_symbol(symbol: str):
             loss = loss_fn(preds, yb)
             loss.backward()
             optimizer.step()
-            total_loss += loss.item()
+            total_loss += loss.detach()
+
+        total_loss = total_loss.item()
 
         model.eval()
-        with torch.no_grad():
-            val_preds = model(X_val_tensor)
-            val_loss = loss_fn(val_preds, y_val_tensor).item()
+        val_preds = predict_chunked(model, X_val_tensor)
+        val_loss = loss_fn(val_preds, y_val_tensor).item()
 
-        print(
-            f"Epoch {epoch+1}/{EPOCHS} | "
-            f"TrainLoss={total_loss:.4f} | "
-            f"ValLoss={val_loss:.4f}"
-        )
+        if verbose:
+            print(
+                f"{symbol} | Epoch {epoch+1}/{epochs} | "
+                f"TrainLoss={total_loss:.4f} | "
+                f"ValLoss={val_loss:.4f}"
+            )
 
         if val_loss < best_val_loss:
             best_val_loss = val_loss
@@ -202,22 +263,32 @@ def train_for_symbol(symbol: str):
         else:
             no_improve_epochs += 1
 
+        if on_epoch is not None and on_epoch(epoch, val_loss):
+            break
+
         if no_improve_epochs >= EARLY_STOPPING_PATIENCE:
-            print("Early stopping triggered.")
+            if verbose:
+                print(f"{symbol} | Early stopping triggered.")
             break
 
     if best_state is not None:
         model.load_state_dict(best_state)
 
-    # -------------------------
-    # Validation metrics
-    # -------------------------
+    return epochs_run
+
+
+def validation_metrics(
+    symbol: str,
+    model: torch.nn.Module,
+    X_val: np.ndarray,
+    y_val: np.ndarray,
+    verbose: bool = True,
+) -> dict:
     model.eval()
-    with torch.no_grad():
-        val_probs = model(X_val_tensor).numpy().flatten()
+    val_probs = predict_chunked(model, torch.tensor(X_val, dtype=torch.float32)).numpy().flatten()
 
     val_pred_labels = (val_probs >= 0.5).astype(int)
-    y_val_labels = y_val.flatten().astype(int)
+    y_val_labels = np.asarray(y_val).flatten().astype(int)
 
     metrics = {
         "val_accuracy": float(accuracy_score(y_val_labels, val_pred_labels)),
@@ -227,13 +298,76 @@ def train_for_symbol(symbol: str):
         "val_positive_rate": float(val_pred_labels.mean()),
     }
 
+    if not verbose:
+        return metrics
+
     print(
-        "Validation | "
+        f"{symbol} | Validation | "
         f"Acc={metrics['val_accuracy']:.3f} "
         f"Prec={metrics['val_precision']:.3f} "
         f"Rec={metrics['val_recall']:.3f} "
         f"F1={metrics['val_f1']:.3f}"
     )
+    return metrics
+
+
+def train_for_symbol(symbol: str, df=None) -> dict:
+    """
+    Train, validate and save one symbol. `df` is its raw OHLCV
+    history if already fetched. Returns per-stage timings and the
+    validation metrics.
+    """
+    (
+        fetch_history,
+        FeatureStore,
+        export_numpy_bundle,
+        write_metadata,
+        MODEL_NAME,
+        MODEL_VERSION,
+    ) = _load_project_modules()
+    print(f"\n🚀 Training {MODEL_NAME} {MODEL_VERSION} for {symbol}")
+
+    timings = {}
+    started = time.perf_counter()
+
+    if df is None:
+        df = fetch_history(symbol, TIMEFRAME, candles=CANDLES)
+        timings["fetch_s"] = time.perf_counter() - started
+
+    # -------------------------
+    # Features + ATR-based classification target, from the feature
+    # store (built once per data range / feature set / label spec)
+    # -------------------------
+    mark = time.perf_counter()
+    entry = FeatureStore().get(df, symbol, TIMEFRAME, FEATURE_COLUMNS, HORIZON, ATR_MULTIPLIER)
+
+    X = entry.X[: entry.labeled]
+    y = entry.y[: entry.labeled].reshape(-1, 1)
+
+    # -------------------------
+    # Train / Validation split with purge gap
+    # -------------------------
+    split_idx = int(len(X) * TRAIN_SPLIT)
+    train_end = max(0, split_idx - PURGE_BARS)
+
+    X_train = X[:train_end]
+    y_train = y[:train_end]
+
+    X_val = X[split_idx:]
+    y_val = y[split_idx:]
+
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    X_val = scaler.transform(X_val)
+
+    timings["features_s"] = time.perf_counter() - mark
+    mark = time.perf_counter()
+
+    model = DirectionNet(input_dim=len(FEATURE_COLUMNS))
+    epochs_run = fit_model(symbol, model, X_train, y_train, X_val, y_val)
+    metrics = validation_metrics(symbol, model, X_val, y_val)
+
+    timings["train_s"] = time.perf_counter() - mark
 
     # -------------------------
     # SAVE
@@ -254,22 +388,325 @@ def train_for_symbol(symbol: str):
         "timeframe": TIMEFRAME,
         "train_rows": int(len(X_train)),
         "val_rows": int(len(X_val)),
+        "val_start_time": int(entry.frame[split_idx, 0]),
+        "feature_store_key": entry.key,
         "trained_at_utc": datetime.now(timezone.utc).isoformat(),
         "metrics": metrics,
     }
 
-    with open(f"{folder}/metadata.json", "w", encoding="utf-8") as f:
-        json.dump(metadata, f, indent=2)
+    write_metadata(f"{folder}/metadata.json", metadata)
+
+    # Torch-free runtime used by the live path
+    export_numpy_bundle(f"{folder}/model.pt", f"{folder}/scaler.save")
 
     print(f"✅ Saved {MODEL_NAME} {MODEL_VERSION} to {folder}")
 
+    return {
+        "symbol": symbol,
+        **timings,
+        "epochs": epochs_run,
+        "total_s": time.perf_counter() - started,
+        "val_f1": metrics["val_f1"],
+    }
+
+
+def promotion_gate(
+    candidate: dict,
+    baseline: dict,
+    metrics: list[str] = PROMOTION_METRICS,
+    tolerance: float = PROMOTION_TOLERANCE,
+) -> bool:
+    """
+    True when no metric of `candidate` trails `baseline` by more than
+    `tolerance`. Both must be scored on the same validation rows.
+    """
+    return all(candidate[m] >= baseline[m] - tolerance for m in metrics)
+
+
+class WarmStartSplit(NamedTuple):
+    train_rows: np.ndarray  # replayed older rows, then the recent training rows
+    replay_rows: int
+    stop: slice             # early stopping
+    gate: slice             # promotion gate, never seen while training
+
+
+def warm_start_split(n: int, seed: int = INCREMENTAL_SEED) -> WarmStartSplit:
+    """
+    Row layout of a warm-start refresh over `n` labeled rows: the
+    newest RECENT_BARS rows are train | purge | early stopping |
+    purge | gate; older rows are replayed into training, sampled
+    with `seed`.
+    """
+    start = max(0, n - RECENT_BARS)
+    split_idx = start + int((n - start) * TRAIN_SPLIT)
+    train_end = max(start, split_idx - PURGE_BARS)
+    gate_idx = split_idx + int((n - split_idx) * STOPPING_SPLIT)
+    stop_end = max(split_idx, gate_idx - PURGE_BARS)
+
+    rng = np.random.default_rng(seed)
+    n_replay = min(start, int(REPLAY_RATIO * (train_end - start)))
+    replay = np.sort(rng.choice(start, size=n_replay, replace=False))
+
+    return WarmStartSplit(
+        train_rows=np.concatenate([replay, np.arange(start, train_end)]),
+        replay_rows=n_replay,
+        stop=slice(split_idx, stop_end),
+        gate=slice(gate_idx, n),
+    )
+
+
+def retrain_incremental(symbol: str, df=None) -> dict:
+    """
+    Warm-start refresh of a saved model.
+
+    Fine-tunes model.pt (with its saved scaler) on the newest
+    RECENT_BARS rows plus a seeded replay sample of older rows. The
+    recent validation rows are split in two, purge gaps between all
+    parts: early stopping sees the first part only, and the saved model
+    and the candidate are both scored on the held-out rest, where the
+    candidate must pass promotion_gate. Symbols without a saved model
+    are trained from scratch.
+    """
+    (
+        fetch_history,
+        FeatureStore,
+        export_numpy_bundle,
+        write_metadata,
+        MODEL_NAME,
+        MODEL_VERSION,
+    ) = _load_project_modules()
+    from models.metadata import read_metadata
+
+    folder = f"models/{symbol.replace('/', '_')}"
+    metadata = read_metadata(f"{folder}/metadata.json")
+    if metadata is None or not os.path.exists(f"{folder}/model.pt"):
+        print(f"⚠️ {symbol}: no saved model, training from scratch")
+        return train_for_symbol(symbol, df)
+
+    print(f"\n🔁 Refreshing {MODEL_NAME} {MODEL_VERSION} for {symbol}")
+
+    timings = {}
+    started = time.perf_counter()
+
+    if df is None:
+        df = fetch_history(symbol, TIMEFRAME, candles=CANDLES)
+        timings["fetch_s"] = time.perf_counter() - started
+
+    # The saved model fixes the inputs and the label definition
+    feature_columns = metadata.get("feature_columns", FEATURE_COLUMNS)
+    horizon = metadata.get("horizon", HORIZON)
+    atr_multiplier = metadata.get("atr_multiplier", ATR_MULTIPLIER)
+
+    mark = time.perf_counter()
+    entry = FeatureStore().get(df, symbol, TIMEFRAME, feature_columns, horizon, atr_multiplier)
+
+    X = entry.X[: entry.labeled]
+    y = entry.y[: entry.labeled].reshape(-1, 1)
+
+    # -------------------------
+    # Recent window split with purge gaps, plus replay of older rows
+    # -------------------------
+    split = warm_start_split(len(X))
+
+    scaler = joblib.load(f"{folder}/scaler.save")
+    X_train = scaler.transform(X[split.train_rows])
+    y_train = y[split.train_rows]
+
+    X_stop = scaler.transform(X[split.stop])
+    y_stop = y[split.stop]
+
+    X_val = scaler.transform(X[split.gate])
+    y_val = y[split.gate]
+
+    timings["features_s"] = time.perf_counter() - mark
+    mark = time.perf_counter()
+
+    saved_state = torch.load(f"{folder}/model.pt", map_location="cpu")
+
+    # The saved model on the held-out rows is the bar to clear
+    current = DirectionNet(input_dim=len(feature_columns))
+    current.load_state_dict(saved_state)
+    baseline = validation_metrics(symbol, current, X_val, y_val, verbose=False)
+
+    model = DirectionNet(input_dim=len(feature_columns))
+    model.load_state_dict(saved_state)
+
+    epochs_run = fit_model(
+        symbol, model, X_train, y_train, X_stop, y_stop,
+        epochs=INCREMENTAL_EPOCHS,
+        lr=INCREMENTAL_LR,
+        generator=torch.Generator().manual_seed(INCREMENTAL_SEED),
+    )
+    metrics = validation_metrics(symbol, model, X_val, y_val)
+
+    timings["train_s"] = time.perf_counter() - mark
+
+    # -------------------------
+    # Promotion gate
+    # -------------------------
+    promoted = promotion_gate(metrics, baseline)
+
+    if promoted:
+        tmp = f"{folder}/model.pt.tmp"
+        torch.save(model.state_dict(), tmp)
+        os.replace(tmp, f"{folder}/model.pt")
+
+        # Thresholds were tuned for the previous weights
+        refreshed = {
+            k: v for k, v in metadata.items()
+            if k not in ("optimized_long_threshold", "optimized_gates", "threshold_optimization")
+        }
+        refreshed.update({
+            "train_rows": int(len(X_train)),
+            "val_rows": int(len(X_val)),
+            "val_start_time": int(entry.frame[split.stop.start, 0]),
+            "feature_store_key": entry.key,
+            "trained_at_utc": datetime.now(timezone.utc).isoformat(),
+            "metrics": metrics,
+            "warm_start": {
+                "seed": INCREMENTAL_SEED,
+                "stopping_rows": int(len(X_stop)),
+                "gate_start_time": int(entry.frame[split.gate.start, 0]),
+                "previous_trained_at_utc": metadata.get("trained_at_utc"),
+                "previous_metrics": metadata.get("metrics", {}),
+                "baseline_metrics": baseline,
+                "recent_rows": int(min(len(X), RECENT_BARS)),
+                "replay_rows": int(split.replay_rows),
+            },
+        })
+        write_metadata(f"{folder}/metadata.json", refreshed)
+        export_numpy_bundle(f"{folder}/model.pt", f"{folder}/scaler.save")
+
+        print(f"✅ Promoted refreshed {symbol} model")
+    else:
+        print(f"⏸️ {symbol}: candidate below the saved model, keeping it")
+
+    return {
+        "symbol": symbol,
+        **timings,
+        "epochs": epochs_run,
+        "total_s": time.perf_counter() - started,
+        "val_f1": metrics["val_f1"],
+        "promoted": promoted,
+    }
+
+
+# =========================
+# PARALLEL DRIVER
+# =========================
+def limit_torch_threads(threads: int) -> None:
+    # Every process otherwise starts one torch thread per core
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+def train_universe(
+    symbols: list[str] = SYMBOLS,
+    workers: int | None = WORKERS,
+    threads_per_worker: int = THREADS_PER_WORKER,
+    prefetch: int = PREFETCH,
+    incremental: bool = INCREMENTAL,
+) -> list[dict]:
+    """
+    Train symbols across a process pool.
+
+    History is fetched in this process on `prefetch` download
+    threads, and each symbol is handed to the pool as soon as its
+    data arrives, so the next download overlaps with training
+    instead of waiting for it. Each worker is
+    capped at `threads_per_worker` torch threads so that workers x
+    threads never exceeds the core count. `incremental` runs the
+    warm-start refresh instead of a full retrain.
+    """
+    threads_per_worker = max(1, threads_per_worker)
+    workers = workers or max(1, (os.cpu_count() or 1) // threads_per_worker)
+    workers = min(workers, len(symbols)) or 1
+
+    results = []
+    context = multiprocessing.get_context("spawn")  # fork + torch threads can deadlock
+
+    with (
+        ThreadPoolExecutor(max_workers=max(1, prefetch)) as fetch_pool,
+        ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=limit_torch_threads,
+            initargs=(threads_per_worker,),
+        ) as train_pool,
+    ):
+        fetches = {fetch_pool.submit(_timed_load, sym): sym for sym in symbols}
+
+        training = {}
+        for future in as_completed(fetches):
+            sym = fetches[future]
+            try:
+                df, fetch_s = future.result()
+            except Exception as e:
+                print(f"❌ Failed for {sym}: {e}")
+                results.append({"symbol": sym, "error": str(e)})
+                continue
+
+            job = retrain_incremental if incremental else train_for_symbol
+            training[train_pool.submit(job, sym, df)] = (sym, fetch_s)
+
+        for future in as_completed(training):
+            sym, fetch_s = training[future]
+            try:
+                results.append({**future.result(), "fetch_s": fetch_s})
+            except Exception as e:
+                print(f"❌ Failed for {sym}: {e}")
+                results.append({"symbol": sym, "error": str(e)})
+
+    order = {sym: i for i, sym in enumerate(symbols)}
+    return sorted(results, key=lambda r: order[r["symbol"]])
+
+
+def print_timings(results: list[dict], elapsed: float) -> None:
+    print("\n===== TRAINING TIMINGS =====")
+    print(f"{'symbol':<11} {'fetch':>7} {'feat':>7} {'train':>7} {'total':>7} {'epochs':>6} {'f1':>6}")
+
+    for r in results:
+        if "error" in r:
+            print(f"{r['symbol']:<11} ❌ {r['error']}")
+            continue
+        print(
+            f"{r['symbol']:<11} "
+            f"{r['fetch_s']:>6.1f}s {r['features_s']:>6.1f}s {r['train_s']:>6.1f}s "
+            f"{r['total_s']:>6.1f}s {r['epochs']:>6} {r['val_f1']:>6.3f}"
+            + ("" if "promoted" not in r else "  promoted" if r["promoted"] else "  kept")
+        )
+
+    busy = sum(r.get("total_s", 0.0) for r in results)
+    print(f"\n⏱️ Wall {elapsed:.1f}s | worker time {busy:.1f}s")
+
+
+def prune_feature_store() -> None:
+    """
+    Drop superseded feature store entries, keeping the ones the
+    saved models were trained on.
+    """
+    from features.store import FeatureStore
+    from models.metadata import read_metadata
+
+    protect = set()
+    for path in Path("models").glob("*/metadata.json"):
+        key = (read_metadata(path) or {}).get("feature_store_key")
+        if key:
+            protect.add(key)
+
+    deleted = FeatureStore().prune(protect=protect)
+    if deleted:
+        print(f"🧹 Pruned {len(deleted)} feature store entries")
+
 
 def main():
-    for sym in SYMBOLS:
-        try:
-            train_for_symbol(sym)
-        except Exception as e:
-            print(f"❌ Failed for {sym}: {e}")
+    started = time.perf_counter()
+    results = train_universe()
+    print_timings(results, time.perf_counter() - started)
+    prune_feature_store()
 
 
 if __name__ == "__main__":